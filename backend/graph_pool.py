@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+from tradingagents.graph.trading_graph import (
+    TradingAgentsGraph,
+    create_llm,
+    create_memories,
+)
+
+
+class GraphPool:
+    """Keeps compiled graphs and their heavy resources alive across sessions.
+
+    Graphs are keyed by (analysts, provider, models, debate depth). LLM clients
+    are shared per model and one set of memory stores is shared by every
+    graph, so a session with a known configuration starts without any setup.
+    Sessions only pass a thread id to the compiled graph, which holds no
+    per-run state, so concurrent sessions can share a graph. Builds run
+    outside the pool lock, so a cold configuration never delays sessions
+    whose graph is already pooled.
+    """
+
+    def __init__(self, max_graphs: int = 8):
+        self.max_graphs = max_graphs
+        self._lock = threading.Lock()
+        # Each store maps a key to a future of its value, so a slow build
+        # only blocks callers waiting for that same key
+        self._graphs: "OrderedDict[Tuple, Future]" = OrderedDict()
+        self._llms: Dict[Tuple[str, str], Future] = {}
+        self._memories: Dict[None, Future] = {}
+
+    def get(self, config: Dict[str, Any], selected_analysts: List[str]) -> TradingAgentsGraph:
+        """Return the pooled graph for this configuration, building it on first use."""
+        key = (
+            tuple(selected_analysts),
+            config["llm_provider"],
+            config["quick_think_llm"],
+            config["deep_think_llm"],
+            config["max_debate_rounds"],
+            config["max_risk_discuss_rounds"],
+        )
+        return self._shared(
+            self._graphs,
+            key,
+            lambda: TradingAgentsGraph(
+                selected_analysts=selected_analysts,
+                config=config,
+                debug=True,
+                deep_thinking_llm=self._get_llm(config["deep_think_llm"], config),
+                quick_thinking_llm=self._get_llm(config["quick_think_llm"], config),
+                memories=self._shared(self._memories, None, lambda: create_memories(config)),
+            ),
+        )
+
+    def _get_llm(self, model: str, config: Dict[str, Any]):
+        llm_key = (config["llm_provider"], model)
+        return self._shared(self._llms, llm_key, lambda: create_llm(model, config))
+
+    def _shared(self, store: Dict, key, build: Callable[[], Any]):
+        """Return store[key], building it outside the pool lock on first use.
+
+        The first caller for a key builds it; concurrent callers for the
+        same key wait on its future. A failed build is dropped from the
+        store so the next caller retries.
+        """
+        with self._lock:
+            future = store.get(key)
+            owner = future is None
+            if owner:
+                future = store[key] = Future()
+            if store is self._graphs:
+                store.move_to_end(key)
+                while len(store) > self.max_graphs:
+                    store.popitem(last=False)
+        if not owner:
+            return future.result()
+
+        try:
+            value = build()
+        except BaseException as e:
+            with self._lock:
+                if store.get(key) is future:
+                    del store[key]
+            future.set_exception(e)
+            raise
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """Number of pooled graphs and LLM clients."""
+        with self._lock:
+            return {"graphs": len(self._graphs), "llms": len(self._llms)}
+
+
+graph_pool = GraphPool()
@@ -21,6 +21,7 @@ print(sys.path)
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
 from trading.tradingService import trading_service, TradeRequest
+from graph_pool import graph_pool
 
 app = FastAPI(title="TradingAgents API", version="1.0.0")
 # CORS middleware
@@ -36,14 +37,22 @@ app.add_middleware(
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.session_connections: Dict[str, List[WebSocket]] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, session_id: Optional[str] = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        if session_id is not None:
+            self.session_connections.setdefault(session_id, []).append(websocket)
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        for session_id, connections in list(self.session_connections.items()):
+            if websocket in connections:
+                connections.remove(websocket)
+            if not connections:
+                del self.session_connections[session_id]
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
@@ -59,6 +68,17 @@ class ConnectionManager:
         for d in dead:
             self.disconnect(d)
 
+    async def send_to_session(self, session_id: str, message: str):
+        """Send a message only to the connections watching one session."""
+        dead: List[WebSocket] = []
+        for connection in list(self.session_connections.get(session_id, [])):
+            try:
+                await connection.send_text(message)
+            except Exception:
+                dead.append(connection)
+        for d in dead:
+            self.disconnect(d)
+
 manager = ConnectionManager()
 
 # Pydantic models
@@ -88,9 +108,13 @@ class AnalysisProgress(BaseModel):
     reports: Dict[str, str]
     final_decision: Optional[str] = None
     is_complete: bool = False
+    # Per-node, LLM and tool timings of the finished run
+    run_summary: Optional[Dict[str, Any]] = None
 
 # Global storage for analysis sessions
 analysis_sessions: Dict[str, AnalysisProgress] = {}
+# Original requests, kept so interrupted sessions can be resumed
+analysis_requests: Dict[str, AnalysisRequest] = {}
 
 async def cleanup_old_sessions():
     """Clean up old analysis sessions to prevent resource conflicts"""
@@ -108,6 +132,7 @@ async def cleanup_old_sessions():
         
         for session_id in sessions_to_remove:
             del analysis_sessions[session_id]
+            analysis_requests.pop(session_id, None)
             print(f"Cleaned up old session: {session_id}")
             
     except Exception as e:
@@ -126,7 +151,7 @@ async def health_check():
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """Handles WebSocket connections for real-time updates."""
     print(f"🔌 WebSocket connection attempt for session: {session_id}")
-    await manager.connect(websocket)
+    await manager.connect(websocket, session_id)
     print(f"✅ WebSocket connected for session: {session_id}")
 
     try:
@@ -155,6 +180,7 @@ async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundT
         is_complete=False
     )
     analysis_sessions[session_id] = progress
+    analysis_requests[session_id] = request
     print(f"🟢 Created session {session_id} for {request.ticker} - ", analysis_sessions.keys())
 
     # ✅ Return response immediately
@@ -163,7 +189,41 @@ async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundT
     return response
 
 
-async def initialize_analysis(request: AnalysisRequest, session_id: str):
+@app.post("/resume-analysis/{session_id}")
+async def resume_analysis(session_id: str, request: Optional[AnalysisRequest] = None):
+    """Resume an interrupted analysis session from its last checkpoint.
+
+    The original request is reused when the session is still known; after a
+    server restart, pass the same request body that started the session.
+    """
+    request = request or analysis_requests.get(session_id)
+    if request is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Session not found; pass the original analysis request to resume it",
+        )
+
+    progress = analysis_sessions.get(session_id)
+    if progress is None:
+        progress = AnalysisProgress(
+            session_id=session_id,
+            ticker=request.ticker,
+            analysis_date=request.analysis_date,
+            current_agent=None,
+            agent_statuses={},
+            reports={},
+            is_complete=False
+        )
+        analysis_sessions[session_id] = progress
+    progress.is_complete = False
+    analysis_requests[session_id] = request
+
+    print(f"🔁 Resuming session {session_id} for {request.ticker}")
+    asyncio.create_task(initialize_analysis(request, session_id, resume=True))
+    return {"session_id": session_id, "status": "resumed"}
+
+
+async def initialize_analysis(request: AnalysisRequest, session_id: str, resume: bool = False):
     """Heavy initialization work runs in background"""
     try:
         await cleanup_old_sessions()
@@ -175,13 +235,14 @@ async def initialize_analysis(request: AnalysisRequest, session_id: str):
         config["backend_url"] = request.backend_url
         config["llm_provider"] = request.llm_provider.lower()
         config["online_tools"] = True
+        config["checkpoint_enabled"] = True
+        config["stream_mode"] = "updates"
+        config["stream_tokens"] = True
 
-        print(f"Initializing TradingAgentsGraph for session {session_id}")
-        graph = TradingAgentsGraph(
-            selected_analysts=request.analysts,
-            config=config,
-            debug=True
-        )
+        # Compiled graphs, LLM clients and memories are shared across sessions;
+        # only the first session with a new configuration pays for building them
+        print(f"Acquiring TradingAgentsGraph for session {session_id}")
+        graph = await asyncio.to_thread(graph_pool.get, config, request.analysts)
 
         # Initialize team statuses
         teams = {
@@ -210,21 +271,16 @@ async def initialize_analysis(request: AnalysisRequest, session_id: str):
         }))
 
         # Start async processing
-        asyncio.create_task(run_analysis_async(session_id, graph, request))
+        asyncio.create_task(run_analysis_async(session_id, graph, request, resume))
 
     except Exception as e:
         print(f"❌ Error during initialization for session {session_id}: {e}")
 
-async def run_analysis_async(session_id: str, graph: TradingAgentsGraph, request: AnalysisRequest):
+async def run_analysis_async(session_id: str, graph: TradingAgentsGraph, request: AnalysisRequest, resume: bool = False):
     try:
         print(f"Starting analysis for session {session_id}")
         progress = analysis_sessions[session_id]
 
-        init_agent_state = graph.propagator.create_initial_state(
-            request.ticker, request.analysis_date
-        )
-        args = graph.propagator.get_graph_args()
-
         await manager.broadcast(json.dumps({
             "type": "analysis_started",
             "session_id": session_id,
@@ -233,34 +289,76 @@ async def run_analysis_async(session_id: str, graph: TradingAgentsGraph, request
 
         print(f"Starting graph stream for session {session_id}")
 
-        loop = asyncio.get_running_loop()
-        queue: asyncio.Queue = asyncio.Queue()
-
-        def stream_chunks_to_queue():
-            """Blocking: run in thread, pushing chunks to async queue."""
-            try:
-                for chunk in graph.graph.stream(init_agent_state, **args):
-                    asyncio.run_coroutine_threadsafe(queue.put(chunk), loop)
-            finally:
-                asyncio.run_coroutine_threadsafe(queue.put(None), loop)
+        async def send_token(payload):
+            # Tokens are high volume, so only this session's clients get them
+            await manager.send_to_session(session_id, json.dumps({
+                "type": "agent_token",
+                "session_id": session_id,
+                "agent": payload["agent"],
+                "token": payload["token"]
+            }))
 
-        # ✅ Launch producer thread
-        asyncio.create_task(asyncio.to_thread(stream_chunks_to_queue))
+        # The graph runs on this event loop: agent nodes await their LLM calls,
+        # so concurrent sessions no longer hold a thread each. The session id
+        # doubles as the checkpoint run id.
+        try:
+            with graph.config_scope(), graph.tool_cache_scope() as tool_cache_stats, \
+                    graph.instrumentation_scope() as run_metrics, \
+                    graph.profiling_scope(
+                        request.ticker, request.analysis_date, session_id
+                    ):
+                final_state = {}
+                async for final_state, chunk in graph.astream(
+                    request.ticker,
+                    request.analysis_date,
+                    run_id=session_id,
+                    resume=resume,
+                    on_custom=send_token,
+                ):
+                    try:
+                        await update_progress_from_chunk(session_id, chunk)
+                    except Exception as inner_e:
+                        print(f"Error processing chunk in session {session_id}: {inner_e}")
+                        await manager.broadcast(json.dumps({
+                            "type": "progress_update_error",
+                            "session_id": session_id,
+                            "error": str(inner_e)
+                        }))
+        except ValueError as e:
+            # e.g. no checkpoint to resume for this session
+            await manager.broadcast(json.dumps({
+                "type": "progress_update_error",
+                "session_id": session_id,
+                "error": str(e)
+            }))
+            return
+        if tool_cache_stats is not None:
+            print(f"Tool cache for session {session_id}: {tool_cache_stats}")
+        if run_metrics is not None:
+            progress.run_summary = run_metrics.summary(include_spans=False)
+            progress.run_summary["tool_cache"] = tool_cache_stats
+            await manager.broadcast(json.dumps({
+                "type": "run_summary",
+                "session_id": session_id,
+                "data": progress.run_summary
+            }))
 
-        # ✅ Consumer loop
-        while True:
-            chunk = await queue.get()
-            if chunk is None:
-                break
+        # Log the run to the state log, as `propagate` does
+        log_write = None
+        if final_state:
+            if run_metrics is not None:
+                final_state["run_summary"] = run_metrics.summary()
             try:
-                await update_progress_from_chunk(session_id, chunk)
-            except Exception as inner_e:
-                print(f"Error processing chunk in session {session_id}: {inner_e}")
-                await manager.broadcast(json.dumps({
-                    "type": "progress_update_error",
-                    "session_id": session_id,
-                    "error": str(inner_e)
-                }))
+                log_write = await asyncio.to_thread(
+                    graph.log_run,
+                    request.ticker,
+                    request.analysis_date,
+                    final_state,
+                    session_id,
+                    tool_cache_stats,
+                )
+            except Exception as e:
+                await report_state_log_error(session_id, e)
 
         progress.is_complete = True
         await manager.broadcast(json.dumps({
@@ -269,12 +367,29 @@ async def run_analysis_async(session_id: str, graph: TradingAgentsGraph, request
             "final_decision": progress.final_decision
         }))
 
+        # The write itself finishes in the background after the session completes
+        if log_write is not None:
+            try:
+                await asyncio.wrap_future(log_write)
+            except Exception as e:
+                await report_state_log_error(session_id, e)
+
     except Exception as e:
         print(f"Error in analysis for session {session_id}: {e}")
         import traceback
         print(traceback.format_exc())
 
 
+async def report_state_log_error(session_id: str, error: Exception):
+    """Tell the session's clients its run could not be written to the state log"""
+    print(f"Error writing the state log for session {session_id}: {error}")
+    await manager.broadcast(json.dumps({
+        "type": "progress_update_error",
+        "session_id": session_id,
+        "error": f"Failed to write the state log: {error}"
+    }))
+
+
 async def update_progress_from_chunk(session_id: str, chunk: Dict[str, Any]):
     """Update progress based on analysis chunk"""
     try:
@@ -463,7 +578,8 @@ async def get_analysis_reports(session_id: str):
         "analysis_date": progress.analysis_date,
         "reports": progress.reports,
         "agent_outputs": {agent: status.output for agent, status in progress.agent_statuses.items() if status.output},
-        "is_complete": progress.is_complete
+        "is_complete": progress.is_complete,
+        "run_summary": progress.run_summary
     }
 
 @app.delete("/analysis/{session_id}")
@@ -471,6 +587,7 @@ async def delete_analysis(session_id: str):
     """Delete analysis session"""
     if session_id in analysis_sessions:
         del analysis_sessions[session_id]
+        analysis_requests.pop(session_id, None)
         return {"message": "Session deleted"}
     else:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -494,7 +611,8 @@ async def debug_sessions():
                 "agent_count": len(session.agent_statuses)
             }
             for session_id, session in analysis_sessions.items()
-        }
+        },
+        "graph_pool": graph_pool.stats(),
     }
 
 @app.post("/trade/buy")
@@ -1,6 +1,8 @@
 from typing import Optional
 import datetime
+import uuid
 import typer
+import pandas as pd
 from pathlib import Path
 from functools import wraps
 from rich.console import Console
@@ -21,6 +23,16 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.checkpointing import (
+    get_checkpoint_path,
+    load_run_metadata,
+    make_thread_id,
+    save_run_metadata,
+)
+from tradingagents.graph.profiling import summarize_profiles
+from tradingagents.graph.run_dataset import RunDataset, export_run_dataset
+from tradingagents.graph.signal_processing import MIN_SIGNAL_CONFIDENCE
+from tradingagents.graph.streaming import iter_state_chunks
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
 from cli.utils import *
@@ -70,6 +82,9 @@ class MessageBuffer:
             "trader_investment_plan": None,
             "final_trade_decision": None,
         }
+        # Partial output of the agent whose LLM tokens are being streamed
+        self.live_agent = None
+        self.live_text = ""
 
     def add_message(self, message_type, content):
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
@@ -79,6 +94,16 @@ class MessageBuffer:
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
         self.tool_calls.append((timestamp, tool_name, args))
 
+    def add_token(self, agent, token):
+        if agent != self.live_agent:
+            self.live_agent = agent
+            self.live_text = ""
+        self.live_text += token
+
+    def clear_live_output(self):
+        self.live_agent = None
+        self.live_text = ""
+
     def update_agent_status(self, agent, status):
         if agent in self.agent_status:
             self.agent_status[agent] = status
@@ -335,6 +360,17 @@ def update_display(layout, spinner_text=None):
         wrapped_content = Text(content, overflow="fold")
         messages_table.add_row(timestamp, msg_type, wrapped_content)
 
+    # Show the tail of the output still being streamed
+    if message_buffer.live_agent:
+        live_text = message_buffer.live_text
+        if len(live_text) > 200:
+            live_text = "..." + live_text[-197:]
+        messages_table.add_row(
+            datetime.datetime.now().strftime("%H:%M:%S"),
+            "Streaming",
+            Text(f"{message_buffer.live_agent}: {live_text}", overflow="fold"),
+        )
+
     if spinner_text:
         messages_table.add_row("", "Spinner", spinner_text)
 
@@ -731,9 +767,25 @@ def extract_content_string(content):
     else:
         return str(content)
 
-def run_analysis():
-    # First get all user selections
-    selections = get_user_selections()
+def run_analysis(run_id=None):
+    """Run an analysis, or resume the checkpointed run `run_id`."""
+    checkpoint_db = get_checkpoint_path(DEFAULT_CONFIG)
+    resume = run_id is not None
+    if resume:
+        # A resumed run continues with the selections it was started with
+        selections = load_run_metadata(checkpoint_db, run_id)
+        if selections is None:
+            console.print(f"[red]No checkpointed run {run_id} found in {checkpoint_db}[/red]")
+            return
+        selections["analysts"] = [AnalystType(a) for a in selections["analysts"]]
+    else:
+        selections = get_user_selections()
+        run_id = uuid.uuid4().hex
+        save_run_metadata(
+            checkpoint_db,
+            run_id,
+            {**selections, "analysts": [a.value for a in selections["analysts"]]},
+        )
 
     # Create config with selected research depth
     config = DEFAULT_CONFIG.copy()
@@ -743,12 +795,26 @@ def run_analysis():
     config["deep_think_llm"] = selections["deep_thinker"]
     config["backend_url"] = selections["backend_url"]
     config["llm_provider"] = selections["llm_provider"].lower()
+    config["checkpoint_enabled"] = True
+    config["stream_tokens"] = True
 
     # Initialize the graph
     graph = TradingAgentsGraph(
         [analyst.value for analyst in selections["analysts"]], config=config, debug=True
     )
 
+    args = graph.propagator.get_graph_args(
+        thread_id=make_thread_id(
+            selections["ticker"], selections["analysis_date"], run_id
+        )
+    )
+    if resume and not graph.graph.get_state(args["config"]).values:
+        console.print(
+            f"[red]No checkpoint found for run {run_id} on "
+            f"{selections['ticker']} {selections['analysis_date']}[/red]"
+        )
+        return
+
     # Create result directory
     results_dir = Path(config["results_dir"]) / selections["ticker"] / selections["analysis_date"]
     results_dir.mkdir(parents=True, exist_ok=True)
@@ -812,6 +878,11 @@ def run_analysis():
             "System",
             f"Selected analysts: {', '.join(analyst.value for analyst in selections['analysts'])}",
         )
+        message_buffer.add_message(
+            "System",
+            f"{'Resuming' if resume else 'Run ID'}: {run_id} "
+            f"(continue an interrupted run with: tradingagents resume {run_id})",
+        )
         update_display(layout)
 
         # Reset agent statuses
@@ -824,9 +895,16 @@ def run_analysis():
         message_buffer.current_report = None
         message_buffer.final_report = None
 
-        # Update agent status to in_progress for the first analyst
-        first_analyst = f"{selections['analysts'][0].value.capitalize()} Analyst"
-        message_buffer.update_agent_status(first_analyst, "in_progress")
+        # Update agent status to in_progress for the first analyst, or for all
+        # of them when they run as concurrent branches
+        if config["analyst_execution"] == "parallel":
+            for analyst in selections["analysts"]:
+                message_buffer.update_agent_status(
+                    f"{analyst.value.capitalize()} Analyst", "in_progress"
+                )
+        else:
+            first_analyst = f"{selections['analysts'][0].value.capitalize()} Analyst"
+            message_buffer.update_agent_status(first_analyst, "in_progress")
         update_display(layout)
 
         # Create spinner text
@@ -835,40 +913,69 @@ def run_analysis():
         )
         update_display(layout, spinner_text)
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
-            selections["ticker"], selections["analysis_date"]
-        )
-        args = graph.propagator.get_graph_args()
-
-        # Stream the analysis
-        trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
-            if len(chunk["messages"]) > 0:
-                # Get the last message from the chunk
-                last_message = chunk["messages"][-1]
-
-                # Extract message content and type
-                if hasattr(last_message, "content"):
-                    content = extract_content_string(last_message.content)  # Use the helper function
-                    msg_type = "Reasoning"
-                else:
-                    content = str(last_message)
-                    msg_type = "System"
-
-                # Add message to buffer
-                message_buffer.add_message(msg_type, content)                
-
-                # If it's a tool call, add it to tool calls
-                if hasattr(last_message, "tool_calls"):
-                    for tool_call in last_message.tool_calls:
-                        # Handle both dictionary and object tool calls
-                        if isinstance(tool_call, dict):
-                            message_buffer.add_tool_call(
-                                tool_call["name"], tool_call["args"]
-                            )
-                        else:
-                            message_buffer.add_tool_call(tool_call.name, tool_call.args)
+        # Initialize state; a resumed run continues from its last checkpoint
+        if resume:
+            init_agent_state = None
+            start_state = graph.graph.get_state(args["config"]).values
+        else:
+            init_agent_state = graph.propagator.create_initial_state(
+                selections["ticker"], selections["analysis_date"]
+            )
+            start_state = init_agent_state
+
+        # Stream the analysis; in "updates" mode each chunk only carries the
+        # keys a node changed, so nothing below re-processes unchanged reports
+        final_state = None
+        last_token_render = 0.0
+
+        def render_token(payload):
+            # Redraw at most ~10 times a second while an agent streams
+            nonlocal last_token_render
+            message_buffer.add_token(payload["agent"], payload["token"])
+            now = time.monotonic()
+            if now - last_token_render >= 0.1:
+                last_token_render = now
+                update_display(layout)
+
+        with graph.config_scope(), graph.tool_cache_scope() as tool_cache_stats, \
+                graph.instrumentation_scope() as run_metrics, \
+                graph.profiling_scope(
+                    selections["ticker"], selections["analysis_date"], run_id
+                ):
+            for state, chunk in iter_state_chunks(
+                graph.graph.stream(init_agent_state, **args),
+                args["stream_mode"],
+                start_state,
+                on_custom=render_token,
+            ):
+                # A node finished; its full output arrives with this chunk
+                message_buffer.clear_live_output()
+
+                if chunk.get("messages"):
+                    # Get the last message from the chunk
+                    last_message = chunk["messages"][-1]
+
+                    # Extract message content and type
+                    if hasattr(last_message, "content"):
+                        content = extract_content_string(last_message.content)  # Use the helper function
+                        msg_type = "Reasoning"
+                    else:
+                        content = str(last_message)
+                        msg_type = "System"
+
+                    # Add message to buffer
+                    message_buffer.add_message(msg_type, content)                
+
+                    # If it's a tool call, add it to tool calls
+                    if hasattr(last_message, "tool_calls"):
+                        for tool_call in last_message.tool_calls:
+                            # Handle both dictionary and object tool calls
+                            if isinstance(tool_call, dict):
+                                message_buffer.add_tool_call(
+                                    tool_call["name"], tool_call["args"]
+                                )
+                            else:
+                                message_buffer.add_tool_call(tool_call.name, tool_call.args)
 
                 # Update reports and agent status based on chunk content
                 # Analyst Team Reports
@@ -1071,10 +1178,44 @@ def run_analysis():
                 # Update the display
                 update_display(layout)
 
-            trace.append(chunk)
+                final_state = state
+
+        if tool_cache_stats is not None:
+            message_buffer.add_message(
+                "System",
+                f"Tool cache: {tool_cache_stats['hits']} hits, "
+                f"{tool_cache_stats['misses']} misses "
+                f"(hit rate {tool_cache_stats['hit_rate']:.0%})",
+            )
+        if run_metrics is not None:
+            run_summary = run_metrics.summary(include_spans=False)
+            llm_stats = run_summary["llm"]
+            slowest = ", ".join(
+                f"{span['name']} {span['duration_s']:.1f}s" for span in run_summary["slowest"][:3]
+            )
+            message_buffer.add_message(
+                "System",
+                f"Run took {run_summary['wall_time_s']:.1f}s: {llm_stats['calls']} LLM calls "
+                f"({llm_stats['time_s']:.1f}s, {llm_stats['input_tokens']} in / "
+                f"{llm_stats['output_tokens']} out tokens); slowest {slowest}",
+            )
 
         # Get final state and decision
-        final_state = trace[-1]
+        if not final_state:
+            final_state = graph.graph.get_state(args["config"]).values
+        if run_metrics is not None:
+            final_state["run_summary"] = run_metrics.summary()
+        try:
+            log_write = graph.log_run(
+                selections["ticker"],
+                selections["analysis_date"],
+                final_state,
+                run_id,
+                tool_cache_stats,
+            )
+        except Exception as e:
+            log_write = None
+            message_buffer.add_message("System", f"Failed to write the state log: {e}")
         decision = graph.process_signal(final_state["final_trade_decision"])
 
         # Update all agent statuses to completed
@@ -1093,6 +1234,12 @@ def run_analysis():
         # Display the complete final report
         display_complete_report(final_state)
 
+        # The state log is written in the background while the report renders
+        if log_write is not None and log_write.exception() is not None:
+            message_buffer.add_message(
+                "System", f"Failed to write the state log: {log_write.exception()}"
+            )
+
         update_display(layout)
 
 
@@ -1101,5 +1248,116 @@ def analyze():
     run_analysis()
 
 
+@app.command()
+def resume(
+    run_id: str = typer.Argument(
+        ..., help="Run ID shown when the interrupted analysis started"
+    ),
+):
+    """Resume an interrupted analysis from its last completed step."""
+    run_analysis(run_id=run_id)
+
+
+@app.command("profile-summary")
+def profile_summary(
+    profile_dir: str = typer.Option(
+        str(Path(DEFAULT_CONFIG["results_dir"]) / "profiles"),
+        help="Directory holding the profile artifacts of past runs",
+    ),
+    top: int = typer.Option(20, help="Number of hot spots to list"),
+    sort: str = typer.Option("tottime", help="tottime (own time) or cumtime (with callees)"),
+    target: str = typer.Option(None, help="Only use profiles of this node or function"),
+    mode: str = typer.Option(None, help="deterministic or sampling; guessed when omitted"),
+):
+    """Summarize the top hot spots across profiled runs."""
+    if not Path(profile_dir).is_dir():
+        console.print(f"[red]No profiles found in {profile_dir}[/red]")
+        raise typer.Exit(1)
+    hot_spots = summarize_profiles(profile_dir, top=top, sort=sort, target=target, mode=mode)
+    if not hot_spots:
+        console.print(f"[yellow]No matching profiles in {profile_dir}[/yellow]")
+        return
+
+    sampled = mode == "sampling" or not any(Path(profile_dir).rglob("*.prof"))
+    unit = "share" if sampled else "s"
+    table = Table(title=f"Hot spots in {profile_dir}", box=box.SIMPLE_HEAD)
+    table.add_column("Function", style="cyan", overflow="fold")
+    table.add_column("Samples" if sampled else "Calls", justify="right")
+    table.add_column(f"Own ({unit})", justify="right")
+    table.add_column(f"Cumulative ({unit})", justify="right")
+    for spot in hot_spots:
+        if sampled:
+            own, cumulative = f"{spot.self_time:.1%}", f"{spot.cumulative_time:.1%}"
+        else:
+            own, cumulative = f"{spot.self_time:.4f}", f"{spot.cumulative_time:.4f}"
+        table.add_row(spot.function, str(spot.calls), own, cumulative)
+    console.print(table)
+
+
+@app.command("export-runs")
+def export_runs(
+    log_dir: str = typer.Option(
+        DEFAULT_CONFIG["state_log_dir"], help="Directory holding the state logs of past runs"
+    ),
+    output: str = typer.Option(
+        str(Path(DEFAULT_CONFIG["results_dir"]) / "run_dataset"),
+        help="Directory to write the run dataset to",
+    ),
+    min_confidence: float = typer.Option(
+        MIN_SIGNAL_CONFIDENCE, help="Store decisions parsed with less confidence as UNKNOWN"
+    ),
+):
+    """Compact past run logs into a columnar dataset for analysis."""
+    dataset = export_run_dataset(log_dir, output, min_confidence)
+    console.print(
+        f"[green]Exported {dataset.manifest['runs']} runs to {output} "
+        f"({dataset.manifest['format']})[/green]"
+    )
+
+
+@app.command("query-runs")
+def query_runs(
+    dataset: str = typer.Option(
+        str(Path(DEFAULT_CONFIG["results_dir"]) / "run_dataset"),
+        help="Run dataset written by export-runs",
+    ),
+    by: str = typer.Option(
+        "ticker", help="Group by ticker, sector, action, year, month or any run column"
+    ),
+    start: str = typer.Option(None, help="First trade date to include (YYYY-MM-DD)"),
+    end: str = typer.Option(None, help="Last trade date to include (YYYY-MM-DD)"),
+    returns: str = typer.Option(
+        None, help="CSV of forward returns (ticker, trade_date, return) to compute hit rates"
+    ),
+    sectors: str = typer.Option(None, help="CSV mapping ticker to sector, for --by sector"),
+):
+    """Aggregate past runs: decision counts and cost, or hit rates given returns."""
+    try:
+        runs = RunDataset(dataset)
+    except FileNotFoundError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    sector_map = None
+    if sectors:
+        frame = pd.read_csv(sectors)
+        sector_map = dict(zip(frame["ticker"].astype(str), frame["sector"]))
+
+    if returns:
+        result = runs.hit_rate(
+            pd.read_csv(returns), by=by, sectors=sector_map, start_date=start, end_date=end
+        )
+        title = "Hit rate of BUY/SELL decisions"
+    else:
+        result = runs.summary(by=by, sectors=sector_map, start_date=start, end_date=end)
+        title = "Runs"
+
+    table = Table(title=title, box=box.SIMPLE_HEAD)
+    for column in result.columns:
+        table.add_column(str(column), justify="left" if column == result.columns[0] else "right")
+    for row in result.itertuples(index=False):
+        table.add_row(*(f"{v:.3f}" if isinstance(v, float) else str(v) for v in row))
+    console.print(table)
+
+
 if __name__ == "__main__":
     app()
@@ -25,6 +25,7 @@ const AgentMonitor = () => {
   const [isConnected, setIsConnected] = useState(false);
   const [selectedAgent, setSelectedAgent] = useState(null);
   const [activityFeed, setActivityFeed] = useState([]);
+  const [liveOutputs, setLiveOutputs] = useState({});
   const wsRef = useRef(null);
   const reconnectTimeoutRef = useRef(null);
 
@@ -186,6 +187,13 @@ const AgentMonitor = () => {
           agent: data.current_agent
         }]);
         break;
+      case 'agent_token':
+        // Streamed LLM tokens of an agent that is still working
+        setLiveOutputs(prev => ({
+          ...prev,
+          [data.agent]: (prev[data.agent] || '') + data.token
+        }));
+        break;
       case 'agent_completed':
         // Update the agent status to completed and add output
         setAnalysisData(prev => ({
@@ -219,6 +227,8 @@ const AgentMonitor = () => {
         toast.success('Connected to analysis session');
         break;
       case 'progress_update':
+        // A node finished, so its final output replaces the streamed tokens
+        setLiveOutputs({});
         setAnalysisData(data.progress);
         break;
       case 'analysis_complete':
@@ -510,7 +520,13 @@ const AgentMonitor = () => {
 
                           </div>
                         </div>
-                        {agent.output && (
+                        {liveOutputs[agent.name] ? (
+                          <div className="mt-3 pt-3 border-t border-gray-200">
+                            <p className="text-sm text-gray-600 line-clamp-2">
+                              {liveOutputs[agent.name].slice(-200)}
+                            </p>
+                          </div>
+                        ) : agent.output && (
                           <div className="mt-3 pt-3 border-t border-gray-200">
                             <p className="text-sm text-gray-600 line-clamp-2">
                               {agent.output.substring(0, 200)}...
@@ -548,12 +564,12 @@ const AgentMonitor = () => {
 
                   </div>
 
-                  {selectedAgent.output && (
+                  {(liveOutputs[selectedAgent.name] || selectedAgent.output) && (
                     <div className="mt-4">
                       <h5 className="font-medium text-gray-900 mb-2">Output</h5>
                       <div className="max-h-96 overflow-y-auto">
                         <ReactMarkdown className="markdown-content">
-                          {selectedAgent.output}
+                          {liveOutputs[selectedAgent.name] || selectedAgent.output}
                         </ReactMarkdown>
                       </div>
                     </div>
@@ -19,3 +19,13 @@ print(decision)
 
 # Memorize mistakes and reflect
 # ta.reflect_and_remember(1000) # parameter is the position returns
+
+# Run a watchlist concurrently; results arrive as each ticker finishes
+# for result in ta.propagate_batch([("AAPL", "2025-09-26"), ("MSFT", "2025-09-26")]):
+#     print(result.company_name, result.error or result.signal)
+
+# Backtest over a date range; run once with config["llm_mode"] = "record", then re-run the
+# same dates offline with "replay"
+# from tradingagents.backtest import Backtester
+# result = Backtester(ta).run("NVDA", "2025-01-02", "2025-03-14", holding_period=5, reflect=True)
+# result.save("results/backtests")
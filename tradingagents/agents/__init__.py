@@ -1,5 +1,6 @@
 from .utils.agent_utils import Toolkit, create_msg_delete
-from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
+from .utils.agent_states import AgentState, DebateSummary, InvestDebateState, RiskDebateState
+from .utils.debate_summarizer import create_debate_summarizer
 from .utils.memory import FinancialSituationMemory
 
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
@@ -24,10 +25,12 @@ __all__ = [
     "Toolkit",
     "AgentState",
     "create_msg_delete",
+    "DebateSummary",
     "InvestDebateState",
     "RiskDebateState",
     "create_bear_researcher",
     "create_bull_researcher",
+    "create_debate_summarizer",
     "create_research_manager",
     "create_fundamentals_analyst",
     "create_market_analyst",
@@ -2,6 +2,8 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
 
+from tradingagents.agents.utils.node_runtime import Invoke, create_node
+
 
 def create_market_analyst(llm, toolkit):
 
@@ -109,7 +111,7 @@ def create_market_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield Invoke(chain, state["messages"])
 
         report = ""
 
@@ -121,4 +123,4 @@ def create_market_analyst(llm, toolkit):
             "market_report": report,
         }
 
-    return market_analyst_node
+    return create_node(market_analyst_node)
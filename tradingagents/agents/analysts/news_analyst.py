@@ -2,6 +2,8 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
 
+from tradingagents.agents.utils.node_runtime import Invoke, create_node
+
 
 def create_news_analyst(llm, toolkit):
     def news_analyst_node(state):
@@ -102,7 +104,7 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        result = yield Invoke(chain, state["messages"])
 
         report = ""
 
@@ -114,4 +116,4 @@ def create_news_analyst(llm, toolkit):
             "news_report": report,
         }
 
-    return news_analyst_node
+    return create_node(news_analyst_node)
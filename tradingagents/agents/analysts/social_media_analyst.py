@@ -2,6 +2,8 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
 
+from tradingagents.agents.utils.node_runtime import Invoke, create_node
+
 
 def create_social_media_analyst(llm, toolkit):
     def social_media_analyst_node(state):
@@ -100,7 +102,7 @@ def create_social_media_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield Invoke(chain, state["messages"])
 
         report = ""
 
@@ -112,4 +114,4 @@ def create_social_media_analyst(llm, toolkit):
             "sentiment_report": report,
         }
 
-    return social_media_analyst_node
+    return create_node(social_media_analyst_node)
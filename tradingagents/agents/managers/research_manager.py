@@ -1,8 +1,13 @@
 import time
 import json
 
+from tradingagents.agents.utils.context_builder import ContextBuilder
+from tradingagents.agents.utils.node_runtime import BlockingCall, Invoke, create_node
+
+
+def create_research_manager(llm, memory, context_builder=None):
+    context_builder = context_builder or ContextBuilder()
 
-def create_research_manager(llm, memory):
     def research_manager_node(state) -> dict:
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
@@ -13,12 +18,21 @@ def create_research_manager(llm, memory):
         investment_debate_state = state["investment_debate_state"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield BlockingCall(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        summary = state.get("investment_debate_summary") or {}
+        context = context_builder.build(
+            [("Past Reflections", past_memory_str)],
+            history=history,
+            history_title="Debate History",
+            history_summary=summary.get("text", ""),
+            summarized_turns=summary.get("turns", 0),
+        )
+
         prompt = f"""
         ROLE: You are a **Portfolio Manager and Debate Facilitator**, responsible for objectively evaluating the bull and bear analysts’ arguments 
         and issuing a decisive, evidence-based investment recommendation — **BUY, SELL, or HOLD (only if strongly justified)**.  
@@ -29,9 +43,9 @@ def create_research_manager(llm, memory):
         ### CORE DIRECTIVES (STRICT)
 
         1. **Evidence-Only Reasoning**
-        - You must rely **exclusively** on the content in:
-            - Debate History → {history}
-            - Past Reflections → {past_memory_str}
+        - You must rely **exclusively** on the content in (see PROVIDED SOURCES below):
+            - Debate History
+            - Past Reflections
         - Do **not** fabricate financial data, events, or metrics.  
         - If a fact is missing, write **“Data unavailable from debate materials”** — never infer or assume it.
 
@@ -43,7 +57,7 @@ def create_research_manager(llm, memory):
         - Avoid “safe” neutrality. A HOLD recommendation requires explicit proof that neither side’s evidence dominates.
 
         3. **Past Lessons Integration**
-        - Incorporate insights from {past_memory_str} to avoid prior analytical flaws (e.g., overconfidence, recency bias, emotional reasoning, or overweighing sentiment).
+        - Incorporate insights from the Past Reflections to avoid prior analytical flaws (e.g., overconfidence, recency bias, emotional reasoning, or overweighing sentiment).
         - Explicitly mention which past mistake you corrected this time and how it changed your judgment.
 
         4. **Output Structure (MANDATORY)**
@@ -72,7 +86,7 @@ def create_research_manager(llm, memory):
             - Ground each action in debate-based reasoning (e.g., “Monitor insider transactions discussed by the bear analyst as a risk signal.”)
 
         **5. Lessons Applied**
-            - Briefly explain how your decision reflects improved discipline based on {past_memory_str}.  
+            - Briefly explain how your decision reflects improved discipline based on the Past Reflections.  
                 Example: “Previously, I overvalued sentiment spikes; now, I prioritized hard fundamentals.”
 
         **6. Final Statement**
@@ -91,16 +105,19 @@ def create_research_manager(llm, memory):
         ---
 
         ### SELF-CHECK BEFORE FINALIZING
-        ✔ Every claim cites or paraphrases something traceable to {history}.  
+        ✔ Every claim cites or paraphrases something traceable to the Debate History.  
         ✔ The decision (BUY / SELL / HOLD) is clearly stated and justified with evidence.  
         ✔ Strategic actions are actionable and logically follow from the stance.  
-        ✔ Past reflection ({past_memory_str}) is referenced to show improvement.  
+        ✔ Past Reflections are referenced to show improvement.  
         ✔ No speculative, invented, or external data included.
 
+        ### PROVIDED SOURCES
+{context.text}
+
         END PROMPT.
         """
 
-        response = llm.invoke(prompt)
+        response = yield Invoke(llm, prompt, "Research Manager")
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -114,6 +131,7 @@ def create_research_manager(llm, memory):
         return {
             "investment_debate_state": new_investment_debate_state,
             "investment_plan": response.content,
+            "context_tokens": {"Research Manager": [context.token_counts]},
         }
 
-    return research_manager_node
+    return create_node(research_manager_node)
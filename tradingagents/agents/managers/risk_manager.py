@@ -1,8 +1,13 @@
 import time
 import json
 
+from tradingagents.agents.utils.context_builder import ContextBuilder
+from tradingagents.agents.utils.node_runtime import BlockingCall, Invoke, create_node
+
+
+def create_risk_manager(llm, memory, context_builder=None):
+    context_builder = context_builder or ContextBuilder()
 
-def create_risk_manager(llm, memory):
     def risk_manager_node(state) -> dict:
 
         company_name = state["company_of_interest"]
@@ -16,12 +21,24 @@ def create_risk_manager(llm, memory):
         trader_plan = state["investment_plan"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield BlockingCall(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        summary = state.get("risk_debate_summary") or {}
+        context = context_builder.build(
+            [
+                ("Trader’s Current Plan", trader_plan),
+                ("Past Reflections / Mistakes", past_memory_str),
+            ],
+            history=history,
+            history_title="Analysts Debate History",
+            history_summary=summary.get("text", ""),
+            summarized_turns=summary.get("turns", 0),
+        )
+
         prompt = f"""
         ROLE: You are the **Risk Management Judge and Debate Facilitator**, responsible for evaluating a debate among three analysts — 
         Risky, Neutral, and Safe/Conservative — and issuing a definitive trading decision: **BUY, SELL, or HOLD (only if strongly justified)**.  
@@ -32,10 +49,10 @@ def create_risk_manager(llm, memory):
         ### CORE DECISION DIRECTIVES (STRICT)
 
         1. **Evidence-Based Evaluation**
-        - You may use ONLY the following materials:
-            - Analysts Debate History → {history}
-            - Trader’s Current Plan → {trader_plan}
-            - Past Reflections / Mistakes → {past_memory_str}
+        - You may use ONLY the following materials (see PROVIDED SOURCES below):
+            - Analysts Debate History
+            - Trader’s Current Plan
+            - Past Reflections / Mistakes
         - All reasoning must be explicitly tied to something found in those materials.  
         - If data or context is missing, state **“Data unavailable from debate content”** — do NOT infer or imagine it.
 
@@ -51,7 +68,7 @@ def create_risk_manager(llm, memory):
         - Avoid choosing HOLD out of indecision — it must be explicitly justified.
 
         4. **Past Lessons Integration**
-        - Review insights from {past_memory_str}.  
+        - Review insights from the Past Reflections / Mistakes.  
         - Identify one or more past decision errors (e.g., ignoring tail risk, overconfidence, reactionary exits).  
         - Explain how those lessons shape your risk reasoning this time.
 
@@ -70,7 +87,7 @@ def create_risk_manager(llm, memory):
         - Example: “Risky provided strong entry timing logic but lacked downside analysis; Safe identified credible macro threats with supporting evidence.”
 
         3. **Revised Trader Plan**
-        - Start with the trader’s current plan ({trader_plan}).
+        - Start with the Trader’s Current Plan.
         - Modify it using the debate’s insights — adjusting position size, entry/exit thresholds, stop-losses, or time horizon.
         - Each modification must have a direct justification from debate content.
 
@@ -80,7 +97,7 @@ def create_risk_manager(llm, memory):
         - Example phrasing: “Given that Safe highlighted repeated earnings misses while Neutral confirmed lack of positive catalysts, SELL is warranted.”
 
         5. **Lessons Applied**
-        - Reflect on a past mistake from {past_memory_str} that could have affected this call.
+        - Reflect on a past mistake from the Past Reflections / Mistakes that could have affected this call.
         - Show how that lesson improved your analysis and reduced bias (e.g., “Previously I ignored downside volatility; now I prioritized risk asymmetry.”)
 
         6. **Final Recommendation (Conversational Tone)**
@@ -100,17 +117,20 @@ def create_risk_manager(llm, memory):
         ---
 
         ### SELF-CHECK BEFORE SUBMITTING
-        ✔ Every statement ties back to the debate ({history}) or past reflection ({past_memory_str}).  
+        ✔ Every statement ties back to the Analysts Debate History or the Past Reflections / Mistakes.  
         ✔ The decision is one of BUY / SELL / HOLD — no ambiguity.  
-        ✔ Trader plan ({trader_plan}) is refined with explicit justification.  
+        ✔ Trader’s Current Plan is refined with explicit justification.  
         ✔ A past lesson is applied to demonstrate improvement.  
         ✔ No speculative or fabricated information included.
 
+        ### PROVIDED SOURCES
+{context.text}
+
         END PROMPT.
         """
 
 
-        response = llm.invoke(prompt)
+        response = yield Invoke(llm, prompt, "Portfolio Manager")
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -128,6 +148,7 @@ def create_risk_manager(llm, memory):
         return {
             "risk_debate_state": new_risk_debate_state,
             "final_trade_decision": response.content,
+            "context_tokens": {"Portfolio Manager": [context.token_counts]},
         }
 
-    return risk_manager_node
+    return create_node(risk_manager_node)
@@ -2,8 +2,13 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.context_builder import ContextBuilder
+from tradingagents.agents.utils.node_runtime import BlockingCall, Invoke, create_node
+
+
+def create_bear_researcher(llm, memory, context_builder=None):
+    context_builder = context_builder or ContextBuilder()
 
-def create_bear_researcher(llm, memory):
     def bear_node(state) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
@@ -16,12 +21,28 @@ def create_bear_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield BlockingCall(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        summary = state.get("investment_debate_summary") or {}
+        context = context_builder.build(
+            [
+                ("Market research report", market_research_report),
+                ("Social media sentiment report", sentiment_report),
+                ("Latest world affairs news", news_report),
+                ("Company fundamentals report", fundamentals_report),
+                ("Last bull argument", current_response),
+                ("Reflections / past lessons", past_memory_str),
+            ],
+            history=history,
+            history_title="Conversation history of the debate",
+            history_summary=summary.get("text", ""),
+            summarized_turns=summary.get("turns", 0),
+        )
+
         prompt = f"""
         ROLE: You are a **Bear Analyst**, presenting a disciplined, data-driven argument *against* investing in this stock.
         Your job is to identify and articulate the **risks, weaknesses, and red flags** that could negatively affect the company’s value or investor confidence.  
@@ -30,14 +51,14 @@ def create_bear_researcher(llm, memory):
         ---
 
         ### CORE DIRECTIVES (STRICT)
-        1. **Evidence Only** — Every claim must be supported by the data provided in one of these sources:
-        - Market research report → {market_research_report}
-        - Social media sentiment report → {sentiment_report}
-        - Latest world affairs news → {news_report}
-        - Company fundamentals report → {fundamentals_report}
-        - Conversation history of the debate → {history}
-        - Last bull argument → {current_response}
-        - Reflections / past lessons → {past_memory_str}
+        1. **Evidence Only** — Every claim must be supported by the data provided in one of these sources (see PROVIDED SOURCES below):
+        - Market research report
+        - Social media sentiment report
+        - Latest world affairs news
+        - Company fundamentals report
+        - Conversation history of the debate
+        - Last bull argument
+        - Reflections / past lessons
         If information is missing, explicitly say **"Data unavailable from provided sources"** — do NOT infer.
 
         2. **No Hallucination Rule**
@@ -51,16 +72,16 @@ def create_bear_researcher(llm, memory):
         - **Negative Indicators:** Identify deteriorating ratios, sentiment drops, insider selling, or negative press coverage.
         - **Macro Headwinds:** Tie in relevant geopolitical, sectoral, or global economic factors affecting the stock.
         - **Counter the Bull Case:** Use logic and evidence to dismantle optimistic assumptions in the last bull argument, pointing out unsupported claims or logical gaps.
-        - **Integrate Past Lessons:** Reference previous debate reflections ({past_memory_str}) to avoid prior analytical mistakes (e.g., confirmation bias, overreliance on sentiment).
+        - **Integrate Past Lessons:** Reference previous debate reflections (reflections / past lessons) to avoid prior analytical mistakes (e.g., confirmation bias, overreliance on sentiment).
 
         4. **Structure & Delivery**
         Your response must follow this outline:
         1. **Opening Statement:** Concise summary of your bearish stance and thesis.
         2. **Evidence-Backed Risks:** Sectioned list of 3–5 key risk pillars with supporting data and citations.
-        3. **Rebuttal to Bull Points:** Directly address {current_response}, point-by-point, using facts and reasoning.
-        4. **Contextual Factors:** Incorporate any relevant macro/news developments from {news_report}.
-        5. **Behavioral or Sentiment Insights:** Summarize public mood shifts from {sentiment_report}, noting changes in tone or engagement.
-        6. **Lessons Applied:** One short paragraph on how you improved your reasoning using {past_memory_str}.
+        3. **Rebuttal to Bull Points:** Directly address the last bull argument, point-by-point, using facts and reasoning.
+        4. **Contextual Factors:** Incorporate any relevant macro/news developments from the latest world affairs news.
+        5. **Behavioral or Sentiment Insights:** Summarize public mood shifts from the social media sentiment report, noting changes in tone or engagement.
+        6. **Lessons Applied:** One short paragraph on how you improved your reasoning using the reflections / past lessons.
         7. **Summary Table (Markdown):** Organized list of Bear arguments with columns: *Category | Evidence | Source | Implication*.
         8. **Final Position:** Close with a clear, reasoned conclusion that aligns with the evidence — e.g., “Given declining fundamentals and weak sentiment, the outlook remains bearish.”
 
@@ -86,11 +107,14 @@ def create_bear_researcher(llm, memory):
         ✔ The argument applies lessons from past reflections.  
         ✔ Markdown summary table included.
 
+        ### PROVIDED SOURCES
+{context.text}
+
         END PROMPT.
         """
 
         try:
-            response = llm.invoke(prompt)
+            response = yield Invoke(llm, prompt, "Bear Researcher")
             argument = f"Bear Analyst: {response.content}"
             print(f"Bear Researcher executed successfully: {argument[:100]}...")
         except Exception as e:
@@ -105,6 +129,9 @@ def create_bear_researcher(llm, memory):
             "count": investment_debate_state["count"] + 1,
         }
 
-        return {"investment_debate_state": new_investment_debate_state}
+        return {
+            "investment_debate_state": new_investment_debate_state,
+            "context_tokens": {"Bear Researcher": [context.token_counts]},
+        }
 
-    return bear_node
+    return create_node(bear_node)
@@ -2,8 +2,13 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.context_builder import ContextBuilder
+from tradingagents.agents.utils.node_runtime import BlockingCall, Invoke, create_node
+
+
+def create_bull_researcher(llm, memory, context_builder=None):
+    context_builder = context_builder or ContextBuilder()
 
-def create_bull_researcher(llm, memory):
     def bull_node(state) -> dict:
         investment_debate_state = state["investment_debate_state"]
         history = investment_debate_state.get("history", "")
@@ -16,12 +21,28 @@ def create_bull_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield BlockingCall(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        summary = state.get("investment_debate_summary") or {}
+        context = context_builder.build(
+            [
+                ("Market research report", market_research_report),
+                ("Social media sentiment report", sentiment_report),
+                ("Latest world affairs news", news_report),
+                ("Company fundamentals report", fundamentals_report),
+                ("Last bear argument", current_response),
+                ("Reflections / past lessons", past_memory_str),
+            ],
+            history=history,
+            history_title="Conversation history of the debate",
+            history_summary=summary.get("text", ""),
+            summarized_turns=summary.get("turns", 0),
+        )
+
         prompt = f"""
         ROLE: You are a **Bull Analyst**, presenting a disciplined, data-backed investment case *for* the stock.
         Your responsibility is to demonstrate the company’s growth potential, strengths, and positive market outlook — strictly supported by verified data.  
@@ -31,14 +52,14 @@ def create_bull_researcher(llm, memory):
 
         ### CORE DIRECTIVES (STRICT)
         1. **Evidence-Based Argumentation**
-        - Every claim must cite data from the provided sources:
-            - Market research report → {market_research_report}
-            - Social media sentiment report → {sentiment_report}
-            - Latest world affairs news → {news_report}
-            - Company fundamentals report → {fundamentals_report}
-            - Conversation history of the debate → {history}
-            - Last bear argument → {current_response}
-            - Reflections / past lessons → {past_memory_str}
+        - Every claim must cite data from the provided sources (see PROVIDED SOURCES below):
+            - Market research report
+            - Social media sentiment report
+            - Latest world affairs news
+            - Company fundamentals report
+            - Conversation history of the debate
+            - Last bear argument
+            - Reflections / past lessons
         - If a data point is unavailable, explicitly write **"Data unavailable from provided sources"**.  
             Never fabricate statistics, events, or quotes.
 
@@ -52,17 +73,17 @@ def create_bull_researcher(llm, memory):
         - **Growth Potential:** Highlight clear, data-supported expansion opportunities — e.g., market size, revenue trajectory, new products, or geographic scaling.
         - **Competitive Advantages:** Demonstrate moats such as brand equity, IP, network effects, customer retention, or superior unit economics.
         - **Positive Indicators:** Reference solid fundamentals — profitability, liquidity, improving sentiment, strong institutional ownership, or recent favorable news.
-        - **Counter the Bear Case:** Use evidence to refute {current_response} point-by-point, addressing risk claims logically and showing why bullish interpretation is more valid.
-        - **Apply Past Lessons:** Integrate reflections ({past_memory_str}) to avoid overconfidence or confirmation bias, acknowledging weaknesses while reinforcing your stance with data.
+        - **Counter the Bear Case:** Use evidence to refute the last bear argument point-by-point, addressing risk claims logically and showing why bullish interpretation is more valid.
+        - **Apply Past Lessons:** Integrate the reflections / past lessons to avoid overconfidence or confirmation bias, acknowledging weaknesses while reinforcing your stance with data.
 
         4. **Structure & Delivery**
         Follow this format:
         1. **Opening Statement:** Succinctly present your bullish thesis and main rationale.
         2. **Evidence-Backed Growth Drivers:** 3–5 key growth pillars with supporting data, citations, and real metrics.
-        3. **Rebuttal to Bear Points:** Respond directly to {current_response}, using logic and data to disprove or reframe bearish interpretations.
-        4. **Macro & Industry Context:** Summarize relevant positive sector or global trends from {news_report} that reinforce your thesis.
-        5. **Sentiment & Market Perception:** Discuss recent sentiment trends from {sentiment_report} and how they align with a strengthening outlook.
-        6. **Lessons Applied:** Reflect briefly on how prior experiences ({past_memory_str}) inform a more measured but confident approach.
+        3. **Rebuttal to Bear Points:** Respond directly to the last bear argument, using logic and data to disprove or reframe bearish interpretations.
+        4. **Macro & Industry Context:** Summarize relevant positive sector or global trends from the latest world affairs news that reinforce your thesis.
+        5. **Sentiment & Market Perception:** Discuss recent sentiment trends from the social media sentiment report and how they align with a strengthening outlook.
+        6. **Lessons Applied:** Reflect briefly on how prior experiences (reflections / past lessons) inform a more measured but confident approach.
         7. **Summary Table (Markdown):** Columns → Category | Evidence | Source | Implication.
         8. **Final Position:** Conclude decisively with a data-justified statement like “Given robust revenue growth, rising sentiment, and product leadership, the outlook remains bullish.”
 
@@ -88,12 +109,15 @@ def create_bull_researcher(llm, memory):
         ✔ Reflection on past mistakes is incorporated.  
         ✔ Markdown summary table present and accurate.
 
+        ### PROVIDED SOURCES
+{context.text}
+
         END PROMPT.
         """
 
 
         try:
-            response = llm.invoke(prompt)
+            response = yield Invoke(llm, prompt, "Bull Researcher")
             argument = f"Bull Analyst: {response.content}"
             print(f"Bull Researcher executed successfully: {argument[:100]}...")
         except Exception as e:
@@ -108,6 +132,9 @@ def create_bull_researcher(llm, memory):
             "count": investment_debate_state["count"] + 1,
         }
 
-        return {"investment_debate_state": new_investment_debate_state}
+        return {
+            "investment_debate_state": new_investment_debate_state,
+            "context_tokens": {"Bull Researcher": [context.token_counts]},
+        }
 
-    return bull_node
+    return create_node(bull_node)
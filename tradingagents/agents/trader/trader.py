@@ -2,8 +2,13 @@ import functools
 import time
 import json
 
+from tradingagents.agents.utils.context_builder import ContextBuilder
+from tradingagents.agents.utils.node_runtime import BlockingCall, Invoke, create_node
+
+
+def create_trader(llm, memory, context_builder=None):
+    context_builder = context_builder or ContextBuilder()
 
-def create_trader(llm, memory):
     def trader_node(state, name):
         company_name = state["company_of_interest"]
         investment_plan = state["investment_plan"]
@@ -13,7 +18,7 @@ def create_trader(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield BlockingCall(memory.get_memories, curr_situation, n_matches=2)
 
         past_memory_str = ""
         if past_memories:
@@ -22,25 +27,33 @@ def create_trader(llm, memory):
         else:
             past_memory_str = "No past memories found."
 
+        sources = context_builder.build(
+            [
+                ("Proposed Investment Plan", investment_plan),
+                ("Reflections from similar situations", past_memory_str),
+            ]
+        )
+
         context = {
             "role": "user",
-            "content": f"Based on a comprehensive analysis by a team of analysts, here is an investment plan tailored for {company_name}. This plan incorporates insights from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision.\n\nProposed Investment Plan: {investment_plan}\n\nLeverage these insights to make an informed and strategic decision.",
+            "content": f"Based on a comprehensive analysis by a team of analysts, here is an investment plan tailored for {company_name}. This plan incorporates insights from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision.\n\n{sources.text}\n\nLeverage these insights to make an informed and strategic decision.",
         }
 
         messages = [
             {
                 "role": "system",
-                "content": f"""You are a trading agent analyzing market data to make investment decisions. Based on your analysis, provide a specific recommendation to buy, sell, or hold. End with a firm decision and always conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation. Do not forget to utilize lessons from past decisions to learn from your mistakes. Here is some reflections from similar situatiosn you traded in and the lessons learned: {past_memory_str}""",
+                "content": f"""You are a trading agent analyzing market data to make investment decisions. Based on your analysis, provide a specific recommendation to buy, sell, or hold. End with a firm decision and always conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation. Do not forget to utilize lessons from past decisions to learn from your mistakes. The reflections from similar situations you traded in and the lessons learned are provided with the investment plan.""",
             },
             context,
         ]
 
-        result = llm.invoke(messages)
+        result = yield Invoke(llm, messages, "Trader")
 
         return {
             "messages": [result],
             "trader_investment_plan": result.content,
             "sender": name,
+            "context_tokens": {"Trader": [sources.token_counts]},
         }
 
-    return functools.partial(trader_node, name="Trader")
+    return create_node(functools.partial(trader_node, name="Trader"))
@@ -1,3 +1,4 @@
+import operator
 from typing import Annotated, Sequence
 from datetime import date, timedelta, datetime
 from typing_extensions import TypedDict, Optional
@@ -5,6 +6,7 @@ from typing_extensions import TypedDict, Optional
 from tradingagents.agents import *
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
+from tradingagents.agents.utils.context_builder import merge_context_tokens
 
 
 # Researcher team state
@@ -17,6 +19,12 @@ class InvestDebateState(TypedDict):
     ]  # Bullish Conversation history
     history: Annotated[str, "Conversation history"]  # Conversation history
     current_response: Annotated[str, "Latest response"]  # Last response
+    current_bull_response: Annotated[
+        str, "Latest response by the bull researcher"
+    ]  # Only tracked when rounds run concurrently
+    current_bear_response: Annotated[
+        str, "Latest response by the bear researcher"
+    ]  # Only tracked when rounds run concurrently
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
 
@@ -47,12 +55,23 @@ class RiskDebateState(TypedDict):
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
 
 
+# Rolling summary of a debate's older turns
+class DebateSummary(TypedDict):
+    text: Annotated[str, "Summary of the turns before the latest ones"]
+    turns: Annotated[int, "Number of history turns folded into the summary"]
+    count: Annotated[int, "Conversation length when the summary was last updated"]
+
+
 class AgentState(MessagesState):
     company_of_interest: Annotated[str, "Company that we are interested in trading"]
     trade_date: Annotated[str, "What date we are trading at"]
 
     sender: Annotated[str, "Agent that sent this message"]
 
+    prefetched_data: Annotated[
+        dict, "Tool results fetched for each analyst before its first turn"
+    ]
+
     # research step
     market_report: Annotated[str, "Report from the Market Analyst"]
     sentiment_report: Annotated[str, "Report from the Social Media Analyst"]
@@ -65,6 +84,12 @@ class AgentState(MessagesState):
     investment_debate_state: Annotated[
         InvestDebateState, "Current state of the debate on if to invest or not"
     ]
+    investment_debate_summary: Annotated[
+        DebateSummary, "Rolling summary of the investment debate's older turns"
+    ]
+    investment_debate_convergence: Annotated[
+        list, operator.add
+    ]  # Convergence decisions taken after investment debate rounds
     investment_plan: Annotated[str, "Plan generated by the Analyst"]
 
     trader_investment_plan: Annotated[str, "Plan generated by the Trader"]
@@ -73,4 +98,13 @@ class AgentState(MessagesState):
     risk_debate_state: Annotated[
         RiskDebateState, "Current state of the debate on evaluating risk"
     ]
+    risk_debate_summary: Annotated[
+        DebateSummary, "Rolling summary of the risk debate's older turns"
+    ]
+    risk_debate_convergence: Annotated[
+        list, operator.add
+    ]  # Convergence decisions taken after risk debate rounds
     final_trade_decision: Annotated[str, "Final decision made by the Risk Analysts"]
+
+    # Estimated prompt context tokens of every LLM call, per node
+    context_tokens: Annotated[dict, merge_context_tokens]
@@ -3,6 +3,7 @@ from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from langchain_core.tools import tool
 from datetime import date, timedelta, datetime
 import functools
@@ -18,10 +19,9 @@ from langchain_core.messages import HumanMessage
 def create_msg_delete():
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
-        messages = state["messages"]
-        
-        # Remove all messages
-        removal_operations = [RemoveMessage(id=m.id) for m in messages]
+        # Remove all messages; a single marker keeps the update independent of
+        # message ids, so streamed updates replay exactly on the client side
+        removal_operations = [RemoveMessage(id=REMOVE_ALL_MESSAGES)]
         
         # Add a minimal placeholder message
         placeholder = HumanMessage(content="Continue")
@@ -36,17 +36,18 @@ class Toolkit:
 
     @classmethod
     def update_config(cls, config):
-        """Update the class-level configuration."""
+        """Update the class-level default configuration."""
         cls._config.update(config)
 
     @property
     def config(self):
-        """Access the configuration."""
+        """Access this toolkit's configuration."""
         return self._config
 
     def __init__(self, config=None):
-        if config:
-            self.update_config(config)
+        # Each toolkit keeps its own copy so differently configured graphs can
+        # coexist; the tools themselves read the run's config via `use_config`.
+        self._config = {**type(self)._config, **(config or {})}
 
     @staticmethod
     @tool
@@ -0,0 +1,181 @@
+import math
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from tradingagents.default_config import DEFAULT_CONFIG
+
+# Every debate turn starts with its speaker's label
+_TURN_START = re.compile(
+    r"^(?:Bull Analyst|Bear Analyst|Risky Analyst|Safe Analyst|Neutral Analyst):",
+    re.MULTILINE,
+)
+
+# Characters kept from each older turn in the extractive digest
+_DIGEST_CHARS_PER_TURN = 300
+
+# Share of the budget the exact latest turns may take before being truncated
+_RECENT_TURNS_SHARE = 0.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of `text`, at about four characters per token."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def split_turns(history: str) -> List[str]:
+    """Split a debate history string into its turns, oldest first."""
+    starts = [m.start() for m in _TURN_START.finditer(history)]
+    if not starts:
+        return [history.strip()] if history.strip() else []
+    turns = [history[start:end].strip() for start, end in zip(starts, starts[1:] + [len(history)])]
+    return [t for t in turns if t]
+
+
+def digest_turns(turns: Sequence[str]) -> str:
+    """Extractive digest of older turns: each turn's speaker and opening lines."""
+    lines = []
+    for turn in turns:
+        text = " ".join(turn.split())
+        if len(text) > _DIGEST_CHARS_PER_TURN:
+            text = text[:_DIGEST_CHARS_PER_TURN].rsplit(" ", 1)[0] + " ..."
+        lines.append(f"- {text}")
+    return "\n".join(lines)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Shorten `text` to about `max_tokens`, keeping its head and tail."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max(max_tokens, 0) * 4
+    dropped = estimate_tokens(text) - max_tokens
+    marker = f"\n[... {dropped} tokens omitted ...]\n"
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    return text[:head] + marker + (text[-tail:] if tail else "")
+
+
+class PromptContext(NamedTuple):
+    """Source material assembled for one prompt."""
+
+    text: str
+    # Estimated tokens per source and in total
+    token_counts: Dict[str, int]
+
+
+class ContextBuilder:
+    """Assembles the source material of researcher, manager and debator prompts.
+
+    Each distinct source is included once, under a heading the prompt's
+    instructions refer to. A debate history keeps its latest turns verbatim
+    and condenses older ones into a summary, and the whole block is fitted
+    to a token budget by trimming the largest sources first.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None, recent_turns: Optional[int] = None):
+        self.token_budget = token_budget or DEFAULT_CONFIG["context_token_budget"]
+        self.recent_turns = recent_turns or DEFAULT_CONFIG["context_recent_turns"]
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ContextBuilder":
+        return cls(config.get("context_token_budget"), config.get("context_recent_turns"))
+
+    def build(
+        self,
+        sources: Sequence[Tuple[str, str]],
+        history: str = "",
+        history_title: str = "Debate history",
+        history_summary: str = "",
+        summarized_turns: int = 0,
+    ) -> PromptContext:
+        """Assemble `sources` and a debate `history` into one context block.
+
+        Args:
+            sources: (title, text) pairs in prompt order. A source whose text
+                repeats an earlier source or one of the verbatim latest turns
+                is replaced by a pointer to it.
+            history: Debate history, split into turns by speaker label
+            history_title: Heading of the debate section
+            history_summary: Summary of the first `summarized_turns` turns,
+                e.g. one kept up to date by a debate summarizer. Older turns
+                it does not cover yet get an extractive digest.
+            summarized_turns: Number of history turns `history_summary` covers
+        """
+        turns = split_turns(history)
+        recent = turns[-self.recent_turns:] if self.recent_turns else []
+        older = turns[: len(turns) - len(recent)]
+        summary = "\n\n".join(
+            part
+            for part in (history_summary.strip(), digest_turns(older[summarized_turns:]))
+            if part
+        )
+
+        # Exact latest turns come first in the budget, up to a fixed share
+        recent_text = "\n\n".join(recent)
+        recent_text = truncate_to_tokens(
+            recent_text, int(self.token_budget * _RECENT_TURNS_SHARE)
+        )
+
+        sections: List[Tuple[str, str]] = []
+        seen: Dict[str, str] = {}
+        for title, text in sources:
+            text = (text or "").strip()
+            if not text:
+                sections.append((title, "Not available."))
+            elif text in seen:
+                sections.append((title, f"Same as \"{seen[text]}\" above."))
+            elif any(text in turn for turn in recent):
+                sections.append((title, f"See the latest turns under \"{history_title}\"."))
+            else:
+                seen[text] = title
+                sections.append((title, text))
+        if summary:
+            sections.append((f"{history_title} - summary of earlier turns", summary))
+
+        fitted = self._fit(sections, self.token_budget - estimate_tokens(recent_text))
+        if turns:
+            fitted.append((f"{history_title} - latest turns", recent_text))
+
+        token_counts = {title: estimate_tokens(text) for title, text in fitted}
+        token_counts["total"] = sum(token_counts.values())
+        text = "\n\n".join(f"### {title}\n{text}" for title, text in fitted)
+        return PromptContext(text, token_counts)
+
+    def _fit(self, sections: List[Tuple[str, str]], budget: int) -> List[Tuple[str, str]]:
+        """Trim sections to fit `budget`, giving small ones their full length.
+
+        The budget is shared evenly; sections below their share keep all of
+        their text and pass the remainder on to the larger ones.
+        """
+        sizes = [estimate_tokens(text) for _, text in sections]
+        if sum(sizes) <= budget:
+            return list(sections)
+
+        limits = [0] * len(sections)
+        remaining = max(budget, 0)
+        pending = sorted(range(len(sections)), key=lambda i: sizes[i])
+        while pending:
+            share = remaining // len(pending)
+            i = pending[0]
+            if sizes[i] <= share:
+                limits[i] = sizes[i]
+                remaining -= sizes[i]
+                pending.pop(0)
+            else:
+                for i in pending:
+                    limits[i] = share
+                break
+
+        return [
+            (title, truncate_to_tokens(text, limit))
+            for (title, text), limit in zip(sections, limits)
+        ]
+
+
+def merge_context_tokens(
+    left: Dict[str, List[Dict[str, int]]], right: Dict[str, List[Dict[str, int]]]
+) -> Dict[str, List[Dict[str, int]]]:
+    """State reducer appending each node's per-call context token counts."""
+    merged = {node: list(counts) for node, counts in (left or {}).items()}
+    for node, counts in (right or {}).items():
+        merged.setdefault(node, []).extend(counts)
+    return merged
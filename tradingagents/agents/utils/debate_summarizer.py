@@ -0,0 +1,48 @@
+from tradingagents.agents.utils.context_builder import ContextBuilder, split_turns
+from tradingagents.agents.utils.node_runtime import Invoke, create_node
+
+# Rough length cap of the rolling summary, in words
+_SUMMARY_WORDS = 250
+
+
+def create_debate_summarizer(llm, debate_key, summary_key, context_builder=None):
+    """Create a node folding a debate's older turns into a rolling summary.
+
+    The node runs after every round. Turns the context builder no longer
+    shows verbatim are merged into the summary stored under `summary_key`
+    with one call to `llm` (a cheap model is enough), so prompts carry a
+    bounded summary plus the latest turns instead of the whole history. The
+    raw history in `debate_key` is left untouched for the state log.
+    """
+    context_builder = context_builder or ContextBuilder()
+
+    def debate_summarizer_node(state) -> dict:
+        debate_state = state[debate_key]
+        summary = state.get(summary_key) or {}
+        text = summary.get("text", "")
+        folded = summary.get("turns", 0)
+
+        turns = split_turns(debate_state.get("history", ""))
+        fold_until = max(len(turns) - context_builder.recent_turns, folded)
+        if fold_until > folded:
+            new_turns = "\n\n".join(turns[folded:fold_until])
+            prompt = f"""You keep a running summary of a debate between financial analysts.
+Fold the new turns into the current summary. For every speaker keep their position, the key claims with the figures they cited, and any concessions; drop repetition and rhetoric. Reply with the updated summary only, in at most {_SUMMARY_WORDS} words.
+
+Current summary:
+{text or "None yet."}
+
+New turns:
+{new_turns}"""
+            response = yield Invoke(llm, prompt)
+            text = response.content
+
+        return {
+            summary_key: {
+                "text": text,
+                "turns": fold_until,
+                "count": debate_state["count"],
+            }
+        }
+
+    return create_node(debate_summarizer_node)
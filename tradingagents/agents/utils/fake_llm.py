@@ -0,0 +1,117 @@
+import asyncio
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+# How analyst prompts name the ticker, e.g. "The company we want to analyze is NVDA."
+_TICKER = re.compile(r"\b(?:analy[sz]e is|relevance to)\s+([A-Z0-9^][A-Z0-9.\-]{0,9}?)\.?(?:\s|$)")
+
+# Values for tool parameters that are neither dates nor tickers
+_ARGUMENTS = {"indicator": "rsi", "freq": "quarterly"}
+
+_FILLER = (
+    "Revenue growth, margins and guidance are weighed against valuation, "
+    "positioning and the macro backdrop. "
+)
+
+
+class FakeChatModel(BaseChatModel):
+    """Local stand-in for a chat model, for offline benchmarks and CI.
+
+    It takes `latency` seconds per call, without holding the event loop in
+    async runs. When tools are bound and `tool_calls` is set, its first
+    answer in a conversation calls every bound tool, with arguments
+    guessed from the tool schemas and the conversation. Later answers are
+    about `response_words` words long and end with a FINAL TRANSACTION
+    PROPOSAL for `decision`. Token usage is estimated from text length.
+    """
+
+    model_name: str = "fake-chat"
+    latency: float = 0.0
+    decision: str = "HOLD"
+    tool_calls: bool = True
+    response_words: int = 120
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "decision": self.decision}
+
+    def _get_ls_params(self, stop=None, **kwargs):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_model_name"] = self.model_name
+        return params
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._result(messages, tools)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._result(messages, tools)
+
+    def _result(self, messages: List[BaseMessage], tools: Optional[List[dict]]) -> ChatResult:
+        if tools and self.tool_calls and not any(isinstance(m, ToolMessage) for m in messages):
+            message = AIMessage(content="", tool_calls=self._tool_calls(messages, tools))
+        else:
+            words = (_FILLER * (self.response_words // 15 + 1)).split()[: self.response_words]
+            message = AIMessage(
+                content=f"{self.model_name}: {' '.join(words)}\n\n"
+                f"FINAL TRANSACTION PROPOSAL: **{self.decision}**"
+            )
+        input_chars = sum(len(str(m.content)) for m in messages)
+        output_tokens = max(1, len(str(message.content)) // 4)
+        message.usage_metadata = {
+            "input_tokens": input_chars // 4,
+            "output_tokens": output_tokens,
+            "total_tokens": input_chars // 4 + output_tokens,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _tool_calls(self, messages, tools) -> List[dict]:
+        text = " ".join(str(m.content) for m in messages)
+        dates = _DATE.findall(text)
+        match = _TICKER.search(text)
+        # Graph runs otherwise open with the ticker as the first human message
+        ticker = match.group(1) if match else next(
+            (str(m.content).strip() for m in messages if isinstance(m, HumanMessage)), "SPY"
+        )
+        calls = []
+        for i, tool in enumerate(tools):
+            function = tool["function"]
+            properties = function.get("parameters", {}).get("properties", {})
+            args = {
+                name: _guess_argument(name, schema, ticker, dates[-1] if dates else "2024-01-02")
+                for name, schema in properties.items()
+            }
+            calls.append({"name": function["name"], "args": args, "id": f"fake_call_{i}"})
+        return calls
+
+
+def _guess_argument(name: str, schema: Dict[str, Any], ticker: str, date: str):
+    kind = schema.get("type")
+    if kind == "integer":
+        return 7
+    if kind == "number":
+        return 7.0
+    if kind == "boolean":
+        return False
+    if "date" in name:
+        return date
+    if name == "query":
+        return f"{ticker} stock"
+    return _ARGUMENTS.get(name, ticker)
@@ -0,0 +1,76 @@
+import json
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from tradingagents.dataflows.llm_cassette import LLMCassette, request_key
+
+
+class CassetteLLMCache(BaseCache):
+    """LangChain cache recording chat responses to, or replaying them from, a cassette.
+
+    In "record" mode every request goes to the provider and its response is
+    stored; in "replay" mode responses come from the cassette only, and a
+    request that was never recorded raises `CassetteMiss` instead of
+    reaching the network. "cache" mode serves recorded responses and
+    records the rest, so repeating a run with identical inputs is free.
+    """
+
+    def __init__(self, cassette: LLMCassette, mode: str):
+        if mode not in ("record", "replay", "cache"):
+            raise ValueError(f"A cassette cache records, replays or caches, not {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if self.mode == "record":
+            return None
+        request = _cassette_request(prompt, llm_string)
+        if self.mode == "cache":
+            response = self.cassette.get("chat", request_key(request))
+            return loads(response) if response is not None else None
+        return loads(self.cassette.replay("chat", request_key(request), request))
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if self.mode in ("record", "cache"):
+            request = _cassette_request(prompt, llm_string)
+            self.cassette.put("chat", request_key(request), request, dumps(list(return_val)))
+
+    def clear(self, **kwargs: Any) -> None:
+        pass
+
+
+def _cassette_request(prompt: str, llm_string: str) -> str:
+    # The serialized model masks its API key, so replays may run without one
+    return json.dumps([_normalize_prompt(prompt), llm_string])
+
+
+# Serialized message fields that never reach the model
+_VOLATILE_FIELDS = {"usage_metadata", "response_metadata"}
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Drop message ids and metadata from a serialized prompt.
+
+    The graph assigns fresh ids to state messages on every run, and replayed
+    responses carry different usage metadata; either would otherwise make
+    identical conversations miss the cache.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+
+    def strip_ids(value):
+        if isinstance(value, dict):
+            return {
+                k: strip_ids(v)
+                for k, v in value.items()
+                if k not in _VOLATILE_FIELDS and (k != "id" or not isinstance(v, str))
+            }
+        if isinstance(value, list):
+            return [strip_ids(v) for v in value]
+        return value
+
+    return json.dumps(strip_ids(messages), sort_keys=True)
@@ -1,16 +1,41 @@
 import chromadb
 from chromadb.config import Settings
+import json
+import math
 import os
+import threading
+import time
+import uuid
+import warnings
+import numpy as np
 import requests
 from chromadb.errors import NotFoundError 
 
+from tradingagents.dataflows.llm_cassette import (
+    get_cassette,
+    get_llm_mode,
+    hashed_embedding,
+    request_key,
+)
+
+# Dimension of the offline embeddings of the "fake" LLM mode
+_FAKE_EMBEDDING_DIM = 256
+
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
         self.embedding_model = "text-embedding-004"
         self.api_key = os.getenv("GOOGLE_API_KEY")
-        if not self.api_key:
+        # "record" stores embeddings in the LLM cassette, "replay" reads them
+        # back and "fake" computes them locally; only live calls need a key
+        self.llm_mode = get_llm_mode(config)
+        if self.llm_mode in ("live", "record") and not self.api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is required")
+        self.cassette = (
+            get_cassette(config) if self.llm_mode in ("record", "replay") else None
+        )
+        if self.llm_mode == "fake":
+            self.dim = _FAKE_EMBEDDING_DIM
         
         self.chroma_client = chromadb.Client(Settings(allow_reset=True))
 
@@ -18,25 +43,57 @@ class FinancialSituationMemory:
             self.situation_collection = self.chroma_client.get_collection(name=name)
         except NotFoundError:
             self.situation_collection = self.chroma_client.create_collection(name=name)
+
+        # Retention policy
+        self.max_entries = config.get("memory_max_entries")
+        self.dedup_threshold = config.get("memory_dedup_threshold")
+        self.recency_half_life_days = config.get("memory_recency_half_life_days", 30)
+
+        # Guards dedup-then-add against the background compaction job
+        self._lock = threading.RLock()
+        self._compaction_stop = None
+        self._compaction_thread = None
+
+        compaction_interval = config.get("memory_compaction_interval")
+        if compaction_interval:
+            self.start_compaction(compaction_interval)
+
     def get_embedding(self, text: str):
-        """Return a vector embedding for `text` using Google text-embedding-004."""
+        """Return a vector embedding for `text` using Google text-embedding-004.
+
+        Served from the LLM cassette or computed locally in the "replay" and
+        "fake" LLM modes.
+        """
         # print(f'self.embedding_model------------------------------->: {self.embedding_model}')
         # 1) Guard against empty input (prevents 400s)
         if not isinstance(text, str) or not text.strip():
             # choose: return zeros, or raise. Returning zeros keeps the pipeline flowing.
             return [0.0] * getattr(self, "dim", 768)  # adjust default dim if needed
 
+        # TODO: 9000 chars trim fix
+        text = text[:9000]
+
+        if self.llm_mode == "fake":
+            return hashed_embedding(text, self.dim)
+        if self.cassette is None:
+            return self._request_embedding(text)
+
+        request = json.dumps([self.embedding_model, text])
+        key = request_key(request)
+        if self.llm_mode == "replay":
+            return json.loads(self.cassette.replay("embeddings", key, request))
+        emb = self._request_embedding(text)
+        self.cassette.put("embeddings", key, request, json.dumps(emb))
+        return emb
+
+    def _request_embedding(self, text: str):
+        """Call the Google embedding API."""
         url = (
             f"https://generativelanguage.googleapis.com/v1beta/models/"
             f"{self.embedding_model}:embedContent"
         )
         headers = {"Content-Type": "application/json"}
         params = {"key": self.api_key}
-
-        # TODO: 9000 chars trim fix
-        text = text[:9000]
-
-        
         payload = {"content": {"parts": [{"text": text}]}}
 
         try:
@@ -58,28 +115,58 @@ class FinancialSituationMemory:
         return emb
 
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    def add_situations(self, situations_and_advice, outcome=None, embeddings=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+        With `memory_dedup_threshold` set (off by default), a situation whose
+        nearest stored neighbour is at least that similar is merged into that
+        entry instead of being added. `outcome` is the
+        realised return the advice was derived from and weights retention;
+        `embeddings` may carry precomputed situation embeddings.
+        """
+        now = time.time()
+        outcome = _as_float(outcome)
+        items = list(situations_and_advice)
 
-        offset = self.situation_collection.count()
+        # Embed before taking the lock so writers and compaction never wait
+        # on the embedding API
+        if embeddings is None:
+            embeddings = [self.get_embedding(situation) for situation, _ in items]
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        with self._lock:
+            situations = []
+            metadatas = []
+            new_embeddings = []
 
-        self.situation_collection.add(
-            documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
-            ids=ids,
-        )
+            for (situation, recommendation), embedding in zip(items, embeddings):
+                incoming = {
+                    "recommendation": recommendation,
+                    "created_at": now,
+                    "last_accessed": now,
+                    "outcome": outcome,
+                    "merge_count": 1,
+                }
+                # Near-identical items of the same batch merge with each other
+                pending = self._nearest_pending(embedding, new_embeddings)
+                if pending is not None:
+                    metadatas[pending] = _merged_metadata([incoming, metadatas[pending]])
+                    continue
+                if self._merge_near_duplicate(embedding, incoming):
+                    continue
+
+                situations.append(situation)
+                metadatas.append(incoming)
+                new_embeddings.append(embedding)
+
+            if situations:
+                self.situation_collection.add(
+                    documents=situations,
+                    metadatas=metadatas,
+                    embeddings=new_embeddings,
+                    ids=[uuid.uuid4().hex for _ in situations],
+                )
+
+            self._evict_over_capacity()
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using Google embeddings"""
@@ -101,8 +188,184 @@ class FinancialSituationMemory:
                 }
             )
 
+        # Refresh recency of the memories that were actually useful; compaction
+        # may have merged or evicted some of them since the query
+        if results["ids"][0]:
+            now = time.time()
+            with self._lock:
+                ids = self.situation_collection.get(ids=results["ids"][0], include=[])["ids"]
+                if ids:
+                    self.situation_collection.update(
+                        ids=ids, metadatas=[{"last_accessed": now} for _ in ids]
+                    )
+
         return matched_results
 
+    def compact(self):
+        """Merge near-duplicate memories and evict entries beyond capacity.
+
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            before = self.situation_collection.count()
+            if before == 0:
+                return 0
+
+            data = self.situation_collection.get(include=["embeddings", "metadatas"])
+            ids = data["ids"]
+            metadatas = data["metadatas"]
+            vectors = np.asarray(data["embeddings"], dtype=float)
+
+            if self.dedup_threshold is not None and len(ids) > 1:
+                # Newest first, so the surviving entry carries the latest advice
+                order = sorted(
+                    range(len(ids)),
+                    key=lambda i: metadatas[i].get("created_at", 0.0),
+                    reverse=True,
+                )
+                kept = []
+                merged_into = {}
+                for i in order:
+                    target = None
+                    if kept:
+                        kept_vectors = vectors[kept]
+                        similarities = 1 - np.sum((kept_vectors - vectors[i]) ** 2, axis=1)
+                        best = int(np.argmax(similarities))
+                        if similarities[best] >= self.dedup_threshold:
+                            target = kept[best]
+                    if target is None:
+                        kept.append(i)
+                    else:
+                        merged_into.setdefault(target, []).append(i)
+
+                if merged_into:
+                    updated_ids = []
+                    updated_metadatas = []
+                    for target, duplicates in merged_into.items():
+                        group = [metadatas[target]] + [metadatas[j] for j in duplicates]
+                        updated_ids.append(ids[target])
+                        updated_metadatas.append(_merged_metadata(group))
+                    self.situation_collection.update(
+                        ids=updated_ids, metadatas=updated_metadatas
+                    )
+                    self.situation_collection.delete(
+                        ids=[ids[j] for group in merged_into.values() for j in group]
+                    )
+
+            self._evict_over_capacity()
+            return before - self.situation_collection.count()
+
+    def start_compaction(self, interval_seconds):
+        """Run `compact` every `interval_seconds` on a daemon thread."""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+
+        self._compaction_stop = threading.Event()
+
+        def run():
+            while not self._compaction_stop.wait(interval_seconds):
+                try:
+                    self.compact()
+                except Exception as e:
+                    warnings.warn(f"Memory compaction failed: {e!r}", RuntimeWarning)
+
+        self._compaction_thread = threading.Thread(
+            target=run, name="memory-compaction", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def stop_compaction(self):
+        """Stop the background compaction job, if running."""
+        if self._compaction_stop is not None:
+            self._compaction_stop.set()
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        self._compaction_thread = None
+
+    def _nearest_pending(self, embedding, pending_embeddings):
+        """Index of a not yet stored embedding near-identical to `embedding`, if any."""
+        if self.dedup_threshold is None or not pending_embeddings:
+            return None
+        vectors = np.asarray(pending_embeddings, dtype=float)
+        # Same measure as the collection's: 1 - squared L2 distance
+        similarities = 1 - np.sum((vectors - np.asarray(embedding, dtype=float)) ** 2, axis=1)
+        best = int(np.argmax(similarities))
+        return best if similarities[best] >= self.dedup_threshold else None
+
+    def _merge_near_duplicate(self, embedding, incoming):
+        """Fold a new reflection into its nearest stored neighbour if it is near-identical."""
+        if self.dedup_threshold is None or self.situation_collection.count() == 0:
+            return False
+
+        nearest = self.situation_collection.query(
+            query_embeddings=[embedding],
+            n_results=1,
+            include=["metadatas", "distances"],
+        )
+        if not nearest["ids"][0]:
+            return False
+        if 1 - nearest["distances"][0][0] < self.dedup_threshold:
+            return False
+
+        existing = nearest["metadatas"][0][0]
+        self.situation_collection.update(
+            ids=[nearest["ids"][0][0]],
+            metadatas=[_merged_metadata([incoming, existing])],
+        )
+        return True
+
+    def _evict_over_capacity(self):
+        """Drop the lowest-value entries until the collection fits `max_entries`."""
+        if not self.max_entries:
+            return
+
+        excess = self.situation_collection.count() - self.max_entries
+        if excess <= 0:
+            return
+
+        data = self.situation_collection.get(include=["metadatas"])
+        now = time.time()
+        scored = sorted(
+            zip(data["ids"], data["metadatas"]),
+            key=lambda item: self._retention_score(item[1], now),
+        )
+        self.situation_collection.delete(ids=[id_ for id_, _ in scored[:excess]])
+
+    def _retention_score(self, metadata, now):
+        """Higher is more worth keeping: recent, decisive and often-recurring lessons."""
+        last_used = metadata.get("last_accessed", metadata.get("created_at", now))
+        age_days = max(now - last_used, 0.0) / 86400
+        recency = 0.5 ** (age_days / self.recency_half_life_days)
+
+        magnitude = abs(metadata.get("outcome", 0.0))
+        outcome_weight = 1 + magnitude / (1 + magnitude)
+
+        recurrence = 1 + math.log(metadata.get("merge_count", 1))
+
+        return recency * outcome_weight * recurrence
+
+
+def _as_float(value):
+    """Coerce a returns/losses figure into chromadb-storable metadata."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _merged_metadata(group):
+    """Combine metadata of near-duplicate memories; the first entry is the newest."""
+    newest = group[0]
+    merge_counts = [m.get("merge_count", 1) for m in group]
+    total = sum(merge_counts)
+    return {
+        "recommendation": newest["recommendation"],
+        "created_at": max(m.get("created_at", 0.0) for m in group),
+        "last_accessed": max(m.get("last_accessed", 0.0) for m in group),
+        "outcome": sum(m.get("outcome", 0.0) * n for m, n in zip(group, merge_counts)) / total,
+        "merge_count": total,
+    }
+
 
 if __name__ == "__main__":
     # Example usage
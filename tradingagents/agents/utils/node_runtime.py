@@ -0,0 +1,166 @@
+import asyncio
+from contextlib import ExitStack
+from typing import Any, Callable, ContextManager, List, NamedTuple, Optional
+
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from .token_stream import ainvoke_with_token_stream, invoke_with_token_stream
+
+# Scopes entered in the worker thread around the blocking work that async
+# nodes hand to `asyncio.to_thread`; each is called with the node's config
+_worker_scopes: List[Callable[[RunnableConfig], ContextManager]] = []
+
+
+def register_worker_scope(scope: Callable[[RunnableConfig], ContextManager]):
+    """Enter `scope(config)` around every blocking call async nodes run in a worker thread."""
+    if scope not in _worker_scopes:
+        _worker_scopes.append(scope)
+
+
+class Invoke(NamedTuple):
+    """Invoke a runnable (LLM, chain, tool or subgraph) with the node's config."""
+
+    runnable: Any
+    input: Any
+    # Streams the LLM's tokens under this agent name when the run enables it
+    agent: Optional[str] = None
+
+
+class NodeCall(NamedTuple):
+    """Run another node created by `create_node` on `state`."""
+
+    node: Callable
+    state: Any
+
+
+class Gather(NamedTuple):
+    """Run several requests concurrently and return their results in order.
+
+    With `return_exceptions` a failing request yields its exception instead
+    of failing the whole group.
+    """
+
+    requests: List[Any]
+    return_exceptions: bool = False
+
+
+class BlockingCall:
+    """A blocking call, such as an embedding lookup, that has no async version."""
+
+    def __init__(self, func: Callable, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+
+def create_node(step):
+    """Build a graph node that runs both synchronously and on an event loop.
+
+    `step(state)` is a generator yielding the node's requests (`Invoke`,
+    `NodeCall`, `Gather`, `BlockingCall`) and receiving their results; its
+    return value is the node's update. Exceptions raised by a request are
+    thrown back into the step. The returned function is the synchronous node;
+    its `afunc` attribute issues the same requests with `ainvoke` and is what
+    `as_runnable` hands to the graph, and `step` is the generator itself.
+    """
+
+    def node(state, config: RunnableConfig = None):
+        steps = step(state)
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    result = _run(request, config)
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    async def anode(state, config: RunnableConfig = None):
+        steps = step(state)
+        try:
+            request = next(steps)
+            while True:
+                try:
+                    result = await _arun(request, config)
+                except Exception as e:
+                    request = steps.throw(e)
+                else:
+                    request = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    # Not functools.wraps: a __wrapped__ step would hide the config parameter
+    # from the signature inspection that decides whether config is passed in
+    node.__name__ = anode.__name__ = getattr(step, "__name__", "node")
+    node.afunc = anode
+    node.step = step
+    return node
+
+
+def as_runnable(node):
+    """Wrap a node for `StateGraph.add_node`, keeping its async version if it has one."""
+    afunc = getattr(node, "afunc", None)
+    if afunc is None:
+        return node
+    return RunnableLambda(node, afunc=afunc, name=getattr(node, "__name__", None))
+
+
+def _run(request, config):
+    if isinstance(request, Invoke):
+        if request.agent is not None:
+            return invoke_with_token_stream(request.runnable, request.input, request.agent, config)
+        return request.runnable.invoke(request.input, config)
+    if isinstance(request, NodeCall):
+        return request.node(request.state, config)
+    if isinstance(request, Gather):
+        if not request.requests:
+            return []
+        with ContextThreadPoolExecutor(max_workers=len(request.requests)) as executor:
+            futures = [executor.submit(_run, r, config) for r in request.requests]
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is not None and not request.return_exceptions:
+                raise error
+            results.append(error if error is not None else future.result())
+        return results
+    if isinstance(request, BlockingCall):
+        return request.func(*request.args, **request.kwargs)
+    raise TypeError(f"Unknown node request {request!r}")
+
+
+async def _arun(request, config):
+    if isinstance(request, Invoke):
+        if request.agent is not None:
+            return await ainvoke_with_token_stream(
+                request.runnable, request.input, request.agent, config
+            )
+        return await request.runnable.ainvoke(request.input, config)
+    if isinstance(request, NodeCall):
+        afunc = getattr(request.node, "afunc", None)
+        if afunc is None:
+            return await asyncio.to_thread(
+                _in_worker, config, request.node, request.state, config
+            )
+        return await afunc(request.state, config)
+    if isinstance(request, Gather):
+        return await asyncio.gather(
+            *(_arun(r, config) for r in request.requests),
+            return_exceptions=request.return_exceptions,
+        )
+    if isinstance(request, BlockingCall):
+        return await asyncio.to_thread(
+            _in_worker, config, request.func, *request.args, **request.kwargs
+        )
+    raise TypeError(f"Unknown node request {request!r}")
+
+
+def _in_worker(config, func, *args, **kwargs):
+    with ExitStack() as stack:
+        for scope in _worker_scopes:
+            stack.enter_context(scope(config))
+        return func(*args, **kwargs)
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from .node_runtime import Gather, Invoke, NodeCall, create_node
+
+
+class ReportCache:
+    """Disk cache of final analyst reports.
+
+    Entries are keyed by ticker, trade date, analyst, model, prompt version
+    and a description of the tools' data sources. Each entry also keeps the
+    tool calls its report was built from and a digest of their results, so
+    a report is only reused while its data is unchanged.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(
+        self,
+        ticker: str,
+        trade_date: str,
+        analyst: str,
+        model: str,
+        prompt_version: str,
+        data_source: str,
+    ) -> str:
+        """Build the cache key for one analyst report."""
+        parts = [ticker.upper(), str(trade_date), analyst, model, prompt_version, data_source]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached report for `key`, or None."""
+        entry = self.get_entry(key)
+        return entry["report"] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[dict]:
+        """Return the cached entry for `key` with its metadata, or None."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if "report" in entry else None
+
+    def set(self, key: str, report: str, **metadata):
+        """Store a report; the write is atomic so concurrent runs never see partial files."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"report": report, "created_at": time.time(), **metadata}, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+
+def prompt_fingerprint(node) -> str:
+    """Hash the string constants of a node function, i.e. its prompt text.
+
+    Any edit to an analyst's prompt changes the fingerprint and so invalidates
+    its cached reports without a manually bumped version number.
+    """
+    digest = hashlib.sha256()
+
+    def visit(code):
+        for const in code.co_consts:
+            if isinstance(const, str):
+                digest.update(const.encode("utf-8"))
+            elif hasattr(const, "co_consts"):
+                visit(const)
+
+    visit(getattr(node, "step", node).__code__)
+    return digest.hexdigest()[:16]
+
+
+def data_digest(contents) -> str:
+    """Hash the contents of a sequence of tool results."""
+    return hashlib.sha256(json.dumps(list(contents)).encode("utf-8")).hexdigest()
+
+
+def tool_result_content(result) -> str:
+    """Tool output as the tool loop records it, including the error text of a failed call."""
+    if isinstance(result, Exception):
+        return f"Error: {result!r}\n Please fix your mistakes."
+    return str(result)
+
+
+def _tool_results(messages) -> list:
+    """The (name, args, content) of every answered tool call in a conversation."""
+    calls = {}
+    for message in messages:
+        for call in getattr(message, "tool_calls", None) or []:
+            calls[call["id"]] = call
+    return [
+        {
+            "name": calls[m.tool_call_id]["name"],
+            "args": calls[m.tool_call_id]["args"],
+            "content": str(m.content),
+        }
+        for m in messages
+        if isinstance(m, ToolMessage) and m.tool_call_id in calls
+    ]
+
+
+def create_cached_analyst(
+    analyst_node, cache: ReportCache, analyst_type, report_key, model, data_source, tools_by_name
+):
+    """Wrap an analyst node so a cached report skips its LLM turns.
+
+    A cached report is only served after its tool calls are repeated and
+    return the same data, so re-fetched news or corrected prices for the
+    same date rebuild the report. On a hit the node answers with the report
+    as a plain AI message, which carries no tool calls, so the graph moves
+    straight on. Finished reports from live runs are written back to the
+    cache. The node's `has_cached_report(state)` tells whether an entry
+    exists for a run, so the graph can skip prefetching its data.
+    """
+    prompt_version = prompt_fingerprint(analyst_node)
+
+    def make_key(state):
+        return cache.make_key(
+            state["company_of_interest"],
+            state["trade_date"],
+            analyst_type,
+            model,
+            prompt_version,
+            data_source,
+        )
+
+    def cached_analyst_node(state):
+        key = make_key(state)
+        # Only the first turn may be answered from the cache
+        first_turn = not any(isinstance(m, AIMessage) for m in state["messages"])
+        entry = cache.get_entry(key) if first_turn else None
+        calls = (entry or {}).get("tool_calls", [])
+        if entry is not None and all(call["name"] in tools_by_name for call in calls):
+            results = yield Gather(
+                [Invoke(tools_by_name[call["name"]], call["args"]) for call in calls],
+                return_exceptions=True,
+            )
+            if data_digest(map(tool_result_content, results)) == entry.get("data_digest"):
+                report = entry["report"]
+                return {"messages": [AIMessage(content=report)], report_key: report}
+
+        update = yield NodeCall(analyst_node, state)
+        if update.get(report_key):
+            results = _tool_results(state["messages"])
+            cache.set(
+                key,
+                update[report_key],
+                ticker=state["company_of_interest"],
+                trade_date=state["trade_date"],
+                analyst=analyst_type,
+                model=model,
+                tool_calls=[{"name": r["name"], "args": r["args"]} for r in results],
+                data_digest=data_digest(r["content"] for r in results),
+            )
+        return update
+
+    node = create_node(cached_analyst_node)
+    node.has_cached_report = lambda state: cache.get_entry(make_key(state)) is not None
+    return node
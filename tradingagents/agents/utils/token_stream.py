@@ -0,0 +1,71 @@
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, TypeVar
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import merge_configs
+from langgraph.config import get_config
+from langgraph.constants import CONFIG_KEY_STREAM_WRITER
+
+# Key of the graph run's configurable enabling token streaming
+STREAM_TOKENS_KEY = "stream_tokens"
+
+T = TypeVar("T")
+
+
+class AgentTokenHandler(BaseCallbackHandler):
+    """Forwards an agent's LLM tokens to the graph's custom stream channel.
+
+    Defining the `tap_output_*` hooks marks the handler as a streaming
+    handler, so a plain `invoke` switches to the model's streaming API while
+    still returning the complete message (and still honouring the LLM cache).
+    """
+
+    run_inline = True
+
+    def __init__(self, agent: str, writer: Callable[[Any], None]):
+        self.agent = agent
+        self.writer = writer
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if token:
+            self.writer({"type": "agent_token", "agent": self.agent, "token": token})
+
+    def tap_output_iter(self, run_id: UUID, output: Iterator[T]) -> Iterator[T]:
+        return output
+
+    def tap_output_aiter(self, run_id: UUID, output: AsyncIterator[T]) -> AsyncIterator[T]:
+        return output
+
+
+def _token_stream_config(config: RunnableConfig, agent: str) -> RunnableConfig:
+    """Add a token handler to a node's config if its run enabled token streaming."""
+    configurable = config.get("configurable", {})
+    writer = configurable.get(CONFIG_KEY_STREAM_WRITER)
+    if not configurable.get(STREAM_TOKENS_KEY) or writer is None:
+        return config
+    return merge_configs(config, {"callbacks": [AgentTokenHandler(agent, writer)]})
+
+
+def invoke_with_token_stream(llm, prompt, agent: str, config: Optional[RunnableConfig] = None):
+    """Invoke `llm`, streaming its tokens as `agent` when the run asked for it.
+
+    `config` is the calling node's config and is looked up from the context
+    when omitted. Outside a graph run, or when the run's configurable does not
+    enable `stream_tokens`, this is a plain `llm.invoke(prompt)`.
+    """
+    if config is None:
+        try:
+            config = get_config()
+        except RuntimeError:
+            return llm.invoke(prompt)
+    return llm.invoke(prompt, config=_token_stream_config(config, agent))
+
+
+async def ainvoke_with_token_stream(llm, prompt, agent: str, config: RunnableConfig):
+    """Async twin of `invoke_with_token_stream`.
+
+    The node's config must be passed explicitly: before Python 3.11 it is not
+    available from the context inside coroutines.
+    """
+    return await llm.ainvoke(prompt, config=_token_stream_config(config or {}, agent))
@@ -0,0 +1,136 @@
+import contextvars
+import inspect
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+# Arguments compared case-insensitively when building cache keys
+_SYMBOL_ARGS = {"symbol", "ticker"}
+
+_current_run: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "tool_cache_run", default=None
+)
+
+
+class ToolCallCache:
+    """Memoizes tool calls so identical data requests hit the dataflows once.
+
+    With scope "run" entries live only for the duration of one graph run;
+    with scope "process" they are shared by every run in the process, up to
+    `max_entries`. Identical calls issued concurrently share one execution.
+    """
+
+    def __init__(self, scope: str = "run", max_entries: int = 1024):
+        if scope not in ("run", "process"):
+            raise ValueError(f"Unknown tool cache scope {scope!r}")
+        self.scope = scope
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Future]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def run_scope(self, run_id: Optional[str] = None):
+        """Scope the calls made inside the block to one run and collect its hit stats.
+
+        Yields the stats dict, which is complete once the block exits.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        stats = {"hits": 0, "misses": 0}
+        with self._lock:
+            self._stats[run_id] = stats
+        token = _current_run.set(run_id)
+        try:
+            yield stats
+        finally:
+            _current_run.reset(token)
+            with self._lock:
+                self._stats.pop(run_id, None)
+                if self.scope == "run":
+                    for key in [key for key in self._entries if key[0] == run_id]:
+                        del self._entries[key]
+            total = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / total, 3) if total else 0.0
+
+    def wrap(self, tool: BaseTool) -> BaseTool:
+        """Return a copy of `tool` whose calls go through the cache."""
+        signature = inspect.signature(tool.func)
+
+        def cached_call(**kwargs):
+            key = self._make_key(tool.name, signature, kwargs)
+            return self._get_or_compute(key, lambda: tool.func(**kwargs))
+
+        return StructuredTool.from_function(
+            func=cached_call,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+        )
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _make_key(self, name, signature, kwargs) -> tuple:
+        bound = signature.bind_partial(**kwargs)
+        bound.apply_defaults()
+        normalized = {}
+        for arg, value in bound.arguments.items():
+            if isinstance(value, str):
+                value = value.strip()
+                if arg in _SYMBOL_ARGS:
+                    value = value.upper()
+            normalized[arg] = value
+        scope_id = _current_run.get() if self.scope == "run" else None
+        return (scope_id, name, json.dumps(normalized, sort_keys=True, default=str))
+
+    def _get_or_compute(self, key, compute):
+        run_id = _current_run.get()
+        with self._lock:
+            stats = self._stats.get(run_id)
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            if stats is not None:
+                stats["misses" if owner else "hits"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = compute()
+        except BaseException as e:
+            # Failures are not cached; waiters see the error, later calls retry
+            with self._lock:
+                if self._entries.get(key) is future:
+                    del self._entries[key]
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+
+_process_cache: Optional[ToolCallCache] = None
+_process_cache_lock = threading.Lock()
+
+
+def get_process_tool_cache(max_entries: int = 1024) -> ToolCallCache:
+    """Return the tool cache shared by all graphs in this process."""
+    global _process_cache
+    with _process_cache_lock:
+        if _process_cache is None:
+            _process_cache = ToolCallCache(scope="process", max_entries=max_entries)
+        return _process_cache
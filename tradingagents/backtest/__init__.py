@@ -0,0 +1,15 @@
+# TradingAgents/backtest/__init__.py
+
+from .engine import (
+    Backtester,
+    BacktestResult,
+    compute_metrics,
+    load_price_history,
+)
+
+__all__ = [
+    "Backtester",
+    "BacktestResult",
+    "compute_metrics",
+    "load_price_history",
+]
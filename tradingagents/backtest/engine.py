@@ -0,0 +1,225 @@
+# TradingAgents/backtest/engine.py
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.graph.signal_processing import (
+    MIN_SIGNAL_CONFIDENCE,
+    UNKNOWN_ACTION,
+    parse_signal,
+    scored_action,
+)
+
+# Position taken for each scored decision; unreadable decisions stay flat
+SIGNAL_POSITIONS = {"BUY": 1, "HOLD": 0, "SELL": -1, UNKNOWN_ACTION: 0}
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def load_price_history(data_dir: str, symbol: str) -> pd.DataFrame:
+    """Load a symbol's daily bars from the local price store, indexed by date string."""
+    data = pd.read_csv(
+        os.path.join(
+            data_dir,
+            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+        )
+    )
+    data["Date"] = data["Date"].astype(str).str[:10]
+    return data.set_index("Date").sort_index()
+
+
+class BacktestResult:
+    """Decisions, equity curve and summary metrics of one backtest."""
+
+    def __init__(self, ticker: str, decisions: pd.DataFrame, metrics: Dict[str, Any]):
+        self.ticker = ticker
+        self.decisions = decisions
+        self.metrics = metrics
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        """Strategy equity, starting from 1.0, indexed by exit date."""
+        return self.decisions.set_index("exit_date")["equity"]
+
+    def save(self, directory: str):
+        """Write the decisions table and metrics to `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        self.decisions.to_csv(os.path.join(directory, f"{self.ticker}_decisions.csv"), index=False)
+        with open(os.path.join(directory, f"{self.ticker}_metrics.json"), "w") as f:
+            json.dump(self.metrics, f, indent=4)
+
+
+class Backtester:
+    """Runs a TradingAgentsGraph over historical dates and scores its decisions.
+
+    Each decision opens a position at the decision date's close and exits
+    `holding_period` bars later. Decisions are scored from the final trade
+    decision with the same rules as the run dataset, so a decision read
+    with less than `min_confidence` is UNKNOWN and takes no position. For cheap re-scoring build the graph with
+    llm_mode "record" once, then re-run the same dates with llm_mode
+    "replay": the model and data responses then come from the cassette.
+    """
+
+    def __init__(
+        self,
+        graph,
+        config: Dict[str, Any] = None,
+        min_confidence: float = MIN_SIGNAL_CONFIDENCE,
+    ):
+        self.graph = graph
+        self.config = config or graph.config
+        self.min_confidence = min_confidence
+
+    def score_decision(self, final_state: Dict[str, Any]) -> Tuple[str, float]:
+        """(action, confidence) of a run's final trade decision."""
+        signal = parse_signal(final_state.get("final_trade_decision", ""))
+        return scored_action(signal, self.min_confidence), signal.confidence
+
+    def trading_dates(
+        self,
+        prices: pd.DataFrame,
+        start_date: str,
+        end_date: str,
+        holding_period: int,
+        step: int,
+    ) -> List[str]:
+        """Decision dates within [start_date, end_date] that have an exit bar."""
+        dates = list(prices.index)[: len(prices) - holding_period]
+        selected = [d for d in dates if start_date <= d <= end_date]
+        return selected[::step]
+
+    def run(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        holding_period: int = 1,
+        step: Optional[int] = None,
+        reflect: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> BacktestResult:
+        """Backtest `ticker` over a date range.
+
+        Args:
+            ticker: Symbol to trade
+            start_date: First decision date, yyyy-mm-dd
+            end_date: Last decision date, yyyy-mm-dd
+            holding_period: Bars each position is held
+            step: Bars between decisions; defaults to `holding_period`. Must
+                not be shorter than `holding_period`, since overlapping
+                positions would compound the same bars twice.
+            reflect: Feed realized returns back through reflection. Later
+                decisions then depend on earlier outcomes, so dates run one at
+                a time; otherwise they run concurrently via `propagate_batch`.
+            max_workers: Concurrent dates when not reflecting
+        """
+        step = step or holding_period
+        if step < holding_period:
+            raise ValueError(
+                f"step ({step}) must be at least holding_period ({holding_period})"
+            )
+        prices = load_price_history(self.config["data_dir"], ticker)
+        bar_dates = list(prices.index)
+        bar_positions = {d: i for i, d in enumerate(bar_dates)}
+        closes = prices["Close"]
+
+        dates = self.trading_dates(prices, start_date, end_date, holding_period, step)
+
+        def exit_date_of(trade_date):
+            return bar_dates[bar_positions[trade_date] + holding_period]
+
+        def asset_return_of(trade_date):
+            return float(closes[exit_date_of(trade_date)] / closes[trade_date] - 1)
+
+        scores = {}
+        if reflect:
+            # Reflections are applied only once their exit bar has been seen,
+            # so no decision learns from a return realized after its date.
+            pending = []
+            for trade_date in dates:
+                ready = [p for p in pending if p[0] <= trade_date]
+                pending = [p for p in pending if p[0] > trade_date]
+                if ready:
+                    self.graph.reflect_and_remember_batch(
+                        [(state, returns) for _, state, returns in ready]
+                    )
+
+                final_state, _ = self.graph.propagate(ticker, trade_date)
+                scores[trade_date] = self.score_decision(final_state)
+                position = SIGNAL_POSITIONS[scores[trade_date][0]]
+                pending.append(
+                    (exit_date_of(trade_date), final_state, position * asset_return_of(trade_date))
+                )
+            if pending:
+                self.graph.reflect_and_remember_batch(
+                    [(state, returns) for _, state, returns in pending]
+                )
+        else:
+            for result in self.graph.propagate_batch(
+                [(ticker, d) for d in dates], max_workers=max_workers
+            ):
+                if result.error is not None:
+                    raise result.error
+                scores[result.trade_date] = self.score_decision(result.final_state)
+        # Surface a failed state log write once, for the whole backtest
+        self.graph.flush_state_log()
+
+        rows = []
+        for trade_date in dates:
+            signal, confidence = scores[trade_date]
+            position = SIGNAL_POSITIONS[signal]
+            asset_return = asset_return_of(trade_date)
+            rows.append(
+                {
+                    "trade_date": trade_date,
+                    "exit_date": exit_date_of(trade_date),
+                    "signal": signal,
+                    "confidence": confidence,
+                    "position": position,
+                    "entry_price": float(closes[trade_date]),
+                    "exit_price": float(closes[exit_date_of(trade_date)]),
+                    "asset_return": asset_return,
+                    "strategy_return": position * asset_return,
+                }
+            )
+
+        decisions = pd.DataFrame(
+            rows,
+            columns=[
+                "trade_date", "exit_date", "signal", "confidence", "position",
+                "entry_price", "exit_price", "asset_return", "strategy_return",
+            ],
+        )
+        decisions["equity"] = (1 + decisions["strategy_return"]).cumprod()
+        decisions["benchmark_equity"] = (1 + decisions["asset_return"]).cumprod()
+
+        return BacktestResult(ticker, decisions, compute_metrics(decisions, step))
+
+
+def compute_metrics(decisions: pd.DataFrame, step: int) -> Dict[str, Any]:
+    """Summary statistics of a decisions table with one decision every `step` bars."""
+    if decisions.empty:
+        return {"decisions": 0}
+
+    returns = decisions["strategy_return"]
+    trades = decisions[decisions["position"] != 0]
+    equity = decisions["equity"]
+    drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0)) - 1
+    periods_per_year = TRADING_DAYS_PER_YEAR / step
+    std = returns.std(ddof=0)
+
+    return {
+        "decisions": int(len(decisions)),
+        "trades": int(len(trades)),
+        "signal_counts": decisions["signal"].value_counts().to_dict(),
+        "total_return": float(equity.iloc[-1] - 1),
+        "benchmark_return": float(decisions["benchmark_equity"].iloc[-1] - 1),
+        "mean_return": float(returns.mean()),
+        "hit_rate": float((trades["strategy_return"] > 0).mean()) if len(trades) else None,
+        "sharpe": float(returns.mean() / std * np.sqrt(periods_per_year)) if std > 0 else None,
+        "max_drawdown": float(drawdown.min()),
+    }
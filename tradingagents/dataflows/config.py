@@ -1,3 +1,5 @@
+import contextvars
+from contextlib import contextmanager
 import tradingagents.default_config as default_config
 from typing import Dict, Optional
 
@@ -5,6 +7,13 @@ from typing import Dict, Optional
 _config: Optional[Dict] = None
 DATA_DIR: Optional[str] = None
 
+# Configuration of the run executing in the current context, if any. It takes
+# precedence over the process-wide config so concurrent runs with different
+# settings do not clobber each other.
+_context_config: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar(
+    "dataflows_config", default=None
+)
+
 
 def initialize_config():
     """Initialize the configuration with default values."""
@@ -15,7 +24,7 @@ def initialize_config():
 
 
 def set_config(config: Dict):
-    """Update the configuration with custom values."""
+    """Update the process-wide configuration with custom values."""
     global _config, DATA_DIR
     if _config is None:
         _config = default_config.DEFAULT_CONFIG.copy()
@@ -23,12 +32,39 @@ def set_config(config: Dict):
     DATA_DIR = _config["data_dir"]
 
 
+@contextmanager
+def use_config(config: Dict):
+    """Scope a configuration to the current context.
+
+    Code running inside the block, including worker threads started with a
+    copy of the context, sees `config` layered over the defaults.
+    """
+    token = _context_config.set({**default_config.DEFAULT_CONFIG, **config})
+    try:
+        yield
+    finally:
+        _context_config.reset(token)
+
+
 def get_config() -> Dict:
-    """Get the current configuration."""
+    """Get the configuration of the current context."""
+    scoped = _context_config.get()
+    if scoped is not None:
+        return scoped.copy()
     if _config is None:
         initialize_config()
     return _config.copy()
 
 
+def get_data_dir() -> str:
+    """Get the data directory of the current context."""
+    scoped = _context_config.get()
+    if scoped is not None:
+        return scoped["data_dir"]
+    if _config is None:
+        initialize_config()
+    return _config["data_dir"]
+
+
 # Initialize with default config
 initialize_config()
@@ -13,9 +13,9 @@ import pandas as pd
 from tqdm import tqdm
 import yfinance as yf
 import requests
-from .config import get_config, set_config, DATA_DIR
+from .config import get_data_dir
+from .llm_cassette import create_genai_client, recorded
 # from openai import OpenAI
-from google import genai
 from google.genai.types import (
     GenerateContentConfig,
     GoogleSearch,
@@ -27,6 +27,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@recorded
 def get_finnhub_news(
     ticker: Annotated[
         str,
@@ -51,7 +52,7 @@ def get_finnhub_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    result = get_data_in_range(ticker, before, curr_date, "news_data", DATA_DIR)
+    result = get_data_in_range(ticker, before, curr_date, "news_data", get_data_dir())
 
     if len(result) == 0:
         return ""
@@ -69,6 +70,7 @@ def get_finnhub_news(
     return f"## {ticker} News, from {before} to {curr_date}:\n" + str(combined_result)
 
 
+@recorded
 def get_finnhub_company_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
     curr_date: Annotated[
@@ -90,7 +92,7 @@ def get_finnhub_company_insider_sentiment(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_senti", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_senti", get_data_dir())
 
     if len(data) == 0:
         return ""
@@ -110,6 +112,7 @@ def get_finnhub_company_insider_sentiment(
     )
 
 
+@recorded
 def get_finnhub_company_insider_transactions(
     ticker: Annotated[str, "ticker symbol"],
     curr_date: Annotated[
@@ -131,7 +134,7 @@ def get_finnhub_company_insider_transactions(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_trans", DATA_DIR)
+    data = get_data_in_range(ticker, before, curr_date, "insider_trans", get_data_dir())
 
     if len(data) == 0:
         return ""
@@ -152,6 +155,7 @@ def get_finnhub_company_insider_transactions(
     )
 
 
+@recorded
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -161,7 +165,7 @@ def get_simfin_balance_sheet(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        get_data_dir(),
         "fundamental_data",
         "simfin_data_all",
         "balance_sheet",
@@ -199,6 +203,7 @@ def get_simfin_balance_sheet(
     )
 
 
+@recorded
 def get_simfin_cashflow(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -208,7 +213,7 @@ def get_simfin_cashflow(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        get_data_dir(),
         "fundamental_data",
         "simfin_data_all",
         "cash_flow",
@@ -246,6 +251,7 @@ def get_simfin_cashflow(
     )
 
 
+@recorded
 def get_simfin_income_statements(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -255,7 +261,7 @@ def get_simfin_income_statements(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        get_data_dir(),
         "fundamental_data",
         "simfin_data_all",
         "income_statements",
@@ -293,6 +299,7 @@ def get_simfin_income_statements(
     )
 
 
+@recorded(online=True)
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -326,6 +333,7 @@ def get_google_news(
     return f"## {query} Google News, from {before} to {curr_date}:\n\n{news_str}"
 
 
+@recorded
 def get_reddit_global_news(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
@@ -357,7 +365,7 @@ def get_reddit_global_news(
             "global_news",
             curr_date_str,
             max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
+            data_path=os.path.join(get_data_dir(), "reddit_data"),
         )
         posts.extend(fetch_result)
         curr_date += relativedelta(days=1)
@@ -378,6 +386,7 @@ def get_reddit_global_news(
     return f"## Global News Reddit, from {before} to {curr_date}:\n{news_str}"
 
 
+@recorded
 def get_reddit_company_news(
     ticker: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -415,7 +424,7 @@ def get_reddit_company_news(
             curr_date_str,
             max_limit_per_day,
             ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
+            data_path=os.path.join(get_data_dir(), "reddit_data"),
         )
         posts.extend(fetch_result)
         curr_date += relativedelta(days=1)
@@ -437,6 +446,7 @@ def get_reddit_company_news(
     return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
 
 
+@recorded(online=lambda args: args["online"])
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -533,7 +543,7 @@ def get_stock_stats_indicators_window(
         # read from YFin data
         data = pd.read_csv(
             os.path.join(
-                DATA_DIR,
+                get_data_dir(),
                 f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
             )
         )
@@ -573,6 +583,7 @@ def get_stock_stats_indicators_window(
     return result_str
 
 
+@recorded(online=lambda args: args["online"])
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -590,7 +601,7 @@ def get_stockstats_indicator(
             symbol,
             indicator,
             curr_date,
-            os.path.join(DATA_DIR, "market_data", "price_data"),
+            os.path.join(get_data_dir(), "market_data", "price_data"),
             online=online,
         )
     except Exception as e:
@@ -602,6 +613,7 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+@recorded
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -615,7 +627,7 @@ def get_YFin_data_window(
     # read in data
     data = pd.read_csv(
         os.path.join(
-            DATA_DIR,
+            get_data_dir(),
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
         )
     )
@@ -643,6 +655,7 @@ def get_YFin_data_window(
     )
 
 
+@recorded(online=True)
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -679,12 +692,12 @@ def get_YFin_data_online(
 
     # Add header information
     header = f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
-    header += f"# Total records: {len(data)}\n"
-    header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    header += f"# Total records: {len(data)}\n\n"
 
     return header + csv_string
 
 
+@recorded
 def get_YFin_data(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -693,7 +706,7 @@ def get_YFin_data(
     # read in data
     data = pd.read_csv(
         os.path.join(
-            DATA_DIR,
+            get_data_dir(),
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
         )
     )
@@ -720,15 +733,9 @@ def get_YFin_data(
     return filtered_data
 
 
+@recorded
 def get_stock_news_openai(ticker, curr_date):
     """Get stock news using Google Gemini API (keeping function name for compatibility)"""
-    config = get_config()
-    client = genai.Client() # FIXED: Use default configuration
-    api_key = os.getenv("GOOGLE_API_KEY")
-
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY environment variable is required")
-        
     grounding_tool = types.Tool(
         google_search=types.GoogleSearch()
     )
@@ -801,7 +808,7 @@ def get_stock_news_openai(ticker, curr_date):
     """
                 
     try:
-        client = genai.Client()
+        client = create_genai_client()
         response = client.models.generate_content(
             model="gemini-2.0-flash", 
             contents=prompt, 
@@ -815,19 +822,15 @@ def get_stock_news_openai(ticker, curr_date):
         return ""
 
 
+@recorded
 def get_global_news_openai(curr_date):
     """Get global news using Google Gemini API (keeping function name for compatibility)"""
-    config = get_config()
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY environment variable is required")
-    
     # url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent"
     # headers = {
     #     "Content-Type": "application/json",
     # }
     # params = {"key": api_key}
-    client = genai.Client()
+    client = create_genai_client()
     grounding_tool = types.Tool(
         google_search=types.GoogleSearch()
     )
@@ -843,11 +846,12 @@ def get_global_news_openai(curr_date):
     return response.candidates[0].content.parts[0].text
 
 
+@recorded
 def get_fundamentals_openai(ticker, curr_date):
     """Fetch company fundamentals using Gemini with Google Search Tool."""
     
     # Initialize client - REMOVED explicit api_version
-    client = genai.Client() # FIXED: Use default configuration
+    client = create_genai_client()
     
     # Build the query... (omitted for brevity)
     prompt = (
@@ -873,5 +877,3 @@ def get_fundamentals_openai(ticker, curr_date):
         # This will now catch other API errors, not the 400 JSON error
         print(f"An error occurred during the API call: {e}")
         return ""
-    
-get_stock_news_openai("APPL", "2025-10-13")
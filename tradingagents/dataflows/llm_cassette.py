@@ -0,0 +1,293 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from io import StringIO
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from .config import get_config
+
+# Modes of the LLM provider layer, set by the config's "llm_mode"
+LLM_MODES = ("live", "record", "replay", "fake")
+
+_TABLES = ("chat", "genai", "embeddings", "tools")
+
+# Cassettes shared by every graph in the process, one per file
+_cassettes: Dict[str, "LLMCassette"] = {}
+_cassettes_lock = threading.Lock()
+
+
+class CassetteMiss(LookupError):
+    """A replayed run made a request the cassette has no recording of."""
+
+
+class LLMCassette:
+    """SQLite store of recorded model requests and their responses.
+
+    Chat completions, grounded `genai` calls, embeddings and dataflow tool
+    results each get a table keyed by a digest of the request, so a
+    recorded run can be replayed offline with identical responses.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        for table in _TABLES:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, request TEXT NOT NULL, response TEXT NOT NULL, "
+                "recorded_at REAL NOT NULL)"
+            )
+        self._conn.commit()
+
+    def get(self, table: str, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT response FROM {table} WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, table: str, key: str, request: str, response: str):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (key, request, response, recorded_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, request, response, time.time()),
+            )
+            self._conn.commit()
+
+    def replay(self, table: str, key: str, request: str) -> str:
+        """The recorded response to a request; raises `CassetteMiss` if there is none."""
+        response = self.get(table, key)
+        if response is None:
+            raise CassetteMiss(
+                f"No recorded {table} response in {self.path} for request {request[:200]!r}; "
+                "record the run first"
+            )
+        return response
+
+
+def request_key(request: str) -> str:
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+def get_cassette_path(config: Dict[str, Any]) -> str:
+    """Return the cassette file of this configuration."""
+    return config.get("llm_cassette_path") or os.path.join(
+        config["results_dir"], "llm_cassette.sqlite"
+    )
+
+
+def open_cassette(path: str) -> LLMCassette:
+    """The process-wide cassette stored at `path`, opened on first use."""
+    path = os.path.abspath(path)
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = LLMCassette(path)
+        return _cassettes[path]
+
+
+def get_cassette(config: Dict[str, Any]) -> LLMCassette:
+    """The process-wide cassette of a configuration, opened on first use."""
+    return open_cassette(get_cassette_path(config))
+
+
+def get_llm_mode(config: Dict[str, Any]) -> str:
+    mode = config.get("llm_mode", "live")
+    if mode not in LLM_MODES:
+        raise ValueError(f"Unknown llm_mode {mode!r}; expected one of {LLM_MODES}")
+    if mode != "live" and config.get("llm_cache_path"):
+        raise ValueError(
+            f"llm_cache_path only applies in llm_mode 'live'; llm_mode {mode!r} uses the "
+            "cassette at llm_cassette_path instead"
+        )
+    return mode
+
+
+def requires_api_key(config: Dict[str, Any]) -> bool:
+    """Whether the configured mode calls Google and needs GOOGLE_API_KEY."""
+    return get_llm_mode(config) in ("live", "record")
+
+
+def create_genai_client(config: Optional[Dict[str, Any]] = None):
+    """Create the `genai` client the grounded dataflows call.
+
+    Returns a plain `genai.Client` in "live" mode. The other modes return
+    a stand-in exposing the same `models.generate_content` call, which
+    records, replays or fakes the response.
+    """
+    config = config or get_config()
+    mode = get_llm_mode(config)
+    if mode == "fake":
+        return _GenaiClient(_FakeModels(config.get("fake_llm_latency", 0.0)))
+
+    if mode == "replay":
+        return _GenaiClient(_CassetteModels(get_cassette(config), None))
+
+    if not os.getenv("GOOGLE_API_KEY"):
+        raise ValueError("GOOGLE_API_KEY environment variable is required")
+    from google import genai
+
+    client = genai.Client()
+    if mode == "record":
+        return _GenaiClient(_CassetteModels(get_cassette(config), client.models))
+    return client
+
+
+def recorded(func=None, *, online: Union[bool, Callable[[Dict[str, Any]], bool]] = False):
+    """Route a dataflow function through the cassette of the configured mode.
+
+    "record" stores each result in the cassette's "tools" table, keyed by
+    the function name and its bound arguments; "replay" serves it from
+    there. "fake" serves recorded results when the cassette has them, and
+    otherwise returns a stand-in text for calls that would reach the
+    network, which `online` flags (a bool, or a predicate on the bound
+    arguments). Calls reading local data run as usual. "live" calls
+    straight through.
+    """
+    if func is None:
+        return functools.partial(recorded, online=online)
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        config = get_config()
+        mode = get_llm_mode(config)
+        if mode == "live":
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        request = json.dumps(
+            {"function": func.__name__, "args": bound.arguments}, sort_keys=True, default=str
+        )
+        key = request_key(request)
+        if mode == "replay":
+            return _from_record(get_cassette(config).replay("tools", key, request))
+        if mode == "fake":
+            path = get_cassette_path(config)
+            data = get_cassette(config).get("tools", key) if os.path.exists(path) else None
+            if data is not None:
+                return _from_record(data)
+            if online(bound.arguments) if callable(online) else online:
+                return (
+                    f"Offline stand-in for {func.__name__}: no live data was fetched "
+                    f"for {json.dumps(bound.arguments, default=str)}"
+                )
+            return func(*args, **kwargs)
+
+        result = func(*args, **kwargs)
+        get_cassette(config).put("tools", key, request, _to_record(result))
+        return result
+
+    return wrapper
+
+
+def _to_record(result) -> str:
+    if isinstance(result, pd.DataFrame):
+        return json.dumps({"frame": result.to_json(orient="split")})
+    return json.dumps({"value": result}, default=str)
+
+
+def _from_record(data: str):
+    record = json.loads(data)
+    if "frame" in record:
+        return pd.read_json(
+            StringIO(record["frame"]), orient="split", dtype=False, convert_dates=False
+        )
+    return record["value"]
+
+
+class _GenaiClient:
+    def __init__(self, models):
+        self.models = models
+
+
+class _CassetteModels:
+    """`models` of a genai client recording to, or replaying from, a cassette.
+
+    Responses are stored as the response model's JSON, so callers can read
+    `.text` or `.candidates` exactly as from a live response.
+    """
+
+    def __init__(self, cassette: LLMCassette, live_models=None):
+        self.cassette = cassette
+        self.live_models = live_models
+
+    def generate_content(self, *, model, contents, config=None):
+        from google.genai import types
+
+        request = json.dumps(
+            {
+                "model": model,
+                "contents": _to_json(contents),
+                "config": _to_json(config),
+            },
+            sort_keys=True,
+        )
+        key = request_key(request)
+        if self.live_models is None:
+            data = self.cassette.replay("genai", key, request)
+            return types.GenerateContentResponse.model_validate_json(data)
+
+        response = self.live_models.generate_content(model=model, contents=contents, config=config)
+        self.cassette.put("genai", key, request, response.model_dump_json(exclude_none=True))
+        return response
+
+
+class _FakeModels:
+    """`models` of a genai client answering locally without a network."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def generate_content(self, *, model, contents, config=None):
+        from google.genai import types
+
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = " ".join(str(_to_json(contents)).split())
+        text = (
+            f"Offline stand-in for a grounded {model} search. No live sources were "
+            f"consulted for: {prompt[:300]}"
+        )
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(content=types.Content(role="model", parts=[types.Part(text=text)]))
+            ]
+        )
+
+
+def _to_json(value) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    return str(value)
+
+
+def hashed_embedding(text: str, dim: int = 256) -> List[float]:
+    """Deterministic offline embedding from hashed word features.
+
+    Texts sharing words get similar vectors, which is enough for memory
+    retrieval and similarity checks to behave sensibly without a model.
+    """
+    vector = [0.0] * dim
+    for word in str(text).lower().split():
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector] if norm else vector
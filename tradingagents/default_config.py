@@ -13,14 +13,68 @@ DEFAULT_CONFIG = {
     "deep_think_llm": "gemini-2.0-flash-exp",
     "quick_think_llm": "gemini-1.5-flash",
     "backend_url": "https://generativelanguage.googleapis.com/v1beta",
+    "llm_cache_path": None,  # Cassette serving repeated chat requests in "live" mode
+    # LLM mode - "live" calls Gemini and the data sources, "record" also stores every
+    # chat, grounded search, embedding and dataflow result in the cassette, "replay"
+    # serves them offline, and "fake" answers with a local stand-in model and
+    # stand-in texts for network data sources (no network or API key)
+    "llm_mode": os.getenv("TRADINGAGENTS_LLM_MODE", "live"),
+    "llm_cassette_path": None,  # Defaults to <results_dir>/llm_cassette.sqlite
+    "fake_llm_latency": 0.0,  # Seconds each fake model or grounded search call takes
+    "fake_llm_decision": "HOLD",  # Action the fake model proposes
+    "fake_llm_tool_calls": True,  # Fake model calls every bound tool before answering
     # Debate and discussion settings - optimized for speed
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 50,  # Reduced for faster execution
+    "signal_confidence_threshold": 0.7,  # Rule-based signal confidence below which the LLM extracts it
+    "stream_mode": "values",  # "updates" streams per-node deltas instead of the full state
+    "stream_tokens": False,  # Stream agent LLM tokens on the graph's "custom" channel
+    # Prompt context - sources of researcher/manager/debator prompts are fitted to a budget
+    "context_token_budget": 12000,  # Estimated tokens of source material per prompt
+    "context_recent_turns": 3,  # Latest debate turns kept verbatim; older ones are summarized
+    "debate_summaries": True,  # Fold older debate turns into a rolling summary after each round
+    "debate_summary_llm": None,  # Cheap model for the summaries; None uses quick_think_llm
+    "debate_convergence": None,  # "stance", "similarity" or both to end converged debates early
+    "debate_convergence_threshold": 0.9,  # Turn similarity at which "similarity" ends a debate
+    # Checkpointing - persist graph state after every node so failed runs can resume
+    "checkpoint_enabled": False,
+    "checkpoint_db": None,  # Defaults to <results_dir>/checkpoints.sqlite
+    # Reuse analyst reports for an unchanged (ticker, date, model, prompt, tool data)
+    # in "live" llm_mode
+    "analyst_report_cache": False,
     # Tool settings
     "online_tools": True,
+    "tool_cache_scope": "run",  # "run", "process" (shared across runs) or None to disable
+    "tool_cache_max_entries": 1024,
+    "data_prefetch": False,  # Fetch each analyst's mandatory data up front, saving a model round trip
     # Performance optimizations
     "timeout_seconds": 30,  # Global timeout for all operations
     "max_news_results": 10,  # Limit news results for faster processing
     "parallel_processing": True,  # Enable parallel processing where possible
+    "instrumentation": True,  # Record node, LLM and tool spans and attach a run summary
+    # State log - "run_log" appends one compressed record per run to
+    # <state_log_dir>/<ticker>/TradingAgentsStrategy_logs in the background,
+    # "json" writes a full_states_log_<date>.json file per run, None disables it
+    "state_log": "run_log",
+    "state_log_dir": "eval_results",
+    "state_log_compression": "gzip",  # "gzip", or "zstd" with the zstandard package
+    "llm_token_prices": {},  # USD per million (input, output) tokens by model, for cost estimates
+    # Profiling - graph nodes (e.g. "Market Analyst") or dataflows.interface functions
+    # (e.g. "get_stock_stats_indicators_window") to profile; empty disables it entirely
+    "profile_targets": [],
+    "profile_mode": "deterministic",  # "deterministic" (cProfile) or "sampling" (stack sampler)
+    "profile_sample_interval": 0.005,  # Seconds between stack samples in "sampling" mode
+    "debug_trace_steps": 200,  # Step records a debug-mode run keeps; full states are never kept
+    "debug_trace_spill": False,  # Also write each debug step's changes to <results_dir>/traces
+    "max_reflection_workers": 5,  # Concurrent LLM calls during reflection
+    "max_batch_workers": 4,  # Concurrent (ticker, date) runs in propagate_batch
+    "analyst_execution": "sequential",  # "parallel" runs the selected analysts as concurrent branches
+    "debate_execution": "sequential",  # "parallel" runs all turns of a debate round concurrently
+    # Memory retention settings
+    "memory_max_entries": 500,  # Per memory store; lowest-value entries are evicted beyond this
+    # Similarity at which a new reflection merges into an existing one; None keeps every reflection
+    "memory_dedup_threshold": None,
+    "memory_recency_half_life_days": 30,
+    "memory_compaction_interval": None,  # Seconds between background compactions; needs close()
 }
@@ -2,16 +2,37 @@
 
 from .trading_graph import TradingAgentsGraph
 from .conditional_logic import ConditionalLogic
+from .convergence import (
+    AnyPolicy,
+    ClassifierPolicy,
+    ConvergencePolicy,
+    SimilarityPolicy,
+    StanceAgreementPolicy,
+)
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
-from .signal_processing import SignalProcessor
+from .run_dataset import RunDataset, export_run_dataset
+from .run_log import RunLogReader, RunLogRecord, RunLogWriter
+from .signal_processing import SignalProcessor, TradingSignal, parse_signal
 
 __all__ = [
     "TradingAgentsGraph",
     "ConditionalLogic",
+    "ConvergencePolicy",
+    "StanceAgreementPolicy",
+    "SimilarityPolicy",
+    "ClassifierPolicy",
+    "AnyPolicy",
     "GraphSetup",
     "Propagator",
     "Reflector",
+    "RunDataset",
+    "export_run_dataset",
+    "RunLogReader",
+    "RunLogRecord",
+    "RunLogWriter",
     "SignalProcessor",
+    "TradingSignal",
+    "parse_signal",
 ]
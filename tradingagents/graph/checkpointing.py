@@ -0,0 +1,65 @@
+# TradingAgents/graph/checkpointing.py
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from typing import Any, Dict, Optional
+
+
+def get_checkpoint_path(config: Dict[str, Any]) -> str:
+    """Return the SQLite file holding graph checkpoints for this configuration."""
+    return config.get("checkpoint_db") or os.path.join(
+        config["results_dir"], "checkpoints.sqlite"
+    )
+
+
+def create_checkpointer(db_path: str):
+    """Create a SQLite-backed LangGraph checkpointer at `db_path`."""
+    try:
+        from .sqlite_saver import ThreadedSqliteSaver
+    except ImportError as e:
+        raise ImportError(
+            "Graph checkpointing requires the langgraph-checkpoint-sqlite package"
+        ) from e
+
+    directory = os.path.dirname(os.path.abspath(db_path))
+    os.makedirs(directory, exist_ok=True)
+
+    # Nodes and the worker threads of async runs share one connection; the
+    # saver serialises access to it internally.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    return ThreadedSqliteSaver(conn)
+
+
+def make_thread_id(company_name: str, trade_date: str, run_id: str) -> str:
+    """Key a run's checkpoints by (ticker, trade date, run id)."""
+    return f"{company_name}:{trade_date}:{run_id}"
+
+
+def save_run_metadata(db_path: str, run_id: str, metadata: Dict[str, Any]):
+    """Store a run's settings next to its checkpoints so it can be resumed as started."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS run_metadata "
+            "(run_id TEXT PRIMARY KEY, metadata TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO run_metadata (run_id, metadata) VALUES (?, ?)",
+            (run_id, json.dumps(metadata)),
+        )
+
+
+def load_run_metadata(db_path: str, run_id: str) -> Optional[Dict[str, Any]]:
+    """The settings stored by `save_run_metadata`, or None for an unknown run."""
+    if not os.path.exists(db_path):
+        return None
+    with closing(sqlite3.connect(db_path)) as conn:
+        try:
+            row = conn.execute(
+                "SELECT metadata FROM run_metadata WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+    return json.loads(row[0]) if row else None
@@ -6,10 +6,48 @@ from tradingagents.agents.utils.agent_states import AgentState
 class ConditionalLogic:
     """Handles conditional logic for determining graph flow."""
 
-    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1):
-        """Initialize with configuration parameters."""
+    def __init__(
+        self,
+        max_debate_rounds=1,
+        max_risk_discuss_rounds=1,
+        summarize_debates=False,
+        check_convergence=False,
+    ):
+        """Initialize with configuration parameters.
+
+        With `summarize_debates` every completed debate round is routed
+        through the debate's summarizer node before the next round or judge.
+        With `check_convergence` every round but the last also goes through
+        the debate's convergence check, and a converged debate ends early.
+        """
         self.max_debate_rounds = max_debate_rounds
         self.max_risk_discuss_rounds = max_risk_discuss_rounds
+        self.summarize_debates = summarize_debates
+        self.check_convergence = check_convergence
+
+    def _needs_summary(
+        self, state: AgentState, summary_key: str, count: int, turns_per_round: int
+    ) -> bool:
+        """Whether a round just ended and its summarizer has not run since."""
+        if not self.summarize_debates or count == 0 or count % turns_per_round:
+            return False
+        return (state.get(summary_key) or {}).get("count", 0) < count
+
+    def _needs_convergence_check(
+        self, state: AgentState, record_key: str, count: int, turns_per_round: int, max_count: int
+    ) -> bool:
+        """Whether a round before the last just ended and was not checked yet."""
+        if not self.check_convergence or count == 0 or count % turns_per_round:
+            return False
+        if count >= max_count:
+            return False
+        records = state.get(record_key) or []
+        return not records or records[-1]["count"] < count
+
+    def _converged(self, state: AgentState, record_key: str, count: int) -> bool:
+        """Whether the check after the current round found the debate converged."""
+        records = state.get(record_key) or []
+        return bool(records) and records[-1]["count"] == count and records[-1]["converged"]
 
     def should_continue_market(self, state: AgentState):
         """Determine if market analysis should continue."""
@@ -45,9 +83,16 @@ class ConditionalLogic:
 
     def should_continue_debate(self, state: AgentState) -> str:
         """Determine if debate should continue."""
-
+        count = state["investment_debate_state"]["count"]
+        if self._needs_summary(state, "investment_debate_summary", count, 2):
+            return "Invest Debate Summarizer"
+        if self._needs_convergence_check(
+            state, "investment_debate_convergence", count, 2, 2 * self.max_debate_rounds
+        ):
+            return "Invest Debate Convergence"
         if (
             state["investment_debate_state"]["count"] >= 2 * self.max_debate_rounds
+            or self._converged(state, "investment_debate_convergence", count)
         ):  # 3 rounds of back-and-forth between 2 agents
             return "Research Manager"
         if state["investment_debate_state"]["current_response"].startswith("Bull"):
@@ -56,8 +101,16 @@ class ConditionalLogic:
 
     def should_continue_risk_analysis(self, state: AgentState) -> str:
         """Determine if risk analysis should continue."""
+        count = state["risk_debate_state"]["count"]
+        if self._needs_summary(state, "risk_debate_summary", count, 3):
+            return "Risk Debate Summarizer"
+        if self._needs_convergence_check(
+            state, "risk_debate_convergence", count, 3, 3 * self.max_risk_discuss_rounds
+        ):
+            return "Risk Debate Convergence"
         if (
             state["risk_debate_state"]["count"] >= 3 * self.max_risk_discuss_rounds
+            or self._converged(state, "risk_debate_convergence", count)
         ):  # 3 rounds of back-and-forth between 3 agents
             return "Risk Judge"
         if state["risk_debate_state"]["latest_speaker"].startswith("Risky"):
@@ -65,3 +118,33 @@ class ConditionalLogic:
         if state["risk_debate_state"]["latest_speaker"].startswith("Safe"):
             return "Neutral Analyst"
         return "Risky Analyst"
+
+    def should_continue_debate_round(self, state: AgentState) -> str:
+        """Determine if another concurrent bull/bear round should run."""
+        count = state["investment_debate_state"]["count"]
+        if self._needs_summary(state, "investment_debate_summary", count, 2):
+            return "Invest Debate Summarizer"
+        if self._needs_convergence_check(
+            state, "investment_debate_convergence", count, 2, 2 * self.max_debate_rounds
+        ):
+            return "Invest Debate Convergence"
+        if count >= 2 * self.max_debate_rounds or self._converged(
+            state, "investment_debate_convergence", count
+        ):
+            return "Research Manager"
+        return "Investment Debate Round"
+
+    def should_continue_risk_round(self, state: AgentState) -> str:
+        """Determine if another concurrent risk-team round should run."""
+        count = state["risk_debate_state"]["count"]
+        if self._needs_summary(state, "risk_debate_summary", count, 3):
+            return "Risk Debate Summarizer"
+        if self._needs_convergence_check(
+            state, "risk_debate_convergence", count, 3, 3 * self.max_risk_discuss_rounds
+        ):
+            return "Risk Debate Convergence"
+        if count >= 3 * self.max_risk_discuss_rounds or self._converged(
+            state, "risk_debate_convergence", count
+        ):
+            return "Risk Judge"
+        return "Risk Debate Round"
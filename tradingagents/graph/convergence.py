@@ -0,0 +1,199 @@
+# TradingAgents/graph/convergence.py
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from tradingagents.agents.utils.context_builder import split_turns
+from tradingagents.agents.utils.node_runtime import BlockingCall, create_node
+
+from .signal_processing import parse_signal
+
+
+class ConvergenceDecision(NamedTuple):
+    """Outcome of one convergence check."""
+
+    converged: bool
+    score: float
+    reason: str
+
+
+class ConvergencePolicy(ABC):
+    """Decides whether a debate has converged after a round.
+
+    `check` gets the turns of the round that just ended and of the round
+    before it (empty after the first round), one turn per speaker in speaking
+    order. It runs in a worker thread, so it may block on I/O.
+    """
+
+    name = "policy"
+
+    @abstractmethod
+    def check(
+        self, latest_turns: List[str], previous_turns: List[str]
+    ) -> ConvergenceDecision:
+        """Decide whether the debate has converged after `latest_turns`."""
+
+
+class StanceAgreementPolicy(ConvergencePolicy):
+    """Converged when every speaker of the round states the same action."""
+
+    name = "stance"
+
+    def __init__(self, min_confidence: float = 0.7):
+        self.min_confidence = min_confidence
+
+    def check(self, latest_turns, previous_turns):
+        signals = [parse_signal(turn) for turn in latest_turns]
+        stances = [s.action for s in signals if s.confidence >= self.min_confidence]
+        if not stances:
+            return ConvergenceDecision(False, 0.0, "no speaker stated a clear action")
+        majority = max(set(stances), key=stances.count)
+        score = stances.count(majority) / len(latest_turns)
+        if score == 1.0:
+            return ConvergenceDecision(True, score, f"all speakers agree on {majority}")
+        return ConvergenceDecision(
+            False, score, f"{stances.count(majority)} of {len(latest_turns)} on {majority}"
+        )
+
+
+class SimilarityPolicy(ConvergencePolicy):
+    """Converged when every speaker repeats their previous turn.
+
+    Args:
+        embed: Text embedding function, e.g. `FinancialSituationMemory.get_embedding`
+        threshold: Cosine similarity at which a turn counts as a repetition
+    """
+
+    name = "similarity"
+
+    def __init__(self, embed: Callable[[str], Sequence[float]], threshold: float = 0.9):
+        self.embed = embed
+        self.threshold = threshold
+
+    def check(self, latest_turns, previous_turns):
+        if len(previous_turns) != len(latest_turns):
+            return ConvergenceDecision(False, 0.0, "no previous round to compare with")
+        score = min(
+            _cosine(self.embed(_without_speaker(new)), self.embed(_without_speaker(old)))
+            for new, old in zip(latest_turns, previous_turns)
+        )
+        if score >= self.threshold:
+            return ConvergenceDecision(True, score, "speakers are repeating their arguments")
+        return ConvergenceDecision(False, score, "arguments still changing")
+
+
+class ClassifierPolicy(ConvergencePolicy):
+    """Converged when a classifier's convergence probability reaches a threshold.
+
+    Args:
+        classifier: Function of (latest_turns, previous_turns) returning the
+            probability that the debate has converged, e.g. a small trained model
+        threshold: Probability at which the debate ends
+    """
+
+    name = "classifier"
+
+    def __init__(
+        self, classifier: Callable[[List[str], List[str]], float], threshold: float = 0.5
+    ):
+        self.classifier = classifier
+        self.threshold = threshold
+
+    def check(self, latest_turns, previous_turns):
+        score = float(self.classifier(latest_turns, previous_turns))
+        return ConvergenceDecision(
+            score >= self.threshold, score, f"classifier probability {score:.2f}"
+        )
+
+
+class AnyPolicy(ConvergencePolicy):
+    """Converged as soon as one of several policies is, checked in order."""
+
+    name = "any"
+
+    def __init__(self, policies: Sequence[ConvergencePolicy]):
+        self.policies = list(policies)
+        self.name = "+".join(p.name for p in self.policies)
+
+    def check(self, latest_turns, previous_turns):
+        decision = ConvergenceDecision(False, 0.0, "no policy configured")
+        for policy in self.policies:
+            decision = policy.check(latest_turns, previous_turns)
+            if decision.converged:
+                return decision._replace(reason=f"{policy.name}: {decision.reason}")
+        return decision
+
+
+def create_convergence_policy(
+    config: Dict, embed: Optional[Callable[[str], Sequence[float]]] = None
+) -> Optional[ConvergencePolicy]:
+    """Build the policy named by the config's `debate_convergence`, if any.
+
+    `debate_convergence` is "stance", "similarity" or a list of both; the
+    similarity policy needs `embed`.
+    """
+    names = config.get("debate_convergence")
+    if not names:
+        return None
+    if isinstance(names, str):
+        names = [names]
+
+    policies = []
+    for name in names:
+        if name == "stance":
+            policies.append(StanceAgreementPolicy())
+        elif name == "similarity":
+            if embed is None:
+                raise ValueError("The similarity convergence policy needs an embedding function")
+            policies.append(
+                SimilarityPolicy(embed, config.get("debate_convergence_threshold", 0.9))
+            )
+        else:
+            raise ValueError(f"Unknown debate convergence policy {name!r}")
+    return policies[0] if len(policies) == 1 else AnyPolicy(policies)
+
+
+def create_convergence_check(policy: ConvergencePolicy, debate_key, record_key, turns_per_round):
+    """Create a node applying `policy` to the round that just ended.
+
+    The decision is appended to the state's `record_key` list together with
+    the debate count it was made at; the debate's router ends the debate
+    when the latest decision says it converged.
+    """
+
+    def convergence_check_node(state) -> dict:
+        debate_state = state[debate_key]
+        turns = split_turns(debate_state.get("history", ""))
+        latest = turns[-turns_per_round:]
+        previous = turns[-2 * turns_per_round : -turns_per_round]
+
+        decision = yield BlockingCall(policy.check, latest, previous)
+
+        return {
+            record_key: [
+                {
+                    "count": debate_state["count"],
+                    "policy": policy.name,
+                    "converged": bool(decision.converged),
+                    "score": round(float(decision.score), 4),
+                    "reason": decision.reason,
+                }
+            ]
+        }
+
+    return create_node(convergence_check_node)
+
+
+def _without_speaker(turn: str) -> str:
+    """A turn's text without its "Bull Analyst:" style label."""
+    label, sep, text = turn.partition(":")
+    return text.strip() if sep and len(label) < 30 else turn
+
+
+def _cosine(a, b) -> float:
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norm) if norm else 0.0
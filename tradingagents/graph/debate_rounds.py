@@ -0,0 +1,107 @@
+# TradingAgents/graph/debate_rounds.py
+
+from functools import reduce
+
+from tradingagents.agents.utils.context_builder import merge_context_tokens
+from tradingagents.agents.utils.node_runtime import Gather, NodeCall, create_node
+
+
+def create_invest_debate_round(bull_node, bear_node):
+    """Create a node running one bull/bear round with both turns issued concurrently.
+
+    Each side answers the other's argument from the previous round, and the
+    turns are merged bull first, then bear, so the history reads the same as
+    a sequential round.
+    """
+
+    def invest_debate_round_node(state) -> dict:
+        debate_state = state["investment_debate_state"]
+
+        # The bull reads `current_response`, which holds the last bear argument;
+        # the bear needs the last bull argument in that slot instead.
+        bear_view = {
+            **state,
+            "investment_debate_state": {
+                **debate_state,
+                "current_response": debate_state.get("current_bull_response", ""),
+            },
+        }
+
+        bull_update, bear_update = yield Gather(
+            [NodeCall(bull_node, state), NodeCall(bear_node, bear_view)]
+        )
+        bull_state = bull_update["investment_debate_state"]
+        bear_state = bear_update["investment_debate_state"]
+        bull_argument = bull_state["current_response"]
+        bear_argument = bear_state["current_response"]
+
+        new_investment_debate_state = {
+            "history": debate_state.get("history", "")
+            + "\n"
+            + bull_argument
+            + "\n"
+            + bear_argument,
+            "bull_history": bull_state["bull_history"],
+            "bear_history": bear_state["bear_history"],
+            "current_response": bear_argument,
+            "current_bull_response": bull_argument,
+            "current_bear_response": bear_argument,
+            "count": debate_state["count"] + 2,
+        }
+
+        return {
+            "investment_debate_state": new_investment_debate_state,
+            "context_tokens": _merged_context_tokens(bull_update, bear_update),
+        }
+
+    return create_node(invest_debate_round_node)
+
+
+def create_risk_debate_round(risky_node, safe_node, neutral_node):
+    """Create a node running one risk-team round with all three turns issued concurrently.
+
+    Every analyst sees the other two analysts' arguments from the previous
+    round. Turns are merged in the fixed order Risky, Safe, Neutral.
+    """
+
+    def risk_debate_round_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+
+        risky_update, safe_update, neutral_update = yield Gather(
+            [NodeCall(risky_node, state), NodeCall(safe_node, state), NodeCall(neutral_node, state)]
+        )
+        risky_state = risky_update["risk_debate_state"]
+        safe_state = safe_update["risk_debate_state"]
+        neutral_state = neutral_update["risk_debate_state"]
+
+        new_risk_debate_state = {
+            "history": risk_debate_state.get("history", "")
+            + "\n"
+            + risky_state["current_risky_response"]
+            + "\n"
+            + safe_state["current_safe_response"]
+            + "\n"
+            + neutral_state["current_neutral_response"],
+            "risky_history": risky_state["risky_history"],
+            "safe_history": safe_state["safe_history"],
+            "neutral_history": neutral_state["neutral_history"],
+            "latest_speaker": "Neutral",
+            "current_risky_response": risky_state["current_risky_response"],
+            "current_safe_response": safe_state["current_safe_response"],
+            "current_neutral_response": neutral_state["current_neutral_response"],
+            "count": risk_debate_state["count"] + 3,
+        }
+
+        return {
+            "risk_debate_state": new_risk_debate_state,
+            "context_tokens": _merged_context_tokens(risky_update, safe_update, neutral_update),
+        }
+
+    return create_node(risk_debate_round_node)
+
+
+def _merged_context_tokens(*updates) -> dict:
+    """Combine the context token counts reported by a round's turns."""
+    return reduce(
+        merge_context_tokens, (u.get("context_tokens", {}) for u in updates), {}
+    )
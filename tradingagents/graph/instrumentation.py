@@ -0,0 +1,240 @@
+# TradingAgents/graph/instrumentation.py
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+# Handler of the run executing in the current context, if any. Registered as
+# a configure hook so every runnable started in the context reports to it.
+_run_metrics: ContextVar[Optional["RunMetrics"]] = ContextVar("run_metrics", default=None)
+register_configure_hook(_run_metrics, inheritable=True)
+
+# Number of slowest spans listed in a run summary
+_SLOWEST_SPANS = 5
+
+
+class RunMetrics(BaseCallbackHandler):
+    """Collects timing spans of one graph run from LangChain callbacks.
+
+    Every graph node, LLM call and tool call becomes a span with its wall
+    time, the node it ran in, payload sizes and, for LLM calls, token usage.
+    Nodes and tools are observed through the callbacks LangGraph and
+    LangChain already emit, so nothing in the graph has to be wrapped.
+    """
+
+    run_inline = True
+
+    def __init__(self, token_prices: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            token_prices: USD per million (input, output) tokens by model name,
+                used to estimate the run's LLM cost
+        """
+        self.token_prices = token_prices or {}
+        self.spans: List[Dict[str, Any]] = []
+        self._open: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._wall_time: Optional[float] = None
+
+    # Graph nodes
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name")
+        # Nested runnables inside a node share its metadata; only the node's
+        # own run carries the node name
+        if metadata and name and metadata.get("langgraph_node") == name:
+            self._start(run_id, "node", name, name)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id, output_bytes=_payload_size(outputs))
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=repr(error))
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        input_chars = sum(len(str(m.content)) for batch in messages for m in batch)
+        self._start_llm(run_id, metadata, input_chars)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._start_llm(run_id, metadata, sum(len(p) for p in prompts))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        input_tokens = output_tokens = 0
+        output_chars = 0
+        for generations in response.generations:
+            for generation in generations:
+                output_chars += len(generation.text or "")
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    output_tokens += usage.get("output_tokens", 0)
+        self._end(
+            run_id,
+            output_bytes=output_chars,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=repr(error))
+
+    # Tool calls
+
+    def on_tool_start(self, serialized, input_str, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "tool")
+        node = (metadata or {}).get("langgraph_node")
+        self._start(run_id, "tool", name, node, input_bytes=len(input_str or ""))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id, output_bytes=len(str(getattr(output, "content", output))))
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=repr(error))
+
+    # Spans
+
+    def _start_llm(self, run_id, metadata, input_chars):
+        metadata = metadata or {}
+        model = str(metadata.get("ls_model_name") or "llm").removeprefix("models/")
+        self._start(run_id, "llm", model, metadata.get("langgraph_node"), input_bytes=input_chars)
+
+    def _start(self, run_id, kind, name, node, **fields):
+        span = {
+            "kind": kind,
+            "name": name,
+            "node": node,
+            "start": time.perf_counter(),
+            **fields,
+        }
+        with self._lock:
+            self._open[run_id] = span
+
+    def _end(self, run_id, **fields):
+        end = time.perf_counter()
+        with self._lock:
+            span = self._open.pop(run_id, None)
+            if span is None:
+                return
+            span.update(fields)
+            span["duration_s"] = round(end - span["start"], 4)
+            span["start"] = round(span["start"] - self._started, 4)
+            self.spans.append(span)
+
+    def finish(self):
+        """Stop the run's wall clock."""
+        self._wall_time = time.perf_counter() - self._started
+
+    def summary(self, include_spans: bool = True) -> Dict[str, Any]:
+        """Aggregate the spans per node, model and tool."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start"])
+        wall_time = self._wall_time
+        if wall_time is None:
+            wall_time = time.perf_counter() - self._started
+
+        nodes: Dict[str, Dict[str, Any]] = {}
+        llm: Dict[str, Any] = {
+            "calls": 0,
+            "time_s": 0.0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cost_usd": 0.0,
+            "by_node": {},
+        }
+        tools: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            duration = span["duration_s"]
+            if span["kind"] == "node":
+                stats = nodes.setdefault(
+                    span["name"], {"calls": 0, "time_s": 0.0, "max_s": 0.0, "output_bytes": 0}
+                )
+                stats["max_s"] = max(stats["max_s"], duration)
+                stats["output_bytes"] += span.get("output_bytes", 0)
+            elif span["kind"] == "llm":
+                stats = llm["by_node"].setdefault(
+                    span["node"] or "-",
+                    {"calls": 0, "time_s": 0.0, "input_tokens": 0, "output_tokens": 0},
+                )
+                for target in (llm, stats):
+                    target["input_tokens"] += span.get("input_tokens", 0)
+                    target["output_tokens"] += span.get("output_tokens", 0)
+                llm["calls"] += 1
+                llm["time_s"] += duration
+                llm["cost_usd"] += self._cost(span)
+            else:
+                stats = tools.setdefault(
+                    span["name"], {"calls": 0, "time_s": 0.0, "output_bytes": 0, "errors": 0}
+                )
+                stats["output_bytes"] += span.get("output_bytes", 0)
+                stats["errors"] += "error" in span
+            stats["calls"] += 1
+            stats["time_s"] += duration
+
+        _round_times(nodes, tools, llm["by_node"], {"llm": llm})
+        llm["cost_usd"] = round(llm["cost_usd"], 6)
+        summary = {
+            "wall_time_s": round(wall_time, 3),
+            "nodes": nodes,
+            "llm": llm,
+            "tools": tools,
+            "errors": sum("error" in s for s in spans),
+            "slowest": [
+                {k: s[k] for k in ("kind", "name", "node", "duration_s")}
+                for s in sorted(spans, key=lambda s: -s["duration_s"])[:_SLOWEST_SPANS]
+            ],
+        }
+        if include_spans:
+            summary["spans"] = spans
+        return summary
+
+    def _cost(self, span) -> float:
+        prices = self.token_prices.get(span["name"])
+        if not prices:
+            return 0.0
+        input_price, output_price = prices
+        return (
+            span.get("input_tokens", 0) * input_price + span.get("output_tokens", 0) * output_price
+        ) / 1_000_000
+
+
+@contextmanager
+def instrument_run(token_prices: Optional[Dict[str, Any]] = None):
+    """Record spans of every graph run started in the block.
+
+    Yields the run's `RunMetrics`. Runnables invoked inside the block,
+    including in worker threads and tasks started with a copy of the
+    context, report to it.
+    """
+    metrics = RunMetrics(token_prices)
+    token = _run_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.finish()
+        _run_metrics.reset(token)
+
+
+def _payload_size(value) -> int:
+    """Approximate serialized size of a node's output."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+def _round_times(*groups):
+    for group in groups:
+        for stats in group.values():
+            for key in ("time_s", "max_s"):
+                if key in stats:
+                    stats[key] = round(stats[key], 4)
@@ -0,0 +1,148 @@
+# TradingAgents/graph/prefetch.py
+
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.prebuilt import ToolNode
+
+from tradingagents.agents.utils.node_runtime import Gather, Invoke, NodeCall, create_node
+from tradingagents.agents.utils.report_cache import tool_result_content
+
+# Window of price history every market analysis starts from
+PRICE_LOOKBACK_DAYS = 30
+NEWS_LOOKBACK_DAYS = 7
+
+
+def _days_before(trade_date: str, days: int) -> str:
+    start = pd.Timestamp(trade_date) - timedelta(days=days)
+    return start.strftime("%Y-%m-%d")
+
+
+def get_prefetch_calls(
+    analyst_type: str, ticker: str, trade_date: str, online_tools: bool
+) -> List[Tuple[str, Dict]]:
+    """Return the (tool name, args) calls an analyst always makes for a ticker and date."""
+    if analyst_type == "market":
+        name = "get_YFin_data_online" if online_tools else "get_YFin_data"
+        return [
+            (
+                name,
+                {
+                    "symbol": ticker,
+                    "start_date": _days_before(trade_date, PRICE_LOOKBACK_DAYS),
+                    "end_date": trade_date,
+                },
+            )
+        ]
+    if analyst_type == "social":
+        name = "get_stock_news_openai" if online_tools else "get_reddit_stock_info"
+        return [(name, {"ticker": ticker, "curr_date": trade_date})]
+    if analyst_type == "news":
+        if online_tools:
+            return [
+                ("get_global_news_openai", {"curr_date": trade_date}),
+                ("get_google_news", {"query": ticker, "curr_date": trade_date}),
+            ]
+        return [
+            (
+                "get_finnhub_news",
+                {
+                    "ticker": ticker,
+                    "start_date": _days_before(trade_date, NEWS_LOOKBACK_DAYS),
+                    "end_date": trade_date,
+                },
+            ),
+            ("get_reddit_news", {"curr_date": trade_date}),
+        ]
+    if analyst_type == "fundamentals":
+        if online_tools:
+            return [("get_fundamentals_openai", {"ticker": ticker, "curr_date": trade_date})]
+        return [
+            ("get_finnhub_company_insider_sentiment", {"ticker": ticker, "curr_date": trade_date}),
+            ("get_finnhub_company_insider_transactions", {"ticker": ticker, "curr_date": trade_date}),
+            ("get_simfin_balance_sheet", {"ticker": ticker, "freq": "quarterly", "curr_date": trade_date}),
+            ("get_simfin_cashflow", {"ticker": ticker, "freq": "quarterly", "curr_date": trade_date}),
+            ("get_simfin_income_stmt", {"ticker": ticker, "freq": "quarterly", "curr_date": trade_date}),
+        ]
+    return []
+
+
+def create_data_prefetch(
+    toolkit,
+    tool_nodes: Dict[str, ToolNode],
+    selected_analysts,
+    cached_reports: Optional[Dict[str, Callable]] = None,
+):
+    """Create a node fetching every selected analyst's mandatory datasets concurrently.
+
+    Calls go through the analysts' own ToolNode tools, so they share the tool
+    call cache with any calls the analysts make later. Analysts whose
+    `cached_reports` check finds a cached report for the run are skipped,
+    as are analysts whose calls cannot be built for the trade date; both
+    fetch their own data.
+    """
+    cached_reports = cached_reports or {}
+
+    def data_prefetch_node(state) -> dict:
+        ticker = state["company_of_interest"]
+        trade_date = state["trade_date"]
+        online_tools = toolkit.config["online_tools"]
+
+        calls = []
+        for analyst_type in selected_analysts:
+            has_cached_report = cached_reports.get(analyst_type)
+            if has_cached_report is not None and has_cached_report(state):
+                continue
+            try:
+                analyst_calls = get_prefetch_calls(analyst_type, ticker, trade_date, online_tools)
+            except ValueError:
+                continue  # A trade date pandas cannot parse; the analyst's tools report it
+            tools_by_name = tool_nodes[analyst_type].tools_by_name
+            for name, args in analyst_calls:
+                if name in tools_by_name:
+                    calls.append((analyst_type, name, args, tools_by_name[name]))
+
+        results = yield Gather(
+            [Invoke(tool, args) for _, _, args, tool in calls], return_exceptions=True
+        )
+
+        prefetched_data = {analyst_type: [] for analyst_type in selected_analysts}
+        for (analyst_type, name, args, _), result in zip(calls, results):
+            prefetched_data[analyst_type].append(
+                {"name": name, "args": args, "content": tool_result_content(result)}
+            )
+
+        return {"prefetched_data": prefetched_data}
+
+    return create_node(data_prefetch_node)
+
+
+def create_prefetched_analyst(analyst_node, analyst_type):
+    """Wrap an analyst so its first turn starts from the prefetched tool results.
+
+    The prefetched data is injected as a synthetic tool call and its results,
+    and both are kept in the message history so later turns stay well formed.
+    The regular tool loop remains available for anything else.
+    """
+
+    def prefetched_analyst_node(state):
+        messages = state["messages"]
+        results = (state.get("prefetched_data") or {}).get(analyst_type)
+        if not results or any(isinstance(m, AIMessage) for m in messages):
+            return (yield NodeCall(analyst_node, state))
+
+        tool_calls = [
+            {"name": r["name"], "args": r["args"], "id": f"prefetch_{analyst_type}_{i}"}
+            for i, r in enumerate(results)
+        ]
+        injected = [AIMessage(content="", tool_calls=tool_calls)] + [
+            ToolMessage(content=r["content"], name=r["name"], tool_call_id=call["id"])
+            for r, call in zip(results, tool_calls)
+        ]
+
+        update = yield NodeCall(analyst_node, {**state, "messages": list(messages) + injected})
+        return {**update, "messages": injected + update["messages"]}
+
+    return create_node(prefetched_analyst_node)
@@ -0,0 +1,296 @@
+# TradingAgents/graph/profiling.py
+
+import asyncio
+import cProfile
+import functools
+import itertools
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.agents.utils.node_runtime import register_worker_scope
+
+# Profiler of the run executing in the current context, if any. As a
+# configure hook it sees the start and end of every graph node.
+_run_profiler: ContextVar[Optional["RunProfiler"]] = ContextVar("run_profiler", default=None)
+register_configure_hook(_run_profiler, inheritable=True)
+
+# Guards against nesting profilers in one thread: an inner target is already
+# covered by the outer profile
+_thread_state = threading.local()
+
+_hooked_functions = set()
+_hook_lock = threading.Lock()
+
+
+class HotSpot(NamedTuple):
+    """One function's share of the profiled time across runs."""
+
+    function: str  # file:line(name)
+    calls: int  # Calls, or samples for sampling profiles
+    self_time: float  # Seconds, or the share of samples for sampling profiles
+    cumulative_time: float
+
+
+class _StackSampler:
+    """Samples one thread's call stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_filename}:{code.co_firstlineno}({code.co_name})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: Path):
+        """Write collapsed stacks ("a;b;c count"), the flame graph input format."""
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler(BaseCallbackHandler):
+    """Profiles selected graph nodes and dataflow functions of one run.
+
+    Each profiled call writes one artifact into `output_dir`: a pstats file
+    (`.prof`) in "deterministic" mode, or collapsed stacks (`.folded`) in
+    "sampling" mode. Sync nodes and functions are profiled in the thread
+    that runs them. A node running on an event loop only awaits its LLM
+    calls, so in async runs the profile covers its blocking calls instead,
+    one artifact per call, in the worker thread each one runs in.
+    """
+
+    run_inline = True
+
+    def __init__(self, targets: Iterable[str], output_dir, mode="deterministic", interval=0.005):
+        if mode not in ("deterministic", "sampling"):
+            raise ValueError(f"Unknown profile mode {mode!r}")
+        self.targets = set(targets)
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.interval = interval
+        self.artifacts: List[Path] = []
+        self._open: Dict[UUID, tuple] = {}
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name")
+        if _on_event_loop():
+            return  # Profiled per blocking call by `_worker_profile` instead
+        if name in self.targets and metadata and metadata.get("langgraph_node") == name:
+            started = self.start(name)
+            if started is not None:
+                self._open[run_id] = started
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        started = self._open.pop(run_id, None)
+        if started is not None:
+            self.stop(started)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self.on_chain_end(None, run_id=run_id)
+
+    def start(self, target: str):
+        """Start profiling `target` in the current thread; None if already profiling."""
+        if getattr(_thread_state, "active", False):
+            return None
+        _thread_state.active = True
+        if self.mode == "deterministic":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = _StackSampler(threading.get_ident(), self.interval)
+            profiler.start()
+        return target, profiler
+
+    def stop(self, started):
+        target, profiler = started
+        if self.mode == "deterministic":
+            profiler.disable()
+        else:
+            profiler.stop()
+        _thread_state.active = False
+
+        slug = re.sub(r"[^A-Za-z0-9_]+", "_", target).strip("_")
+        suffix = ".prof" if self.mode == "deterministic" else ".folded"
+        with self._lock:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / f"{slug}-{next(self._seq)}{suffix}"
+            self.artifacts.append(path)
+        if self.mode == "deterministic":
+            profiler.dump_stats(path)
+        else:
+            profiler.write(path)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@contextmanager
+def _worker_profile(config):
+    """Profile a targeted async node's blocking call in its worker thread."""
+    profiler = _run_profiler.get()
+    node = ((config or {}).get("metadata") or {}).get("langgraph_node")
+    started = profiler.start(node) if profiler and node in profiler.targets else None
+    try:
+        yield
+    finally:
+        if started is not None:
+            profiler.stop(started)
+
+
+register_worker_scope(_worker_profile)
+
+
+def install_function_hooks(names: Iterable[str]):
+    """Route `tradingagents.dataflows.interface` functions through the run profiler.
+
+    Only functions named as profiling targets are wrapped, once per process;
+    a wrapped function checks for an active profiler that targets it and
+    otherwise calls straight through.
+    """
+    with _hook_lock:
+        for name in names:
+            func = getattr(interface, name, None)
+            if name in _hooked_functions or not callable(func):
+                continue
+            setattr(interface, name, _profiled(name, func))
+            _hooked_functions.add(name)
+
+
+def _profiled(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _run_profiler.get()
+        if profiler is None or name not in profiler.targets:
+            return func(*args, **kwargs)
+        started = profiler.start(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if started is not None:
+                profiler.stop(started)
+
+    return wrapper
+
+
+@contextmanager
+def profile_run(targets: Iterable[str], output_dir, mode="deterministic", interval=0.005):
+    """Profile the targeted nodes and dataflow functions of runs started in the block.
+
+    Yields the `RunProfiler`, whose `artifacts` lists the files written.
+    """
+    targets = list(targets)
+    install_function_hooks(targets)
+    profiler = RunProfiler(targets, output_dir, mode, interval)
+    token = _run_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _run_profiler.reset(token)
+
+
+def summarize_profiles(
+    profile_dir,
+    top: int = 20,
+    sort: str = "tottime",
+    target: Optional[str] = None,
+    mode: Optional[str] = None,
+) -> List[HotSpot]:
+    """Aggregate the hot spots of all profile artifacts under `profile_dir`.
+
+    Args:
+        profile_dir: Directory searched recursively for artifacts
+        top: Number of functions to return
+        sort: "tottime" (own time) or "cumtime" (including callees)
+        target: Only use artifacts of this node or function
+        mode: "deterministic" (.prof files, times in seconds) or "sampling"
+            (.folded files, times as shares of all samples); defaults to
+            deterministic when any .prof file exists
+    """
+    slug = re.sub(r"[^A-Za-z0-9_]+", "_", target).strip("_") if target else None
+
+    def selected(pattern):
+        paths = sorted(Path(profile_dir).rglob(pattern))
+        if slug:
+            paths = [p for p in paths if p.stem.rsplit("-", 1)[0] == slug]
+        return [str(p) for p in paths]
+
+    hot_spots = []
+    prof_files = selected("*.prof")
+    if mode is None:
+        mode = "deterministic" if prof_files else "sampling"
+    if mode == "deterministic" and prof_files:
+        stats = pstats.Stats(*prof_files)
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            hot_spots.append(
+                HotSpot(f"{_short_path(filename)}:{line}({func})", calls, tottime, cumtime)
+            )
+
+    own, total = Counter(), Counter()
+    for path in selected("*.folded") if mode == "sampling" else []:
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                frames = stack.split(";")
+                own[frames[-1]] += int(count)
+                for frame in set(frames):
+                    total[frame] += int(count)
+    samples = sum(own.values())
+    for frame, count in total.items():
+        hot_spots.append(
+            HotSpot(_short_frame(frame), count, own[frame] / samples, count / samples)
+        )
+
+    key = (lambda h: h.cumulative_time) if sort == "cumtime" else (lambda h: h.self_time)
+    return sorted(hot_spots, key=key, reverse=True)[:top]
+
+
+def _short_path(filename: str) -> str:
+    """Trim a source path to its package-relative part."""
+    for marker in ("site-packages" + os.sep, "tradingagents" + os.sep):
+        if marker in filename:
+            prefix = "" if marker.startswith("site") else "tradingagents" + os.sep
+            return prefix + filename.split(marker, 1)[1]
+    return filename
+
+
+def _short_frame(frame: str) -> str:
+    filename, _, rest = frame.rpartition(":")
+    return f"{_short_path(filename)}:{rest}"
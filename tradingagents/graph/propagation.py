@@ -1,19 +1,31 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from tradingagents.agents.utils.agent_states import (
     AgentState,
+    DebateSummary,
     InvestDebateState,
     RiskDebateState,
 )
+from tradingagents.agents.utils.token_stream import STREAM_TOKENS_KEY
 
 
 class Propagator:
     """Handles state initialization and propagation through the graph."""
 
-    def __init__(self, max_recur_limit=100):
-        """Initialize with configuration parameters."""
+    def __init__(self, max_recur_limit=100, stream_mode="values", stream_tokens=False):
+        """Initialize with configuration parameters.
+
+        Args:
+            max_recur_limit: Recursion limit of a graph run
+            stream_mode: "values" streams the full state after every step;
+                "updates" streams only each node's changes
+            stream_tokens: Also stream the agents' LLM tokens on the "custom"
+                channel, as (mode, chunk) pairs
+        """
         self.max_recur_limit = max_recur_limit
+        self.stream_mode = stream_mode
+        self.stream_tokens = stream_tokens
 
     def create_initial_state(
         self, company_name: str, trade_date: str
@@ -35,15 +47,35 @@ class Propagator:
                     "count": 0,
                 }
             ),
+            "investment_debate_summary": DebateSummary(text="", turns=0, count=0),
+            "risk_debate_summary": DebateSummary(text="", turns=0, count=0),
+            "investment_debate_convergence": [],
+            "risk_debate_convergence": [],
             "market_report": "",
             "fundamentals_report": "",
             "sentiment_report": "",
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            thread_id: Checkpoint thread of the run, required when the graph
+                was compiled with a checkpointer
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        configurable = {}
+        if thread_id is not None:
+            configurable["thread_id"] = thread_id
+        stream_mode = self.stream_mode
+        if self.stream_tokens:
+            configurable[STREAM_TOKENS_KEY] = True
+            stream_mode = [self.stream_mode, "custom"]
+        if configurable:
+            config["configurable"] = configurable
+
         return {
-            "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "stream_mode": stream_mode,
+            "config": config,
         }
@@ -1,15 +1,27 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 
+# Memory key -> (component label, accessor for the decision being reflected on)
+REFLECTION_COMPONENTS = {
+    "bull": ("BULL", lambda s: s["investment_debate_state"]["bull_history"]),
+    "bear": ("BEAR", lambda s: s["investment_debate_state"]["bear_history"]),
+    "trader": ("TRADER", lambda s: s["trader_investment_plan"]),
+    "invest_judge": ("INVEST JUDGE", lambda s: s["investment_debate_state"]["judge_decision"]),
+    "risk_manager": ("RISK JUDGE", lambda s: s["risk_debate_state"]["judge_decision"]),
+}
+
+
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
-    def __init__(self, quick_thinking_llm: ChatGoogleGenerativeAI):
+    def __init__(self, quick_thinking_llm: ChatGoogleGenerativeAI, max_workers: int = 5):
         """Initialize the reflector with an LLM."""
         self.quick_thinking_llm = quick_thinking_llm
+        self.max_workers = max_workers
         self.reflection_system_prompt = self._get_reflection_prompt()
 
     def _get_reflection_prompt(self) -> str:
@@ -78,7 +90,9 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "BULL", bull_debate_history, situation, returns_losses
         )
-        bull_memory.add_situations([(situation, result)])
+        bull_memory.add_situations(
+            [(situation, result)], outcome=returns_losses
+        )
 
     def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
         """Reflect on bear researcher's analysis and update memory."""
@@ -88,7 +102,9 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "BEAR", bear_debate_history, situation, returns_losses
         )
-        bear_memory.add_situations([(situation, result)])
+        bear_memory.add_situations(
+            [(situation, result)], outcome=returns_losses
+        )
 
     def reflect_trader(self, current_state, returns_losses, trader_memory):
         """Reflect on trader's decision and update memory."""
@@ -98,7 +114,9 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "TRADER", trader_decision, situation, returns_losses
         )
-        trader_memory.add_situations([(situation, result)])
+        trader_memory.add_situations(
+            [(situation, result)], outcome=returns_losses
+        )
 
     def reflect_invest_judge(self, current_state, returns_losses, invest_judge_memory):
         """Reflect on investment judge's decision and update memory."""
@@ -108,7 +126,9 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "INVEST JUDGE", judge_decision, situation, returns_losses
         )
-        invest_judge_memory.add_situations([(situation, result)])
+        invest_judge_memory.add_situations(
+            [(situation, result)], outcome=returns_losses
+        )
 
     def reflect_risk_manager(self, current_state, returns_losses, risk_manager_memory):
         """Reflect on risk manager's decision and update memory."""
@@ -118,4 +138,61 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "RISK JUDGE", judge_decision, situation, returns_losses
         )
-        risk_manager_memory.add_situations([(situation, result)])
+        risk_manager_memory.add_situations(
+            [(situation, result)], outcome=returns_losses
+        )
+
+    def reflect_all(self, current_state, returns_losses, memories: Dict[str, Any]):
+        """Reflect on every component of one run concurrently and update memories.
+
+        Args:
+            current_state: Final state of the run being reflected on
+            returns_losses: Realised returns of the decision
+            memories: Memory store per component key of REFLECTION_COMPONENTS
+        """
+        self.reflect_batch([(current_state, returns_losses)], memories)
+
+    def reflect_batch(
+        self, states_and_returns: List[Tuple[Dict[str, Any], Any]], memories: Dict[str, Any]
+    ):
+        """Reflect on many (state, returns) pairs with one shared worker pool.
+
+        The situation text and its embedding are computed once per state and
+        reused by every component. Memories are written after all reflections
+        finish, in input order, so results do not depend on completion order.
+        """
+        embedder = next(iter(memories.values()))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            situations = [
+                self._extract_current_situation(state) for state, _ in states_and_returns
+            ]
+            embedding_futures = [
+                executor.submit(embedder.get_embedding, situation)
+                for situation in situations
+            ]
+            reflection_futures = [
+                {
+                    key: executor.submit(
+                        self._reflect_on_component,
+                        component_type,
+                        get_report(state),
+                        situation,
+                        returns_losses,
+                    )
+                    for key, (component_type, get_report) in REFLECTION_COMPONENTS.items()
+                    if key in memories
+                }
+                for (state, returns_losses), situation in zip(states_and_returns, situations)
+            ]
+
+            for (_, returns_losses), situation, embedding_future, futures in zip(
+                states_and_returns, situations, embedding_futures, reflection_futures
+            ):
+                embedding = embedding_future.result()
+                for key, future in futures.items():
+                    memories[key].add_situations(
+                        [(situation, future.result())],
+                        outcome=returns_losses,
+                        embeddings=[embedding],
+                    )
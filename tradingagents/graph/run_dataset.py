@@ -0,0 +1,325 @@
+# TradingAgents/graph/run_dataset.py
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from tradingagents.agents.utils.context_builder import split_turns
+
+from .run_log import RunLogReader
+from .signal_processing import MIN_SIGNAL_CONFIDENCE, parse_signal, scored_action
+
+_MANIFEST = "manifest.json"
+
+# Long text fields of a log entry, stored apart from the per-run columns
+_TEXT_FIELDS = {
+    "market_report": lambda e: e.get("market_report", ""),
+    "sentiment_report": lambda e: e.get("sentiment_report", ""),
+    "news_report": lambda e: e.get("news_report", ""),
+    "fundamentals_report": lambda e: e.get("fundamentals_report", ""),
+    "investment_debate": lambda e: e.get("investment_debate_state", {}).get("history", ""),
+    "investment_plan": lambda e: e.get("investment_plan", ""),
+    "trader_plan": lambda e: e.get("trader_investment_decision", ""),
+    "risk_debate": lambda e: e.get("risk_debate_state", {}).get("history", ""),
+    "final_trade_decision": lambda e: e.get("final_trade_decision", ""),
+}
+
+
+def _parquet_available() -> bool:
+    for module in ("pyarrow", "fastparquet"):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def run_row(
+    ticker: str, trade_date: str, entry: Dict[str, Any], min_confidence: float = MIN_SIGNAL_CONFIDENCE
+) -> Dict[str, Any]:
+    """Flatten one state log entry into the dataset's per-run columns.
+
+    Decisions parsed with less than `min_confidence` get action UNKNOWN,
+    so unreadable decisions never count as HOLDs.
+    """
+    signal = parse_signal(entry.get("final_trade_decision", ""))
+    summary = entry.get("run_summary") or {}
+    llm = summary.get("llm") or {}
+    row = {
+        "ticker": ticker,
+        "trade_date": pd.Timestamp(trade_date),
+        "action": scored_action(signal, min_confidence),
+        "confidence": signal.confidence,
+        "position_size_pct": signal.position_size_pct,
+        "stop_loss": signal.stop_loss,
+        "horizon": signal.horizon,
+        "investment_debate_turns": len(split_turns(_TEXT_FIELDS["investment_debate"](entry))),
+        "risk_debate_turns": len(split_turns(_TEXT_FIELDS["risk_debate"](entry))),
+        "investment_debate_converged": any(
+            r.get("converged") for r in entry.get("investment_debate_convergence", [])
+        ),
+        "risk_debate_converged": any(
+            r.get("converged") for r in entry.get("risk_debate_convergence", [])
+        ),
+        "wall_time_s": summary.get("wall_time_s"),
+        "llm_calls": llm.get("calls"),
+        "input_tokens": llm.get("input_tokens"),
+        "output_tokens": llm.get("output_tokens"),
+        "cost_usd": llm.get("cost_usd"),
+        "tool_calls": (
+            sum(t["calls"] for t in summary["tools"].values()) if "tools" in summary else None
+        ),
+    }
+    for field, get in _TEXT_FIELDS.items():
+        row[f"{field}_chars"] = len(get(entry) or "")
+    return row
+
+
+def _iter_log_entries(log_dir) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Yield (provenance, entry) for every run in a state log directory.
+
+    Covers appended run logs and the per-date JSON files of the "json"
+    format. Older JSON files repeated every earlier date of the instance,
+    so each (ticker, date) is only taken from one of them.
+    """
+    reader = RunLogReader(log_dir)
+    for ticker in reader.tickers():
+        for record, state in reader.iter_states(ticker):
+            yield {
+                "ticker": ticker,
+                "trade_date": record.trade_date,
+                "run_id": record.run_id,
+                "logged_at": record.written_at,
+                "source": "run_log",
+            }, state
+
+    seen = set()
+    paths = sorted(Path(log_dir).glob("*/TradingAgentsStrategy_logs/full_states_log_*.json"))
+    for path in paths:
+        ticker = path.parent.parent.name
+        file_date = path.stem.rsplit("_", 1)[-1]
+        try:
+            with open(path) as f:
+                states = json.load(f)
+        except ValueError:
+            continue
+        # The entry a file is named after wins over copies in later files
+        for trade_date in sorted(states, key=lambda d: d != file_date):
+            if (ticker, trade_date) in seen:
+                continue
+            seen.add((ticker, trade_date))
+            yield {
+                "ticker": ticker,
+                "trade_date": trade_date,
+                "run_id": None,
+                "logged_at": path.stat().st_mtime,
+                "source": "json",
+            }, states[trade_date]
+
+
+def export_run_dataset(
+    log_dir="eval_results",
+    output_dir="results/run_dataset",
+    min_confidence: float = MIN_SIGNAL_CONFIDENCE,
+) -> "RunDataset":
+    """Compact the state logs under `log_dir` into a columnar run dataset.
+
+    Writes one row per run to `runs` and the long texts of each run to
+    `texts`, keyed by `run_key`, so scans over decisions, sizes and costs
+    never read the reports. Tables are Parquet when pyarrow or fastparquet
+    is installed and compressed CSV otherwise. Decisions parsed with less
+    than `min_confidence` are stored with action UNKNOWN. The dataset is
+    rebuilt from scratch on every export.
+    """
+    rows: List[Dict[str, Any]] = []
+    texts: List[Dict[str, Any]] = []
+    for run_key, (provenance, entry) in enumerate(_iter_log_entries(log_dir)):
+        row = run_row(provenance["ticker"], provenance["trade_date"], entry, min_confidence)
+        row.update(
+            run_key=run_key,
+            run_id=provenance["run_id"],
+            logged_at=pd.Timestamp(provenance["logged_at"], unit="s"),
+            source=provenance["source"],
+        )
+        rows.append(row)
+        texts.append(
+            {"run_key": run_key, **{field: get(entry) for field, get in _TEXT_FIELDS.items()}}
+        )
+
+    runs = pd.DataFrame(rows)
+    if not runs.empty:
+        runs = runs.sort_values(["ticker", "trade_date", "logged_at"], kind="stable")
+        runs["ticker"] = runs["ticker"].astype("category")
+        runs["action"] = runs["action"].astype("category")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    table_format = "parquet" if _parquet_available() else "csv"
+    _write_table(runs, output_dir / "runs", table_format)
+    _write_table(pd.DataFrame(texts), output_dir / "texts", table_format)
+    with open(output_dir / _MANIFEST, "w") as f:
+        json.dump(
+            {
+                "format": table_format,
+                "runs": len(runs),
+                "source": str(Path(log_dir).resolve()),
+                "exported_at": time.time(),
+            },
+            f,
+            indent=2,
+        )
+    return RunDataset(output_dir)
+
+
+def _run_columns(by: Optional[str]) -> List[str]:
+    """Stored columns a grouping reads besides ticker and trade date."""
+    return [] if by in (None, "sector", "year", "month") else [by]
+
+
+def _write_table(frame: pd.DataFrame, path: Path, table_format: str):
+    if table_format == "parquet":
+        frame.to_parquet(path.with_suffix(".parquet"), index=False)
+    else:
+        frame.to_csv(path.with_suffix(".csv.gz"), index=False)
+
+
+class RunDataset:
+    """Query API over a dataset written by `export_run_dataset`."""
+
+    def __init__(self, path="results/run_dataset"):
+        self.path = Path(path)
+        manifest = self.path / _MANIFEST
+        if not manifest.exists():
+            raise FileNotFoundError(f"No run dataset at {self.path}; export one first")
+        with open(manifest) as f:
+            self.manifest = json.load(f)
+
+    def runs(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        tickers: Optional[Iterable[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Per-run columns, optionally restricted to some columns, tickers and dates."""
+        columns = list(columns) if columns is not None else None
+        if columns is not None:
+            columns = list(dict.fromkeys(["run_key", "ticker", "trade_date", *columns]))
+        frame = self._read("runs", columns)
+        if frame.empty:
+            return frame
+        frame["trade_date"] = pd.to_datetime(frame["trade_date"])
+        mask = pd.Series(True, index=frame.index)
+        if tickers is not None:
+            mask &= frame["ticker"].isin(list(tickers))
+        if start_date:
+            mask &= frame["trade_date"] >= pd.Timestamp(start_date)
+        if end_date:
+            mask &= frame["trade_date"] <= pd.Timestamp(end_date)
+        return frame[mask].reset_index(drop=True)
+
+    def texts(
+        self, run_keys: Optional[Iterable[int]] = None, fields: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """Long text fields of the given runs, keyed by `run_key`."""
+        columns = ["run_key", *fields] if fields is not None else None
+        frame = self._read("texts", columns)
+        if run_keys is not None:
+            frame = frame[frame["run_key"].isin(list(run_keys))]
+        return frame.reset_index(drop=True)
+
+    def summary(
+        self,
+        by: str = "ticker",
+        sectors: Optional[Mapping[str, str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Decision counts, confidence and run cost per group.
+
+        With by=None all runs form one group, named "all".
+        """
+        columns = ["action", "confidence", "wall_time_s", "cost_usd", *_run_columns(by)]
+        frame = self._grouped(
+            self.runs(columns, start_date=start_date, end_date=end_date), by, sectors
+        )
+        actions = pd.crosstab(frame["group"], frame["action"])
+        stats = frame.groupby("group").agg(
+            runs=("run_key", "size"),
+            mean_confidence=("confidence", "mean"),
+            mean_wall_time_s=("wall_time_s", "mean"),
+            cost_usd=("cost_usd", "sum"),
+        )
+        return stats.join(actions).rename_axis(by or "all").reset_index()
+
+    def hit_rate(
+        self,
+        returns: pd.DataFrame,
+        by: Optional[str] = None,
+        sectors: Optional[Mapping[str, str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """How often BUY and SELL decisions pointed the way the price then moved.
+
+        Args:
+            returns: Realized forward returns with columns ticker, trade_date
+                and return (e.g. 0.03 for +3%)
+            by: Optional grouping: "ticker", "sector", "action", "year",
+                "month" or any run column
+            sectors: Ticker to sector mapping, needed for by="sector"
+            start_date, end_date: Only use runs in this date range
+        """
+        columns = ["action", "confidence", *_run_columns(by)]
+        runs = self.runs(columns, start_date=start_date, end_date=end_date)
+        returns = returns[["ticker", "trade_date", "return"]].copy()
+        returns["ticker"] = returns["ticker"].astype(str)
+        returns["trade_date"] = pd.to_datetime(returns["trade_date"])
+        runs["ticker"] = runs["ticker"].astype(str)
+        frame = runs.merge(returns, on=["ticker", "trade_date"], how="inner")
+        frame = frame[frame["action"].isin(["BUY", "SELL"])]
+        frame = self._grouped(frame, by, sectors)
+
+        direction = frame["action"].map({"BUY": 1.0, "SELL": -1.0})
+        frame = frame.assign(
+            hit=(direction * frame["return"]) > 0,
+            signed_return=direction * frame["return"],
+        )
+        result = frame.groupby("group").agg(
+            decisions=("hit", "size"),
+            hits=("hit", "sum"),
+            mean_signed_return=("signed_return", "mean"),
+        )
+        result["hit_rate"] = result["hits"] / result["decisions"]
+        return result.rename_axis(by or "all").reset_index()
+
+    def _grouped(self, frame, by, sectors) -> pd.DataFrame:
+        frame = frame.copy()
+        if by is None:
+            frame["group"] = "all"
+        elif by == "sector":
+            if sectors is None:
+                raise ValueError("Grouping by sector needs a ticker to sector mapping")
+            frame["group"] = frame["ticker"].astype(str).map(sectors).fillna("unknown")
+        elif by == "year":
+            frame["group"] = frame["trade_date"].dt.year
+        elif by == "month":
+            frame["group"] = frame["trade_date"].dt.strftime("%Y-%m")
+        elif by in frame.columns:
+            frame["group"] = frame[by].astype(str)
+        else:
+            raise ValueError(f"Unknown grouping {by!r}")
+        return frame
+
+    def _read(self, table: str, columns: Optional[List[str]]) -> pd.DataFrame:
+        if self.manifest["format"] == "parquet":
+            return pd.read_parquet(self.path / f"{table}.parquet", columns=columns)
+        path = self.path / f"{table}.csv.gz"
+        try:
+            return pd.read_csv(path, usecols=columns)
+        except pd.errors.EmptyDataError:
+            return pd.DataFrame(columns=columns or [])
@@ -0,0 +1,237 @@
+# TradingAgents/graph/run_log.py
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import warnings
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Directory under <log_dir>/<ticker> holding a ticker's state log
+_LOG_SUBDIR = "TradingAgentsStrategy_logs"
+_INDEX_FILE = "states.index.jsonl"
+_DATA_FILES = {"gzip": "states.jsonl.gz", "zstd": "states.jsonl.zst"}
+
+# Writers shared by every graph in the process, one per log directory
+_writers: Dict[Tuple[str, str], "RunLogWriter"] = {}
+_writers_lock = threading.Lock()
+
+
+class RunLogRecord(NamedTuple):
+    """Index entry locating one logged run in a ticker's data file."""
+
+    ticker: str
+    trade_date: str
+    run_id: Optional[str]
+    offset: int  # Byte offset of the run's compressed frame
+    length: int  # Compressed size of the frame in bytes
+    compression: str  # "gzip" or "zstd"
+    written_at: float  # Unix time the record was appended
+
+
+def _compressor(compression: str):
+    if compression == "gzip":
+        return lambda data: gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("zstd state logs require the zstandard package") from e
+        return zstandard.ZstdCompressor(level=3).compress
+    raise ValueError(f"Unknown state log compression {compression!r}")
+
+
+def _decompressor(compression: str):
+    if compression == "gzip":
+        return gzip.decompress
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Unknown state log compression {compression!r}")
+
+
+class RunLogWriter:
+    """Appends one compressed record per run to per-ticker state logs.
+
+    Every ticker gets an append-only data file of independently compressed
+    frames, one per run, plus a JSONL index of where each frame starts. A
+    logged run costs one frame however many runs came before it, and
+    nothing is kept in memory once written. Entries are serialized when
+    appended, so later changes to a state never leak into its record, and
+    compressed and written by a background thread. Each append returns a
+    future for its own write, so a failed write is reported to whoever
+    appended it. One writer should own a log directory at a time.
+    """
+
+    def __init__(self, log_dir, compression: str = "gzip", max_pending: int = 256):
+        self.log_dir = Path(log_dir)
+        self.compression = compression
+        self._compress = _compressor(compression)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._failures = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="run-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(
+        self, ticker: str, trade_date, entry: Dict[str, Any], run_id=None
+    ) -> "Future[RunLogRecord]":
+        """Queue a run's log entry; blocks only when `max_pending` entries are queued.
+
+        Returns a future resolving to the entry's index record once it is on
+        disk, or raising the error that kept it from being written.
+        """
+        if self._closed:
+            raise RuntimeError("The run log writer is closed")
+        ticker, trade_date = str(ticker), str(trade_date)
+        data = json.dumps(
+            {"ticker": ticker, "trade_date": trade_date, "run_id": run_id, "state": entry},
+            default=str,
+        ).encode("utf-8")
+        future: "Future[RunLogRecord]" = Future()
+        self._queue.put((future, (ticker, trade_date, run_id, data)))
+        return future
+
+    def flush(self):
+        """Wait until every queued record is written or has failed."""
+        self._queue.join()
+
+    def close(self):
+        """Write pending records and stop the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        if self._failures:
+            warnings.warn(
+                f"{self._failures} state log records failed to write", RuntimeWarning
+            )
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                future, args = item
+                try:
+                    future.set_result(self._write(*args))
+                except Exception as e:
+                    self._failures += 1
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, ticker, trade_date, run_id, data):
+        frame = self._compress(data + b"\n")
+        directory = self.log_dir / ticker / _LOG_SUBDIR
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with open(directory / _DATA_FILES[self.compression], "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(frame)
+        # The index entry goes last, so readers never see a half-written frame
+        record = RunLogRecord(
+            ticker, trade_date, run_id, offset, len(frame), self.compression, time.time()
+        )
+        with open(directory / _INDEX_FILE, "a") as f:
+            f.write(json.dumps(record._asdict()) + "\n")
+        return record
+
+
+def get_run_log_writer(log_dir, compression: str = "gzip") -> RunLogWriter:
+    """The process-wide writer for `log_dir`, created on first use.
+
+    Graphs logging to the same directory share it, so a ticker's log is
+    only ever appended to by one thread.
+    """
+    key = (os.path.abspath(log_dir), compression)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = _writers[key] = RunLogWriter(log_dir, compression)
+        return writer
+
+
+class RunLogReader:
+    """Looks up runs in state logs written by `RunLogWriter`.
+
+    Only a ticker's small index is scanned; each requested run is read by
+    seeking straight to its frame.
+    """
+
+    def __init__(self, log_dir="eval_results"):
+        self.log_dir = Path(log_dir)
+
+    def tickers(self) -> List[str]:
+        """Tickers with a state log."""
+        paths = self.log_dir.glob(f"*/{_LOG_SUBDIR}/{_INDEX_FILE}")
+        return sorted(p.parent.parent.name for p in paths)
+
+    def records(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[RunLogRecord]:
+        """Index entries of a ticker in write order, optionally within a date range."""
+        path = self.log_dir / ticker / _LOG_SUBDIR / _INDEX_FILE
+        if not path.exists():
+            return []
+        records = []
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = RunLogRecord(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue  # A line cut short by a crash
+                if start_date and record.trade_date < start_date:
+                    continue
+                if end_date and record.trade_date > end_date:
+                    continue
+                records.append(record)
+        return records
+
+    def dates(self, ticker: str) -> List[str]:
+        """Trade dates logged for a ticker."""
+        return sorted({r.trade_date for r in self.records(ticker)})
+
+    def read(self, ticker: str, trade_date, run_id=None) -> Optional[Dict[str, Any]]:
+        """The logged state of a ticker's run on `trade_date`.
+
+        Returns the latest run for the date, or the one with `run_id`, and
+        None when there is none.
+        """
+        matches = [
+            r
+            for r in self.records(ticker, str(trade_date), str(trade_date))
+            if run_id is None or r.run_id == run_id
+        ]
+        return self.load(matches[-1])["state"] if matches else None
+
+    def load(self, record: RunLogRecord) -> Dict[str, Any]:
+        """The full log record an index entry points to."""
+        path = self.log_dir / record.ticker / _LOG_SUBDIR / _DATA_FILES[record.compression]
+        with open(path, "rb") as f:
+            f.seek(record.offset)
+            frame = f.read(record.length)
+        return json.loads(_decompressor(record.compression)(frame))
+
+    def iter_states(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Iterator[Tuple[RunLogRecord, Dict[str, Any]]]:
+        """Yield (index entry, logged state) for a ticker's runs in write order."""
+        for record in self.records(ticker, start_date, end_date):
+            yield record, self.load(record)["state"]
@@ -1,6 +1,7 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.messages import HumanMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -8,11 +9,26 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.context_builder import ContextBuilder
+from tradingagents.agents.utils.node_runtime import Invoke, as_runnable, create_node
+from tradingagents.agents.utils.report_cache import ReportCache, create_cached_analyst
 
 from .conditional_logic import ConditionalLogic
+from .convergence import ConvergencePolicy, create_convergence_check
+from .debate_rounds import create_invest_debate_round, create_risk_debate_round
+from .prefetch import create_data_prefetch, create_prefetched_analyst
 from IPython.display import Image, display
 import os
 
+# State key each analyst writes its final report to
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
@@ -28,6 +44,10 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        report_cache: ReportCache = None,
+        context_builder: ContextBuilder = None,
+        summary_llm: ChatGoogleGenerativeAI = None,
+        convergence_policy: ConvergencePolicy = None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -40,9 +60,18 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.report_cache = report_cache
+        self.context_builder = context_builder or ContextBuilder()
+        self.summary_llm = summary_llm or quick_thinking_llm
+        self.convergence_policy = convergence_policy
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        analyst_execution="sequential",
+        debate_execution="sequential",
+        checkpointer=None,
+        data_prefetch=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -52,7 +81,27 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            analyst_execution (str): "sequential" chains the analysts one after
+                another on the shared message channel; "parallel" runs each
+                analyst as a concurrent branch with its own message channel and
+                tool loop, joining before the Bull Researcher.
+            debate_execution (str): "sequential" alternates single turns in both
+                debates; "parallel" runs every turn of a round concurrently and
+                merges the histories in a fixed speaker order.
+            checkpointer: Optional LangGraph checkpointer persisting state after
+                every node so interrupted runs can resume.
+            data_prefetch (bool): Fetch each analyst's mandatory datasets
+                concurrently before the analysts start and hand them over as
+                tool results, saving the LLM round trip that requests them.
         """
+        if analyst_execution not in ("sequential", "parallel"):
+            raise ValueError(
+                f"Trading Agents Graph Setup Error: unknown analyst execution mode {analyst_execution!r}"
+            )
+        if debate_execution not in ("sequential", "parallel"):
+            raise ValueError(
+                f"Trading Agents Graph Setup Error: unknown debate execution mode {debate_execution!r}"
+            )
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
 
@@ -89,116 +138,257 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        # Serve unchanged analyst stages from the report cache
+        cached_reports = {}
+        if self.report_cache is not None:
+            for analyst_type, node in analyst_nodes.items():
+                analyst_nodes[analyst_type] = create_cached_analyst(
+                    node,
+                    self.report_cache,
+                    analyst_type,
+                    ANALYST_REPORT_KEYS[analyst_type],
+                    getattr(self.quick_thinking_llm, "model", ""),
+                    self._tool_data_source(tool_nodes[analyst_type]),
+                    tool_nodes[analyst_type].tools_by_name,
+                )
+                cached_reports[analyst_type] = analyst_nodes[analyst_type].has_cached_report
+
+        if data_prefetch:
+            for analyst_type, node in analyst_nodes.items():
+                analyst_nodes[analyst_type] = create_prefetched_analyst(node, analyst_type)
+
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, self.context_builder
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, self.context_builder
         )
         research_manager_node = create_research_manager(
-            self.deep_thinking_llm, self.invest_judge_memory
+            self.deep_thinking_llm, self.invest_judge_memory, self.context_builder
+        )
+        trader_node = create_trader(
+            self.quick_thinking_llm, self.trader_memory, self.context_builder
         )
-        trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(self.quick_thinking_llm, self.context_builder)
+        neutral_analyst = create_neutral_debator(self.quick_thinking_llm, self.context_builder)
+        safe_analyst = create_safe_debator(self.quick_thinking_llm, self.context_builder)
         risk_manager_node = create_risk_manager(
-            self.deep_thinking_llm, self.risk_manager_memory
+            self.deep_thinking_llm, self.risk_manager_memory, self.context_builder
         )
 
         # Create workflow
         workflow = StateGraph(AgentState)
 
         # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+        if data_prefetch:
             workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                "Data Prefetch",
+                as_runnable(
+                    create_data_prefetch(
+                        self.toolkit, tool_nodes, selected_analysts, cached_reports
+                    )
+                ),
             )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+        if analyst_execution == "parallel":
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    as_runnable(
+                        self._create_analyst_branch(
+                            analyst_type, node, tool_nodes[analyst_type]
+                        )
+                    ),
+                )
+        else:
+            for analyst_type, node in analyst_nodes.items():
+                workflow.add_node(f"{analyst_type.capitalize()} Analyst", as_runnable(node))
+                workflow.add_node(
+                    f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                )
+                workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
-        workflow.add_node("Bull Researcher", bull_researcher_node)
-        workflow.add_node("Bear Researcher", bear_researcher_node)
-        workflow.add_node("Research Manager", research_manager_node)
-        workflow.add_node("Trader", trader_node)
-        workflow.add_node("Risky Analyst", risky_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Safe Analyst", safe_analyst)
-        workflow.add_node("Risk Judge", risk_manager_node)
+        if debate_execution == "parallel":
+            workflow.add_node(
+                "Investment Debate Round",
+                as_runnable(create_invest_debate_round(bull_researcher_node, bear_researcher_node)),
+            )
+        else:
+            workflow.add_node("Bull Researcher", as_runnable(bull_researcher_node))
+            workflow.add_node("Bear Researcher", as_runnable(bear_researcher_node))
+        workflow.add_node("Research Manager", as_runnable(research_manager_node))
+        workflow.add_node("Trader", as_runnable(trader_node))
+        if debate_execution == "parallel":
+            workflow.add_node(
+                "Risk Debate Round",
+                as_runnable(create_risk_debate_round(risky_analyst, safe_analyst, neutral_analyst)),
+            )
+        else:
+            workflow.add_node("Risky Analyst", as_runnable(risky_analyst))
+            workflow.add_node("Neutral Analyst", as_runnable(neutral_analyst))
+            workflow.add_node("Safe Analyst", as_runnable(safe_analyst))
+        workflow.add_node("Risk Judge", as_runnable(risk_manager_node))
+        summarize_debates = self.conditional_logic.summarize_debates
+        if summarize_debates:
+            workflow.add_node(
+                "Invest Debate Summarizer",
+                as_runnable(
+                    create_debate_summarizer(
+                        self.summary_llm,
+                        "investment_debate_state",
+                        "investment_debate_summary",
+                        self.context_builder,
+                    )
+                ),
+            )
+            workflow.add_node(
+                "Risk Debate Summarizer",
+                as_runnable(
+                    create_debate_summarizer(
+                        self.summary_llm,
+                        "risk_debate_state",
+                        "risk_debate_summary",
+                        self.context_builder,
+                    )
+                ),
+            )
+        check_convergence = self.conditional_logic.check_convergence
+        if check_convergence:
+            workflow.add_node(
+                "Invest Debate Convergence",
+                as_runnable(
+                    create_convergence_check(
+                        self.convergence_policy,
+                        "investment_debate_state",
+                        "investment_debate_convergence",
+                        2,
+                    )
+                ),
+            )
+            workflow.add_node(
+                "Risk Debate Convergence",
+                as_runnable(
+                    create_convergence_check(
+                        self.convergence_policy,
+                        "risk_debate_state",
+                        "risk_debate_convergence",
+                        3,
+                    )
+                ),
+            )
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        debate_entry = (
+            "Investment Debate Round" if debate_execution == "parallel" else "Bull Researcher"
+        )
+        analysts_entry = START
+        if data_prefetch:
+            workflow.add_edge(START, "Data Prefetch")
+            analysts_entry = "Data Prefetch"
+        if analyst_execution == "parallel":
+            # Fan out to every analyst and join before the debate
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst" for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(analysts_entry, analyst_name)
+            workflow.add_edge(analyst_names, debate_entry)
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(analysts_entry, f"{first_analyst.capitalize()} Analyst")
 
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
 
-            # Add conditional edges for current analyst
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, debate_entry)
+
+        # Add remaining edges. A completed round may detour through its
+        # debate's summarizer and convergence check, which then route like
+        # the round's last turn.
+        invest_stages = ["Invest Debate Summarizer"] if summarize_debates else []
+        risk_stages = ["Risk Debate Summarizer"] if summarize_debates else []
+        if check_convergence:
+            invest_stages.append("Invest Debate Convergence")
+            risk_stages.append("Risk Debate Convergence")
+        if debate_execution == "parallel":
+            for source in ["Investment Debate Round"] + invest_stages:
+                workflow.add_conditional_edges(
+                    source,
+                    self.conditional_logic.should_continue_debate_round,
+                    ["Investment Debate Round", "Research Manager"]
+                    + [n for n in invest_stages if n != source],
+                )
+        else:
             workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
-
-        # Add remaining edges
-        workflow.add_conditional_edges(
-            "Bull Researcher",
-            self.conditional_logic.should_continue_debate,
-            {
-                "Bear Researcher": "Bear Researcher",
-                "Research Manager": "Research Manager",
-            },
-        )
-        workflow.add_conditional_edges(
-            "Bear Researcher",
-            self.conditional_logic.should_continue_debate,
-            {
-                "Bull Researcher": "Bull Researcher",
-                "Research Manager": "Research Manager",
-            },
-        )
+                "Bull Researcher",
+                self.conditional_logic.should_continue_debate,
+                {
+                    "Bear Researcher": "Bear Researcher",
+                    "Research Manager": "Research Manager",
+                },
+            )
+            for source in ["Bear Researcher"] + invest_stages:
+                workflow.add_conditional_edges(
+                    source,
+                    self.conditional_logic.should_continue_debate,
+                    ["Bull Researcher", "Research Manager"]
+                    + [n for n in invest_stages if n != source],
+                )
         workflow.add_edge("Research Manager", "Trader")
-        workflow.add_edge("Trader", "Risky Analyst")
-        workflow.add_conditional_edges(
-            "Risky Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Safe Analyst": "Safe Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
-        workflow.add_conditional_edges(
-            "Safe Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Neutral Analyst": "Neutral Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
-        workflow.add_conditional_edges(
-            "Neutral Analyst",
-            self.conditional_logic.should_continue_risk_analysis,
-            {
-                "Risky Analyst": "Risky Analyst",
-                "Risk Judge": "Risk Judge",
-            },
-        )
+        if debate_execution == "parallel":
+            workflow.add_edge("Trader", "Risk Debate Round")
+            for source in ["Risk Debate Round"] + risk_stages:
+                workflow.add_conditional_edges(
+                    source,
+                    self.conditional_logic.should_continue_risk_round,
+                    ["Risk Debate Round", "Risk Judge"]
+                    + [n for n in risk_stages if n != source],
+                )
+        else:
+            workflow.add_edge("Trader", "Risky Analyst")
+            workflow.add_conditional_edges(
+                "Risky Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Safe Analyst": "Safe Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+            workflow.add_conditional_edges(
+                "Safe Analyst",
+                self.conditional_logic.should_continue_risk_analysis,
+                {
+                    "Neutral Analyst": "Neutral Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+            for source in ["Neutral Analyst"] + risk_stages:
+                workflow.add_conditional_edges(
+                    source,
+                    self.conditional_logic.should_continue_risk_analysis,
+                    ["Risky Analyst", "Risk Judge"]
+                    + [n for n in risk_stages if n != source],
+                )
 
         workflow.add_edge("Risk Judge", END)
         app = workflow.compile()
@@ -223,5 +413,54 @@ class GraphSetup:
 
 
         # Compile and return
-        return workflow.compile()
-    
+        return workflow.compile(checkpointer=checkpointer)
+
+    def _tool_data_source(self, tool_node: ToolNode) -> str:
+        """Name the data sources behind an analyst's tools for report cache keys."""
+        return "|".join(
+            [
+                "online" if self.toolkit.config["online_tools"] else "offline",
+                str(self.toolkit.config.get("data_dir", "")),
+                ",".join(sorted(tool_node.tools_by_name)),
+            ]
+        )
+
+    def _create_analyst_branch(self, analyst_type, analyst_node, tool_node):
+        """Wrap one analyst and its tool loop into an isolated subgraph node.
+
+        The branch runs on a private message channel seeded from the parent
+        state, so concurrent analysts never see each other's tool traffic; only
+        the final report is written back to the parent graph.
+        """
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+        report_key = ANALYST_REPORT_KEYS[analyst_type]
+
+        branch = StateGraph(AgentState)
+        branch.add_node(analyst_name, as_runnable(analyst_node))
+        branch.add_node(tools_name, tool_node)
+        branch.add_edge(START, analyst_name)
+        branch.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {
+                tools_name: tools_name,
+                f"Msg Clear {analyst_type.capitalize()}": END,
+            },
+        )
+        branch.add_edge(tools_name, analyst_name)
+        branch = branch.compile()
+
+        def analyst_branch_node(state):
+            branch_state = yield Invoke(
+                branch,
+                {
+                    "messages": [HumanMessage(content=state["company_of_interest"])],
+                    "company_of_interest": state["company_of_interest"],
+                    "trade_date": state["trade_date"],
+                    "prefetched_data": state.get("prefetched_data") or {},
+                },
+            )
+            return {report_key: branch_state.get(report_key, "")}
+
+        return create_node(analyst_branch_node)
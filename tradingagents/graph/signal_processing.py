@@ -1,14 +1,196 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+_ACTION = r"(buy|sell|hold)(?:ing)?"
+
+# The marker every trading prompt asks for, e.g. FINAL TRANSACTION PROPOSAL: **BUY**
+_MARKER = re.compile(
+    r"FINAL\s+TRANSACTION\s+PROPOSAL\s*:?\s*\**\s*(BUY|SELL|HOLD)\b", re.IGNORECASE
+)
+
+# Common phrasings of a decision and the confidence each one carries on its own
+_PHRASES: List[Tuple[re.Pattern, float]] = [
+    (
+        re.compile(
+            r"\b(?:final|my|our)\s+(?:decision|recommendation|call|verdict|stance)"
+            r"(?:\s+is)?\s*[:\-]?\s*(?:to\s+)?\**\s*" + _ACTION + r"\b",
+            re.IGNORECASE,
+        ),
+        0.9,
+    ),
+    (
+        re.compile(
+            r"\b(?:decision|recommendation|verdict|call)\s*[:\-]\s*\**\s*" + _ACTION + r"\b",
+            re.IGNORECASE,
+        ),
+        0.85,
+    ),
+    (
+        re.compile(
+            r"\b(?:I|we)\s+(?:strongly\s+)?recommend\s+(?:to\s+)?(?:a\s+)?\**\s*" + _ACTION + r"\b",
+            re.IGNORECASE,
+        ),
+        0.8,
+    ),
+    (
+        re.compile(
+            r"\b" + _ACTION + r"\s+is\s+(?:warranted|justified|recommended)\b", re.IGNORECASE
+        ),
+        0.75,
+    ),
+    (re.compile(r"\*\*(BUY|SELL|HOLD)\*\*"), 0.6),
+]
+
+# "BUY, SELL, or HOLD" and "BUY/HOLD/SELL" enumerate the options, they decide nothing
+_ENUMERATION = re.compile(
+    r"\**(?:BUY|SELL|HOLD)\**(?:\s*(?:/|,|\bor\b)\s*(?:or\s+)?\**(?:BUY|SELL|HOLD)\**)+",
+    re.IGNORECASE,
+)
+
+# Confidence cap when decision phrasings contradict the marker
+_CONTESTED_MARKER_CONFIDENCE = 0.5
+
+_NEGATION = re.compile(
+    r"\b(?:not|no|never|avoid|against)\b[\w\s]{0,20}$|n't\s+[\w\s]{0,20}$", re.IGNORECASE
+)
+
+_POSITION_SIZE = re.compile(
+    r"(?:position(?:\s+size)?|allocat\w*|exposure|size)\D{0,40}?(\d+(?:\.\d+)?)\s*%"
+    r"|(\d+(?:\.\d+)?)\s*%\s+(?:of\s+(?:the\s+)?)?(?:portfolio|capital|position|allocation)",
+    re.IGNORECASE,
+)
+_STOP_LOSS = re.compile(
+    r"stop[\s-]*(?:loss)?\D{0,30}?"
+    r"(\$\s?\d+(?:,\d{3})*(?:\.\d+)?|\d+(?:\.\d+)?\s*%|\d+(?:,\d{3})*(?:\.\d+)?)",
+    re.IGNORECASE,
+)
+_HORIZON = re.compile(
+    r"(\d+(?:\s*(?:-|to|–)\s*\d+)?\s*(?:trading\s+)?(?:day|week|month|quarter|year)s?)"
+    r"|\b((?:short|medium|mid|long|near)[\s-]term)\b",
+    re.IGNORECASE,
+)
+_HORIZON_CONTEXT = re.compile(
+    r"horizon|time\s*frame|over\s+the\s+next|hold(?:ing)?\s+(?:period|for)|within", re.IGNORECASE
+)
+
+
+class TradingSignal(NamedTuple):
+    """Structured decision extracted from a final trade decision."""
+
+    action: str  # BUY, SELL or HOLD
+    # How unambiguously the text states the action, from 0 to 1
+    confidence: float
+    # "rule" when the deterministic extractor decided, "llm" when the model did
+    source: str
+    position_size_pct: Optional[float] = None
+    stop_loss: Optional[str] = None  # As written, e.g. "$412.50" or "8%"
+    horizon: Optional[str] = None  # As written, e.g. "3-6 months" or "short-term"
+
+
+# Rule confidence below which a decision is scored as unreadable
+MIN_SIGNAL_CONFIDENCE = 0.25
+
+# Action scored for decisions the rules could not read with confidence
+UNKNOWN_ACTION = "UNKNOWN"
+
+
+def parse_signal(full_signal: str) -> TradingSignal:
+    """Extract a trading signal from text with rules only.
+
+    The explicit FINAL TRANSACTION PROPOSAL marker wins unless the text's
+    own decision phrasings, which vote weighted by how specific they are,
+    pick another action; the marker may then be quoted from an earlier
+    agent, so the phrasing wins with a confidence low enough that
+    `SignalProcessor` asks the LLM. Returns
+    action "HOLD" with confidence 0 when no action is stated at all.
+    """
+    text = _ENUMERATION.sub(" ", full_signal or "")
+    action, confidence = _parse_action(text)
+    return TradingSignal(
+        action=action or "HOLD",
+        confidence=confidence,
+        source="rule",
+        position_size_pct=_first_float(_POSITION_SIZE, text),
+        stop_loss=_first_group(_STOP_LOSS, text),
+        horizon=_parse_horizon(text),
+    )
+
+
+def scored_action(signal: TradingSignal, min_confidence: float = MIN_SIGNAL_CONFIDENCE) -> str:
+    """The signal's action, or UNKNOWN when it was parsed with less than `min_confidence`."""
+    return signal.action if signal.confidence >= min_confidence else UNKNOWN_ACTION
+
+
+def _parse_action(text: str) -> Tuple[Optional[str], float]:
+    markers = [m.group(1).upper() for m in _MARKER.finditer(text)]
+    vote_action, vote_confidence = _vote_action(_MARKER.sub(" ", text))
+    if not markers:
+        return vote_action, vote_confidence
+
+    # Agents restate the marker; a changed mind keeps the last one
+    action, confidence = markers[-1], 1.0 if len(set(markers)) == 1 else 0.6
+    if vote_action is not None and vote_action != action:
+        # The judge's own wording disagrees, so the marker may be quoted from
+        # another agent: go with the wording, but below the LLM threshold
+        return vote_action, min(vote_confidence, _CONTESTED_MARKER_CONFIDENCE)
+    return action, confidence
+
+
+def _vote_action(text: str) -> Tuple[Optional[str], float]:
+    votes = {}
+    for pattern, weight in _PHRASES:
+        for match in pattern.finditer(text):
+            if _NEGATION.search(text[max(0, match.start() - 30) : match.start()]):
+                continue
+            action = match.group(1).upper()
+            votes[action] = max(votes.get(action, 0.0), weight)
+    if not votes:
+        return None, 0.0
+    action = max(votes, key=votes.get)
+    # Competing actions dilute the winner's confidence
+    return action, round(votes[action] * votes[action] / sum(votes.values()), 2)
+
+
+def _first_float(pattern: re.Pattern, text: str) -> Optional[float]:
+    match = pattern.search(text)
+    if not match:
+        return None
+    return float(next(g for g in match.groups() if g is not None))
+
+
+def _first_group(pattern: re.Pattern, text: str) -> Optional[str]:
+    match = pattern.search(text)
+    return " ".join(match.group(1).split()) if match else None
+
+
+def _parse_horizon(text: str) -> Optional[str]:
+    for match in _HORIZON.finditer(text):
+        if match.group(2):
+            return match.group(2).lower().replace(" ", "-")
+        # A bare duration only counts next to horizon wording
+        if _HORIZON_CONTEXT.search(text[max(0, match.start() - 40) : match.start()]):
+            return " ".join(match.group(1).split())
+    return None
+
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatGoogleGenerativeAI):
-        """Initialize with an LLM for processing."""
+    def __init__(
+        self, quick_thinking_llm: ChatGoogleGenerativeAI, confidence_threshold: float = 0.7
+    ):
+        """Initialize with an LLM for processing.
+
+        Args:
+            quick_thinking_llm: Model consulted when the rules are unsure
+            confidence_threshold: Rule confidence below which the model decides
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.confidence_threshold = confidence_threshold
 
     def process_signal(self, full_signal: str) -> str:
         """
@@ -20,12 +202,38 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        return self.extract_signal(full_signal).action
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async version of `process_signal`."""
+        return (await self.aextract_signal(full_signal)).action
+
+    def extract_signal(self, full_signal: str) -> TradingSignal:
+        """Extract a structured signal, asking the LLM only when the rules are unsure."""
+        signal = parse_signal(full_signal)
+        if signal.confidence >= self.confidence_threshold:
+            return signal
+        content = self.quick_thinking_llm.invoke(self._messages(full_signal)).content
+        return self._with_llm_action(signal, content)
+
+    async def aextract_signal(self, full_signal: str) -> TradingSignal:
+        """Async version of `extract_signal`."""
+        signal = parse_signal(full_signal)
+        if signal.confidence >= self.confidence_threshold:
+            return signal
+        content = (await self.quick_thinking_llm.ainvoke(self._messages(full_signal))).content
+        return self._with_llm_action(signal, content)
+
+    def _with_llm_action(self, signal: TradingSignal, content: str) -> TradingSignal:
+        match = re.search(r"\b(BUY|SELL|HOLD)\b", content, re.IGNORECASE)
+        action = match.group(1).upper() if match else content.strip()
+        return signal._replace(action=action, source="llm")
+
+    def _messages(self, full_signal: str):
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
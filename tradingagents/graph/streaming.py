@@ -0,0 +1,158 @@
+# TradingAgents/graph/streaming.py
+
+import inspect
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    get_type_hints,
+)
+
+from langchain_core.messages import RemoveMessage, convert_to_messages
+from langgraph.graph.message import add_messages
+
+from tradingagents.agents.utils.agent_states import AgentState
+
+
+def state_reducers(schema) -> Dict[str, Callable[[Any, Any], Any]]:
+    """The reducer of every key of a state schema annotated with one.
+
+    Follows LangGraph's rule: a key reduces with the last `Annotated`
+    metadata when that is a two-argument callable; other keys are replaced.
+    """
+    reducers = {}
+    for key, hint in get_type_hints(schema, include_extras=True).items():
+        metadata = getattr(hint, "__metadata__", ())
+        if not metadata or not callable(metadata[-1]):
+            continue
+        try:
+            params = inspect.signature(metadata[-1]).parameters.values()
+        except (TypeError, ValueError):
+            continue
+        if len([p for p in params if p.kind != p.VAR_KEYWORD]) == 2:
+            reducers[key] = metadata[-1]
+    return reducers
+
+
+class StateAccumulator:
+    """Rebuilds the full graph state from "updates" stream chunks.
+
+    Each chunk carries only the keys a node changed. Keys with a reducer in
+    `schema` (messages, context tokens, convergence records) are merged with
+    it and every other key is replaced, so the accumulated state matches
+    what "values" mode would have streamed.
+    """
+
+    def __init__(self, initial_state: Optional[Dict[str, Any]] = None, schema=AgentState):
+        self.reducers = state_reducers(schema)
+        self.state: Dict[str, Any] = dict(initial_state or {})
+        self.state["messages"] = add_messages([], self.state.get("messages", []))
+
+    def apply(self, update: Dict[str, Any]):
+        """Merge one node's update into the state."""
+        for key, value in update.items():
+            reducer = self.reducers.get(key)
+            if reducer is not None and key in self.state:
+                self.state[key] = reducer(self.state[key], value)
+            else:
+                self.state[key] = value
+
+
+def iter_state_chunks(
+    stream,
+    stream_mode: Union[str, List[str]],
+    initial_state: Optional[Dict[str, Any]] = None,
+    on_custom: Optional[Callable[[Any], None]] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Normalize a graph stream to (state, delta) pairs for either stream mode.
+
+    In "values" mode both are the streamed full state. In "updates" mode the
+    state is accumulated incrementally and the delta holds only the keys one
+    node changed, with "messages" reduced to the messages it added. The
+    yielded state is updated in place, so consumers should not keep
+    references to it across steps.
+
+    A list mode such as ["updates", "custom"] streams (mode, chunk) pairs;
+    "custom" payloads (e.g. agent tokens) are passed to `on_custom` as they
+    arrive instead of being yielded.
+    """
+    multi_mode = isinstance(stream_mode, (list, tuple))
+    state_mode = _state_mode(stream_mode)
+    accumulator = StateAccumulator(initial_state) if state_mode == "updates" else None
+    for item in stream:
+        if multi_mode:
+            mode, item = item
+            if mode == "custom":
+                if on_custom is not None:
+                    on_custom(item)
+                continue
+        yield from _state_pairs(item, accumulator)
+
+
+async def aiter_state_chunks(
+    stream,
+    stream_mode: Union[str, List[str]],
+    initial_state: Optional[Dict[str, Any]] = None,
+    on_custom: Optional[Callable[[Any], Any]] = None,
+) -> AsyncIterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Async twin of `iter_state_chunks` for `astream`.
+
+    `on_custom` may be a coroutine function; it is awaited before the stream
+    continues.
+    """
+    multi_mode = isinstance(stream_mode, (list, tuple))
+    state_mode = _state_mode(stream_mode)
+    accumulator = StateAccumulator(initial_state) if state_mode == "updates" else None
+    async for item in stream:
+        if multi_mode:
+            mode, item = item
+            if mode == "custom":
+                if on_custom is not None:
+                    result = on_custom(item)
+                    if inspect.isawaitable(result):
+                        await result
+                continue
+        for pair in _state_pairs(item, accumulator):
+            yield pair
+
+
+def _state_mode(stream_mode) -> str:
+    """The state-carrying mode of a single or ["values"|"updates", "custom"] stream."""
+    if isinstance(stream_mode, (list, tuple)):
+        state_modes = [m for m in stream_mode if m != "custom"]
+        if len(state_modes) != 1:
+            raise ValueError(f"Unsupported stream mode {stream_mode!r}")
+        stream_mode = state_modes[0]
+    if stream_mode not in ("values", "updates"):
+        raise ValueError(f"Unsupported stream mode {stream_mode!r}")
+    return stream_mode
+
+
+def _state_pairs(chunk, accumulator: Optional[StateAccumulator]):
+    """(state, delta) pairs of one state chunk; no accumulator means "values" mode."""
+    if accumulator is None:
+        yield chunk, chunk
+        return
+
+    for update in chunk.values():
+        # Interrupts and nodes without changes stream non-dict payloads
+        if not isinstance(update, dict):
+            continue
+        accumulator.apply(update)
+        delta = dict(update)
+        if "messages" in delta:
+            messages = delta["messages"]
+            if not isinstance(messages, list):
+                messages = [messages]
+            delta["messages"] = [
+                m
+                for m in convert_to_messages(messages)
+                if not isinstance(m, RemoveMessage)
+            ]
+        yield accumulator.state, delta
@@ -0,0 +1,110 @@
+# TradingAgents/graph/tracing.py
+
+import gzip
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Characters of a step's latest message kept in its step record
+_PREVIEW_CHARS = 200
+
+
+class RunTrace:
+    """Bounded trace of one debug-mode graph run.
+
+    Keeps a ring of the latest `max_steps` step records: which state keys a
+    step changed, when, and a preview of its latest message. Full states
+    are never retained. With `spill_path` set, every step's changed values
+    are also appended to a gzipped JSONL file, so a complete trace costs
+    disk rather than memory.
+    """
+
+    def __init__(self, max_steps: int = 200, spill_path=None):
+        self.steps = deque(maxlen=max_steps)
+        self.total_steps = 0
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._spill = None
+        self._previous: Dict[str, Any] = {}
+        self._last_message = None
+        self._started = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, state: Dict[str, Any], delta: Dict[str, Any]) -> Optional[Any]:
+        """Record one streamed step.
+
+        Returns the step's latest message when it is new, for printing, and
+        None otherwise.
+        """
+        # In "values" mode the delta is the full state; unchanged channels
+        # keep their value objects, so identity tells what the step changed
+        changed = {k: v for k, v in delta.items() if self._previous.get(k) is not v}
+        if delta is state:
+            self._previous = dict(state)
+
+        messages = changed.get("messages") or []
+        message = messages[-1] if messages else None
+        if message is not None and message is self._last_message:
+            message = None
+        if message is not None:
+            self._last_message = message
+
+        self.total_steps += 1
+        step = {
+            "step": self.total_steps,
+            "elapsed_s": round(time.perf_counter() - self._started, 3),
+            "keys": sorted(changed),
+        }
+        if message is not None:
+            step["message"] = _preview(message)
+        self.steps.append(step)
+
+        if self.spill_path is not None:
+            self._write_spill(step, changed)
+        return message
+
+    def summary(self) -> Dict[str, Any]:
+        """The retained step records, as attached to a debug run's final state."""
+        return {
+            "total_steps": self.total_steps,
+            "steps": list(self.steps),
+            "spill_path": str(self.spill_path) if self.spill_path else None,
+        }
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        self._previous = {}
+
+    def _write_spill(self, step, changed):
+        if self._spill is None:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = gzip.open(self.spill_path, "at", encoding="utf-8")
+        record = dict(step, changes=changed)
+        self._spill.write(json.dumps(record, default=_to_json) + "\n")
+
+
+def _preview(message) -> Dict[str, Any]:
+    content = getattr(message, "content", message)
+    preview = {
+        "type": getattr(message, "type", type(message).__name__),
+        "content": str(content)[:_PREVIEW_CHARS],
+    }
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        preview["tool_calls"] = [call["name"] for call in tool_calls]
+    return preview
+
+
+def _to_json(value):
+    """Serialize messages by their fields and anything else as text."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
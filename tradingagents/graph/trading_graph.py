@@ -1,34 +1,113 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
 import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
 import json
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, NamedTuple, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from project root
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
 
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.agents.utils.context_builder import ContextBuilder
+from tradingagents.agents.utils.fake_llm import FakeChatModel
+from tradingagents.agents.utils.llm_cache import CassetteLLMCache
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.report_cache import ReportCache
+from tradingagents.agents.utils.tool_cache import ToolCallCache, get_process_tool_cache
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
-from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.config import use_config
+from tradingagents.dataflows.llm_cassette import get_cassette, get_llm_mode, open_cassette
 
+from .checkpointing import create_checkpointer, get_checkpoint_path, make_thread_id
 from .conditional_logic import ConditionalLogic
+from .convergence import ConvergencePolicy, create_convergence_policy
+from .instrumentation import instrument_run
+from .profiling import profile_run
 from .setup import GraphSetup
 from .propagation import Propagator
+from .run_log import get_run_log_writer
 from .reflection import Reflector
-from .signal_processing import SignalProcessor
+from .signal_processing import SignalProcessor, TradingSignal
+from .streaming import aiter_state_chunks, iter_state_chunks
+from .tracing import RunTrace
+
+
+def create_llm(model: str, config: Dict[str, Any]) -> BaseChatModel:
+    """Create a chat model client for `model` in the config's `llm_mode`.
+
+    "live" and "record" call Google/Gemini, the only supported provider;
+    "record" also stores every response in the LLM cassette and "replay"
+    serves them from it without a network or API key. In "live" mode an
+    `llm_cache_path` cassette serves repeated requests. "fake" returns a
+    local `FakeChatModel`.
+    """
+    mode = get_llm_mode(config)
+    if mode == "fake":
+        return FakeChatModel(
+            model_name=model,
+            latency=config.get("fake_llm_latency", 0.0),
+            decision=config.get("fake_llm_decision", "HOLD"),
+            tool_calls=config.get("fake_llm_tool_calls", True),
+        )
+    if config["llm_provider"].lower() != "google":
+        raise ValueError(f"Only Google/Gemini LLM provider is supported. Current provider: {config['llm_provider']}")
+
+    llm_kwargs = {}
+    if mode == "replay":
+        # The client never reaches Google, so any key will do
+        llm_kwargs["google_api_key"] = os.getenv("GOOGLE_API_KEY") or "replay"
+        llm_kwargs["cache"] = CassetteLLMCache(get_cassette(config), "replay")
+        return ChatGoogleGenerativeAI(model=model, **llm_kwargs)
+
+    # Ensure GOOGLE_API_KEY is set in environment
+    if not os.getenv("GOOGLE_API_KEY"):
+        raise ValueError("GOOGLE_API_KEY environment variable is required for Google LLM provider")
+    if mode == "record":
+        llm_kwargs["cache"] = CassetteLLMCache(get_cassette(config), "record")
+    elif config.get("llm_cache_path"):
+        # A cassette serving repeated requests makes re-running identical runs free
+        llm_kwargs["cache"] = CassetteLLMCache(open_cassette(config["llm_cache_path"]), "cache")
+    return ChatGoogleGenerativeAI(model=model, **llm_kwargs)
+
+
+def create_memories(config: Dict[str, Any]) -> Dict[str, FinancialSituationMemory]:
+    """Create the memory stores used by the graph, keyed by reflection component."""
+    return {
+        "bull": FinancialSituationMemory("bull_memory", config),
+        "bear": FinancialSituationMemory("bear_memory", config),
+        "trader": FinancialSituationMemory("trader_memory", config),
+        "invest_judge": FinancialSituationMemory("invest_judge_memory", config),
+        "risk_manager": FinancialSituationMemory("risk_manager_memory", config),
+    }
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one (ticker, date) item of a batch run."""
+
+    company_name: str
+    trade_date: str
+    final_state: Optional[Dict[str, Any]]
+    signal: Optional[str]
+    run_id: Optional[str]
+    error: Optional[Exception]
 
 
 class TradingAgentsGraph:
@@ -39,50 +118,87 @@ class TradingAgentsGraph:
         selected_analysts=["market", "social", "news", "fundamentals"],
         debug=False,
         config: Dict[str, Any] = None,
+        deep_thinking_llm: Optional[BaseChatModel] = None,
+        quick_thinking_llm: Optional[BaseChatModel] = None,
+        memories: Optional[Dict[str, FinancialSituationMemory]] = None,
+        convergence_policy: Optional[ConvergencePolicy] = None,
     ):
         """Initialize the trading agents graph and components.
 
         Args:
             selected_analysts: List of analyst types to include
-            debug: Whether to run in debug mode
+            debug: Print every step of `propagate` runs and attach a bounded
+                step trace to their final state
             config: Configuration dictionary. If None, uses default config
+            deep_thinking_llm: Shared deep-thinking client; created from the
+                config when omitted
+            quick_thinking_llm: Shared quick-thinking client; created from the
+                config when omitted
+            memories: Shared memory stores keyed like `memories`; created
+                when omitted
+            convergence_policy: Ends debates early once they converge;
+                built from the config's `debate_convergence` when omitted
         """
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
 
-        # Update the interface's config
-        set_config(self.config)
-
         # Create necessary directories
         os.makedirs(
             os.path.join(self.config["project_dir"], "dataflows/data_cache"),
             exist_ok=True,
         )
 
-        # Initialize LLMs - Only Google/Gemini supported
-        if self.config["llm_provider"].lower() == "google":
-            # Ensure GOOGLE_API_KEY is set in environment
-            if not os.getenv("GOOGLE_API_KEY"):
-                raise ValueError("GOOGLE_API_KEY environment variable is required for Google LLM provider")
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
-        else:
-            raise ValueError(f"Only Google/Gemini LLM provider is supported. Current provider: {self.config['llm_provider']}")
-        
+        # Initialize LLMs, reusing injected clients when given
+        self.deep_thinking_llm = deep_thinking_llm or create_llm(
+            self.config["deep_think_llm"], self.config
+        )
+        self.quick_thinking_llm = quick_thinking_llm or create_llm(
+            self.config["quick_think_llm"], self.config
+        )
+
         self.toolkit = Toolkit(config=self.config)
 
-        # Initialize memories
-        self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-        self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-        self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        # Initialize memories, reusing injected stores when given
+        memories = memories or create_memories(self.config)
+        self.bull_memory = memories["bull"]
+        self.bear_memory = memories["bear"]
+        self.trader_memory = memories["trader"]
+        self.invest_judge_memory = memories["invest_judge"]
+        self.risk_manager_memory = memories["risk_manager"]
+
+        # Memoize identical tool calls within a run, or across runs in this process
+        tool_cache_scope = self.config.get("tool_cache_scope", "run")
+        tool_cache_max_entries = self.config.get("tool_cache_max_entries", 1024)
+        if tool_cache_scope == "process":
+            self.tool_cache = get_process_tool_cache(tool_cache_max_entries)
+        elif tool_cache_scope:
+            self.tool_cache = ToolCallCache(tool_cache_scope, tool_cache_max_entries)
+        else:
+            self.tool_cache = None
+        self.tool_cache_stats = None
 
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
+        # Finished analyst reports are reused across live runs when enabled.
+        # Recording, replaying and fake runs must make every model call, and
+        # their reports must never reach live runs.
+        self.report_cache = None
+        if self.config.get("analyst_report_cache") and get_llm_mode(self.config) == "live":
+            self.report_cache = ReportCache(
+                os.path.join(self.config["data_cache_dir"], "report_cache")
+            )
+
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.convergence_policy = convergence_policy or create_convergence_policy(
+            self.config, embed=self.bull_memory.get_embedding
+        )
+        self.conditional_logic = ConditionalLogic(
+            max_debate_rounds=self.config["max_debate_rounds"],
+            max_risk_discuss_rounds=self.config["max_risk_discuss_rounds"],
+            summarize_debates=self.config.get("debate_summaries", False),
+            check_convergence=self.convergence_policy is not None,
+        )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -94,24 +210,63 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            report_cache=self.report_cache,
+            context_builder=ContextBuilder.from_config(self.config),
+            summary_llm=(
+                create_llm(self.config["debate_summary_llm"], self.config)
+                if self.config.get("debate_summary_llm")
+                else None
+            ),
+            convergence_policy=self.convergence_policy,
         )
 
-        self.propagator = Propagator()
-        self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.propagator = Propagator(
+            stream_mode=self.config.get("stream_mode", "values"),
+            stream_tokens=self.config.get("stream_tokens", False),
+        )
+        self.reflector = Reflector(
+            self.quick_thinking_llm,
+            max_workers=self.config.get("max_reflection_workers", 5),
+        )
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm,
+            confidence_threshold=self.config.get("signal_confidence_threshold", 0.7),
+        )
 
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.run_id = None
+
+        # Runs are appended to the state log by a background writer; writes
+        # of this instance's runs are kept so their failures reach this caller
+        self.state_log = None
+        self._state_log_writes: List[Future] = []
+        self._state_log_lock = threading.Lock()
+        if self.config.get("state_log") == "run_log":
+            self.state_log = get_run_log_writer(
+                self.config.get("state_log_dir", "eval_results"),
+                self.config.get("state_log_compression", "gzip"),
+            )
+
+        # Durable checkpoints let failed or interrupted runs resume
+        self.checkpointer = None
+        if self.config.get("checkpoint_enabled"):
+            self.checkpointer = create_checkpointer(get_checkpoint_path(self.config))
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            analyst_execution=self.config.get("analyst_execution", "sequential"),
+            debate_execution=self.config.get("debate_execution", "sequential"),
+            checkpointer=self.checkpointer,
+            data_prefetch=self.config.get("data_prefetch", False),
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
         return {
-            "market": ToolNode(
+            "market": self._create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_YFin_data_online,
@@ -121,7 +276,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_stockstats_indicators_report,
                 ]
             ),
-            "social": ToolNode(
+            "social": self._create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_stock_news_openai,
@@ -129,7 +284,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_reddit_stock_info,
                 ]
             ),
-            "news": ToolNode(
+            "news": self._create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_global_news_openai,
@@ -139,7 +294,7 @@ class TradingAgentsGraph:
                     self.toolkit.get_reddit_news,
                 ]
             ),
-            "fundamentals": ToolNode(
+            "fundamentals": self._create_tool_node(
                 [
                     # online tools
                     self.toolkit.get_fundamentals_openai,
@@ -153,31 +308,28 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def _create_tool_node(self, tools) -> ToolNode:
+        """Build a ToolNode, routing its tools through the tool call cache if enabled."""
+        if self.tool_cache is not None:
+            tools = [self.tool_cache.wrap(tool) for tool in tools]
+        return ToolNode(tools)
 
-        self.ticker = company_name
+    def propagate(self, company_name, trade_date, run_id=None, resume=False):
+        """Run the trading agents graph for a company on a specific date.
 
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
-        )
-        args = self.propagator.get_graph_args()
+        Args:
+            company_name: Ticker to analyze
+            trade_date: Date to trade on
+            run_id: Identifies the run's checkpoints; generated when omitted
+            resume: Continue run `run_id` from its last completed node instead
+                of starting over. Requires checkpointing to be enabled.
+        """
 
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
+        self.ticker = company_name
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        final_state, self.run_id, self.tool_cache_stats = self._run_graph(
+            company_name, trade_date, run_id=run_id, resume=resume
+        )
 
         # Store current state for reflection
         self.curr_state = final_state
@@ -188,9 +340,278 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
+    def propagate_batch(self, pairs, max_workers=None):
+        """Run the graph for many (ticker, date) pairs concurrently.
+
+        Items share the compiled graph, LLM clients, memories and caches but
+        keep their own state and log file; the instance's `curr_state` is left
+        untouched. Results are yielded as items complete, and a failing item is
+        reported without stopping the rest.
+
+        Args:
+            pairs: Iterable of (company_name, trade_date) pairs
+            max_workers: Concurrent runs, defaults to config "max_batch_workers"
+
+        Yields:
+            BatchResult for every pair, in completion order
+        """
+        max_workers = max_workers or self.config.get("max_batch_workers", 4)
+
+        def run_item(company_name, trade_date):
+            final_state, run_id, tool_cache_stats = self._run_graph(
+                company_name, trade_date
+            )
+            entry = self._build_log_entry(final_state, tool_cache_stats)
+            self._track_state_log_write(
+                self._write_state_log(company_name, trade_date, entry, run_id)
+            )
+            signal = self.process_signal(final_state["final_trade_decision"])
+            return final_state, signal, run_id
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(run_item, company_name, trade_date): (company_name, trade_date)
+                for company_name, trade_date in pairs
+            }
+            for future in as_completed(futures):
+                company_name, trade_date = futures[future]
+                try:
+                    final_state, signal, run_id = future.result()
+                except Exception as e:
+                    yield BatchResult(company_name, trade_date, None, None, None, e)
+                else:
+                    yield BatchResult(company_name, trade_date, final_state, signal, run_id, None)
+
+    def _run_graph(self, company_name, trade_date, run_id=None, resume=False):
+        """Run or resume the graph for one item without touching instance state.
+
+        Returns:
+            (final_state, run_id, tool_cache_stats); run_id is None when
+            checkpointing is disabled
+        """
+        run_id, args = self._run_args(company_name, trade_date, run_id, resume)
+        resume_values = self.graph.get_state(args["config"]).values if resume else None
+        init_agent_state, start_state = self._start_states(
+            company_name, trade_date, args, resume_values
+        )
+
+        with self.config_scope(), self.tool_cache_scope() as tool_cache_stats, \
+                self.instrumentation_scope() as metrics, \
+                self.profiling_scope(company_name, trade_date, run_id):
+            if self.debug:
+                # Debug mode with a bounded trace
+                final_state = {}
+                with self._debug_trace(company_name, trade_date, run_id) as trace:
+                    for state, chunk in iter_state_chunks(
+                        self.graph.stream(init_agent_state, **args),
+                        args["stream_mode"],
+                        start_state,
+                    ):
+                        message = trace.record(state, chunk)
+                        if message is not None:
+                            message.pretty_print()
+                        final_state = state
+                final_state["debug_trace"] = trace.summary()
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, config=args["config"])
+
+        if resume and not final_state:
+            final_state = self.graph.get_state(args["config"]).values
+        if metrics is not None:
+            final_state["run_summary"] = metrics.summary()
+
+        return final_state, run_id, tool_cache_stats
+
+    async def apropagate(self, company_name, trade_date, run_id=None, resume=False):
+        """Async version of `propagate`.
+
+        Agent nodes await their LLM calls on the running event loop, so many
+        runs can share one loop instead of holding a thread each.
+        """
+        self.ticker = company_name
+
+        final_state, self.run_id, self.tool_cache_stats = await self._arun_graph(
+            company_name, trade_date, run_id=run_id, resume=resume
+        )
+
+        self.curr_state = final_state
+        self._log_state(trade_date, final_state)
+
+        return final_state, await self.aprocess_signal(final_state["final_trade_decision"])
+
+    async def _arun_graph(self, company_name, trade_date, run_id=None, resume=False):
+        """Async version of `_run_graph`."""
+        run_id, args = self._run_args(company_name, trade_date, run_id, resume)
+
+        with self.config_scope(), self.tool_cache_scope() as tool_cache_stats, \
+                self.instrumentation_scope() as metrics, \
+                self.profiling_scope(company_name, trade_date, run_id):
+            if self.debug:
+                final_state = {}
+                with self._debug_trace(company_name, trade_date, run_id) as trace:
+                    async for state, chunk in self.astream(
+                        company_name, trade_date, run_id=run_id, resume=resume
+                    ):
+                        message = trace.record(state, chunk)
+                        if message is not None:
+                            message.pretty_print()
+                        final_state = state
+                final_state["debug_trace"] = trace.summary()
+            else:
+                resume_values = None
+                if resume:
+                    resume_values = (await self.graph.aget_state(args["config"])).values
+                init_agent_state, _ = self._start_states(
+                    company_name, trade_date, args, resume_values
+                )
+                final_state = await self.graph.ainvoke(init_agent_state, config=args["config"])
+
+        if resume and not final_state:
+            final_state = (await self.graph.aget_state(args["config"])).values
+        if metrics is not None:
+            final_state["run_summary"] = metrics.summary()
+
+        return final_state, run_id, tool_cache_stats
+
+    async def astream(
+        self, company_name, trade_date, run_id=None, resume=False, on_custom=None
+    ):
+        """Stream a run on the event loop as (state, delta) pairs.
+
+        Pairs follow the configured stream mode as in `iter_state_chunks`, and
+        `on_custom` (a function or coroutine function) receives streamed agent
+        tokens. Like direct use of `self.graph`, iterate inside
+        `config_scope()` and, to memoize tool calls, record timings and
+        profile, `tool_cache_scope()`, `instrumentation_scope()` and
+        `profiling_scope()`.
+        """
+        run_id, args = self._run_args(company_name, trade_date, run_id, resume)
+        resume_values = None
+        if resume:
+            resume_values = (await self.graph.aget_state(args["config"])).values
+        init_agent_state, start_state = self._start_states(
+            company_name, trade_date, args, resume_values
+        )
+
+        async for state, delta in aiter_state_chunks(
+            self.graph.astream(init_agent_state, **args),
+            args["stream_mode"],
+            start_state,
+            on_custom=on_custom,
+        ):
+            yield state, delta
+
+    def _run_args(self, company_name, trade_date, run_id, resume):
+        """Resolve a run's id and graph args.
+
+        Returns:
+            (run_id, args); run_id is None when checkpointing is disabled
+        """
+        thread_id = None
+        if self.checkpointer is not None:
+            run_id = run_id or uuid.uuid4().hex
+            thread_id = make_thread_id(company_name, trade_date, run_id)
+        elif resume:
+            raise ValueError("Resuming a run requires checkpoint_enabled in the config")
+        else:
+            run_id = None
+        return run_id, self.propagator.get_graph_args(thread_id=thread_id)
+
+    def _start_states(self, company_name, trade_date, args, resume_values=None):
+        """Graph input and the state it starts from.
+
+        When resuming, `resume_values` holds the checkpointed state; the input
+        is then None, which continues from the last checkpoint.
+        """
+        if resume_values is None:
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
+            return init_agent_state, init_agent_state
+        if not resume_values:
+            thread_id = args["config"]["configurable"]["thread_id"]
+            raise ValueError(f"No checkpoint found for run {thread_id}")
+        return None, resume_values
+
+    def config_scope(self):
+        """Scope this graph's config to the current context.
+
+        The dataflows read their settings (data dir, cache dir, models) from
+        the active scope, so graphs with different configs can run
+        concurrently in one process. Wrap any direct use of `self.graph` in it.
+        """
+        return use_config(self.config)
+
+    def tool_cache_scope(self):
+        """Scope tool call memoization to one run.
+
+        Yields the run's cache hit stats, or None when the cache is disabled.
+        """
+        if self.tool_cache is None:
+            return nullcontext()
+        return self.tool_cache.run_scope()
+
+    def instrumentation_scope(self):
+        """Record per-node, LLM and tool timings of the runs started in the block.
+
+        Yields the run's `RunMetrics`, or None when instrumentation is disabled.
+        """
+        if not self.config.get("instrumentation", True):
+            return nullcontext()
+        return instrument_run(self.config.get("llm_token_prices"))
+
+    def profiling_scope(self, company_name, trade_date, run_id=None):
+        """Profile the config's `profile_targets` in runs started in the block.
+
+        Artifacts go to <results_dir>/profiles/<ticker>/<date>/<run>. Yields
+        the `RunProfiler`, or None when no targets are configured, in which
+        case nothing is wrapped or hooked.
+        """
+        targets = self.config.get("profile_targets")
+        if not targets:
+            return nullcontext()
+        output_dir = os.path.join(
+            self.config["results_dir"],
+            "profiles",
+            str(company_name),
+            str(trade_date),
+            run_id or uuid.uuid4().hex[:12],
+        )
+        return profile_run(
+            targets,
+            output_dir,
+            mode=self.config.get("profile_mode", "deterministic"),
+            interval=self.config.get("profile_sample_interval", 0.005),
+        )
+
+    def _debug_trace(self, company_name, trade_date, run_id=None) -> RunTrace:
+        """Trace of a debug-mode run, spilling to <results_dir>/traces when configured."""
+        spill_path = None
+        if self.config.get("debug_trace_spill"):
+            spill_path = os.path.join(
+                self.config["results_dir"],
+                "traces",
+                str(company_name),
+                str(trade_date),
+                f"{run_id or uuid.uuid4().hex[:12]}.jsonl.gz",
+            )
+        return RunTrace(self.config.get("debug_trace_steps", 200), spill_path)
+
+    def resume(self, company_name, trade_date, run_id):
+        """Resume an interrupted run from its last checkpoint."""
+        return self.propagate(company_name, trade_date, run_id=run_id, resume=True)
+
     def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        """Log the final state of the instance's current run."""
+        entry = self._build_log_entry(final_state, self.tool_cache_stats)
+        self._track_state_log_write(
+            self._write_state_log(self.ticker, trade_date, entry, self.run_id)
+        )
+
+    def _build_log_entry(self, final_state, tool_cache_stats=None):
+        """Select the parts of a final state that go into the state log."""
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -218,20 +639,96 @@ class TradingAgentsGraph:
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
+            "investment_debate_summary": final_state.get("investment_debate_summary", {}),
+            "risk_debate_summary": final_state.get("risk_debate_summary", {}),
+            "investment_debate_convergence": final_state.get("investment_debate_convergence", []),
+            "risk_debate_convergence": final_state.get("risk_debate_convergence", []),
+            "context_tokens": final_state.get("context_tokens", {}),
         }
+        if final_state.get("run_summary") is not None:
+            entry["run_summary"] = final_state["run_summary"]
+        if tool_cache_stats is not None:
+            entry["tool_cache"] = tool_cache_stats
+        return entry
+
+    def _write_state_log(self, ticker, trade_date, entry, run_id=None) -> Optional[Future]:
+        """Hand a run's log entry to the configured state log.
+
+        Returns the pending write of the "run_log" format; "json" files are
+        written before returning.
+        """
+        if self.state_log is not None:
+            return self.state_log.append(ticker, trade_date, entry, run_id)
+        if self.config.get("state_log") != "json":
+            return None
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        directory = Path(self.config.get("state_log_dir", "eval_results")) / str(ticker)
+        directory = directory / "TradingAgentsStrategy_logs"
         directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / f"full_states_log_{trade_date}.json", "w") as f:
+            json.dump({str(trade_date): entry}, f, indent=4, default=str)
+        return None
+
+    def _track_state_log_write(self, write: Optional[Future]):
+        """Keep a pending write of this instance's runs.
+
+        Raises the error of an earlier write of this instance that failed,
+        so a broken state log surfaces on the next run instead of a flush.
+        """
+        with self._state_log_lock:
+            failed = [w for w in self._state_log_writes if w.done() and w.exception() is not None]
+            self._state_log_writes = [w for w in self._state_log_writes if not w.done()]
+            if write is not None:
+                self._state_log_writes.append(write)
+        if failed:
+            raise failed[0].exception()
+
+    def log_run(self, company_name, trade_date, final_state, run_id=None, tool_cache_stats=None):
+        """Log the final state of a run streamed outside `propagate`.
+
+        Returns the pending write, or None when nothing is left to wait for;
+        the caller owns it, so its failure never reaches other runs sharing
+        this instance.
+        """
+        entry = self._build_log_entry(final_state, tool_cache_stats)
+        return self._write_state_log(company_name, trade_date, entry, run_id)
+
+    def flush_state_log(self):
+        """Wait until the runs of this instance are written to the state log.
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        Raises the first write error among them not raised yet.
+        """
+        with self._state_log_lock:
+            writes, self._state_log_writes = self._state_log_writes, []
+        errors = [w.exception() for w in writes if w.exception() is not None]
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """Stop the memories' compaction threads and finish this instance's state log writes."""
+        try:
+            self.flush_state_log()
+        finally:
+            for memory in self.memories.values():
+                memory.stop_compaction()
+
+    @property
+    def memories(self) -> Dict[str, FinancialSituationMemory]:
+        """Memory stores keyed by reflection component."""
+        return {
+            "bull": self.bull_memory,
+            "bear": self.bear_memory,
+            "trader": self.trader_memory,
+            "invest_judge": self.invest_judge_memory,
+            "risk_manager": self.risk_manager_memory,
+        }
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
+        if self.config.get("parallel_processing"):
+            self.reflector.reflect_all(self.curr_state, returns_losses, self.memories)
+            return
+
         self.reflector.reflect_bull_researcher(
             self.curr_state, returns_losses, self.bull_memory
         )
@@ -248,6 +745,26 @@ class TradingAgentsGraph:
             self.curr_state, returns_losses, self.risk_manager_memory
         )
 
+    def reflect_and_remember_batch(self, states_and_returns):
+        """Reflect on many past runs at once, e.g. for offline learning.
+
+        Args:
+            states_and_returns: List of (final_state, returns_losses) pairs
+        """
+        self.reflector.reflect_batch(states_and_returns, self.memories)
+
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async version of `process_signal`."""
+        return await self.signal_processor.aprocess_signal(full_signal)
+
+    def extract_signal(self, full_signal) -> TradingSignal:
+        """Extract the decision with its position size, stop and horizon."""
+        return self.signal_processor.extract_signal(full_signal)
+
+    async def aextract_signal(self, full_signal) -> TradingSignal:
+        """Async version of `extract_signal`."""
+        return await self.signal_processor.aextract_signal(full_signal)